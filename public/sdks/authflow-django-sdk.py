@@ -4,12 +4,46 @@ Official Django integration for AuthFlow authentication
 
 Installation:
 pip install authflow-django
+pip install "authflow[jwt]"  # for VERIFY_MODE='local'
 
 Configuration (settings.py):
 AUTHFLOW = {
     'DOMAIN': 'https://your-authflow-instance.com',
     'CLIENT_ID': 'your-client-id',
     'CLIENT_SECRET': 'your-client-secret',
+    # Optional: verify RS256 tokens locally against /.well-known/jwks.json
+    # instead of calling /api/auth/me on every request (requires PyJWT[crypto])
+    'VERIFY_MODE': 'local',
+    'ISSUER': None,
+    'CHECK_REVOCATION': False,
+    # Optional: reject revoked tokens locally, in-process (VERIFY_MODE='local' and cache hits).
+    # Fed by revocation webhooks when WEBHOOKS is set, and by polling POLL if given.
+    'REVOCATION': {
+        'POLL': 'myapp.auth.fetch_revocations',  # fetch(cursor) -> (records, next_cursor)
+        'POLL_INTERVAL': 30,  # seconds; bounds revocation latency without webhooks
+    },
+    # Optional: path prefixes that never carry AuthFlow credentials (not verified)
+    'EXEMPT_PATHS': ['/health', '/static/'],
+    # Optional: cache verified tokens (TTL is capped by the token's exp)
+    'TOKEN_CACHE': {
+        'MAX_SIZE': 10000,
+        'TTL': 300,
+        'SHARED': None,  # Django cache alias to share results across workers
+    },
+    # Optional: webhook endpoint (authflow_webhook_view / authflow_webhook_view_async)
+    'WEBHOOKS': {
+        'SECRETS': ['current-secret', 'previous-secret'],
+        'QUEUE': 'memory',  # or 'sqlite' for a durable queue
+        'QUEUE_PATH': 'authflow-webhooks.sqlite3',
+        'QUEUE_SIZE': 1000,
+        'WORKERS': 4,
+        'TOLERANCE': 300,
+    },
+    # Optional: export client and middleware metrics (see authflow_django.hooks)
+    'INSTRUMENTATION': {
+        'OPENTELEMETRY': False,  # spans via opentelemetry-api
+        'PROMETHEUS': False,     # histograms on prometheus_client's default registry
+    },
 }
 
 MIDDLEWARE = [
@@ -18,56 +52,180 @@ MIDDLEWARE = [
 ]
 """
 
+import hashlib
 import httpx
 import json
-from typing import Dict, Optional, Any
+import threading
+import time
+from typing import Dict, Optional, Any, Tuple
+from authflow import (
+    AuthflowError,
+    Hooks,
+    JSONCodec,
+    JWKSKeyStore,
+    MemoryWebhookQueue,
+    RevocationList,
+    SQLiteWebhookQueue,
+    TTLCache,
+    WebhookQueueFull,
+    WebhookReceiver,
+    WebhookVerificationError,
+    get_json_codec,
+    instrument_opentelemetry,
+    instrument_prometheus,
+    peek_claims,
+    verify_jwt,
+    verify_jwt_async,
+)
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.cache import caches
+from django.http import HttpResponseNotAllowed, JsonResponse
 from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
 from django.views.decorators.csrf import csrf_exempt
 from functools import wraps
 import asyncio
 
 
+# Process-wide instrumentation callbacks shared by AuthFlowClient and AuthFlowMiddleware
+hooks = Hooks()
+_instrumented = False
+_instrumentation_lock = threading.Lock()
+
+
+def configure_instrumentation() -> None:
+    """Attach the exporters enabled in AUTHFLOW['INSTRUMENTATION'] to hooks (once per process)"""
+    global _instrumented
+    with _instrumentation_lock:
+        if _instrumented:
+            return
+        _instrumented = True
+        config = settings.AUTHFLOW.get('INSTRUMENTATION', {})
+        if config.get('OPENTELEMETRY'):
+            instrument_opentelemetry(hooks)
+        if config.get('PROMETHEUS'):
+            instrument_prometheus(hooks)
+
+
+# Process-wide revocation list, active when AUTHFLOW['REVOCATION'] is set
+revocation_list = RevocationList()
+_revocation_configured = False
+_revocation_lock = threading.Lock()
+
+
+def configure_revocation() -> Optional[RevocationList]:
+    """Start polling per AUTHFLOW['REVOCATION'] (once per process); None when not configured"""
+    global _revocation_configured
+    config = settings.AUTHFLOW.get('REVOCATION')
+    if config is None:
+        return None
+    with _revocation_lock:
+        if not _revocation_configured:
+            _revocation_configured = True
+            if config.get('POLL'):
+                revocation_list.start_polling(
+                    import_string(config['POLL']),
+                    interval=config.get('POLL_INTERVAL', 30),
+                )
+    return revocation_list
+
+
+def _api_path(path: str) -> str:
+    """Endpoint as the Python SDK reports it, relative to /api"""
+    return path[4:] if path.startswith('/api/') else path
+
+
 class AuthFlowClient:
     """Sync/Async AuthFlow API client for Django"""
     
-    def __init__(self, domain: str, client_id: str, client_secret: str):
+    def __init__(self, domain: str, client_id: str, client_secret: str,
+                 issuer: Optional[str] = None, leeway: int = 0,
+                 key_store: Optional[JWKSKeyStore] = None,
+                 json_codec: Optional[JSONCodec] = None,
+                 hooks: Hooks = hooks,
+                 revocation_list: Optional[RevocationList] = None):
         self.domain = domain.rstrip('/')
         self.client_id = client_id
         self.client_secret = client_secret
-        self.client = httpx.Client(base_url=self.domain)
-        self.async_client = httpx.AsyncClient(base_url=self.domain)
+        self.issuer = issuer
+        self.leeway = leeway
+        # orjson/msgspec when installed; bodies are encoded and decoded as raw bytes
+        self.json_codec = json_codec or get_json_codec()
+        self.hooks = hooks
+        self.revocation_list = revocation_list
+        headers = {'Content-Type': 'application/json'}
+        self.client = httpx.Client(
+            base_url=self.domain,
+            headers=headers,
+            event_hooks={'request': [self._on_request], 'response': [self._on_response]},
+        )
+        self.async_client = httpx.AsyncClient(
+            base_url=self.domain,
+            headers=headers,
+            event_hooks={'request': [self._aon_request], 'response': [self._aon_response]},
+        )
+        self.key_store = key_store or JWKSKeyStore(
+            f"{self.domain}/.well-known/jwks.json",
+            fetch=self._fetch_jwks,
+            hooks=self.hooks,
+        )
+    
+    def _on_request(self, request: httpx.Request) -> None:
+        if self.hooks.before_request or self.hooks.after_response:
+            endpoint = _api_path(request.url.path)
+            self.hooks.emit('before_request', method=request.method, endpoint=endpoint, attempt=0)
+            request.extensions['authflow_started'] = time.perf_counter()
+    
+    def _on_response(self, response: httpx.Response) -> None:
+        started = response.request.extensions.get('authflow_started')
+        if started is not None and self.hooks.after_response:
+            self.hooks.emit(
+                'after_response',
+                method=response.request.method,
+                endpoint=_api_path(response.request.url.path),
+                status_code=response.status_code,
+                duration=time.perf_counter() - started,
+                attempt=0,
+                error=None,
+            )
+    
+    async def _aon_request(self, request: httpx.Request) -> None:
+        self._on_request(request)
+    
+    async def _aon_response(self, response: httpx.Response) -> None:
+        self._on_response(response)
     
     def register(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Register a new user"""
-        response = self.client.post('/api/auth/register', json=user_data)
+        response = self.client.post('/api/auth/register', content=self.json_codec.dumps(user_data))
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     async def register_async(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Register a new user (async)"""
-        response = await self.async_client.post('/api/auth/register', json=user_data)
+        response = await self.async_client.post('/api/auth/register', content=self.json_codec.dumps(user_data))
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     def login(self, email: str, password: str) -> Dict[str, Any]:
         """Login with email and password"""
-        response = self.client.post('/api/auth/login', json={
+        response = self.client.post('/api/auth/login', content=self.json_codec.dumps({
             'email': email,
             'password': password
-        })
+        }))
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     async def login_async(self, email: str, password: str) -> Dict[str, Any]:
         """Login with email and password (async)"""
-        response = await self.async_client.post('/api/auth/login', json={
+        response = await self.async_client.post('/api/auth/login', content=self.json_codec.dumps({
             'email': email,
             'password': password
-        })
+        }))
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     def verify_token(self, token: str) -> Dict[str, Any]:
         """Verify a JWT token"""
@@ -75,7 +233,7 @@ class AuthFlowClient:
             'Authorization': f'Bearer {token}'
         })
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     async def verify_token_async(self, token: str) -> Dict[str, Any]:
         """Verify a JWT token (async)"""
@@ -83,25 +241,71 @@ class AuthFlowClient:
             'Authorization': f'Bearer {token}'
         })
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
+    
+    def _fetch_jwks(self, url: str):
+        """Fetch the JWKS document for the key store"""
+        response = self.client.get(url)
+        response.raise_for_status()
+        return self.json_codec.loads(response.content), response.headers
+    
+    def verify_token_local(self, token: str, check_revocation: bool = False) -> Dict[str, Any]:
+        """
+        Verify a JWT token offline against the cached JWKS
+        
+        Checks the RS256 signature, exp and (if configured) iss without a
+        network call, and rejects tokens in revocation_list. With
+        check_revocation=True the token is additionally confirmed against
+        /api/auth/me so logged-out sessions are rejected.
+        Returns the same shape as verify_token: {'user': {...}}.
+        """
+        claims = verify_jwt(
+            token, self.key_store, issuer=self.issuer, leeway=self.leeway, revocation_list=self.revocation_list
+        )
+        
+        if check_revocation:
+            return self.verify_token(token)
+        
+        return {'user': self._claims_to_user(claims)}
+    
+    async def verify_token_local_async(self, token: str, check_revocation: bool = False) -> Dict[str, Any]:
+        """Verify a JWT token offline against the cached JWKS (async)"""
+        claims = await verify_jwt_async(
+            token, self.key_store, issuer=self.issuer, leeway=self.leeway, revocation_list=self.revocation_list
+        )
+        
+        if check_revocation:
+            return await self.verify_token_async(token)
+        
+        return {'user': self._claims_to_user(claims)}
+    
+    @staticmethod
+    def _claims_to_user(claims: Dict[str, Any]) -> Dict[str, Any]:
+        """Map JwtPayload claims onto the user fields returned by /api/auth/me"""
+        return {
+            'id': claims.get('userId'),
+            'email': claims.get('email'),
+            'role': claims.get('role'),
+            'tenantId': claims.get('tenantId'),
+        }
     
     def setup_mfa(self, token: str, method: str) -> Dict[str, Any]:
         """Setup MFA for a user"""
         response = self.client.post('/api/auth/mfa/setup', 
-            json={'method': method},
+            content=self.json_codec.dumps({'method': method}),
             headers={'Authorization': f'Bearer {token}'}
         )
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     def verify_mfa(self, token: str, code: str, method: str) -> Dict[str, Any]:
         """Verify MFA code"""
         response = self.client.post('/api/auth/mfa/verify',
-            json={'code': code, 'method': method},
+            content=self.json_codec.dumps({'code': code, 'method': method}),
             headers={'Authorization': f'Bearer {token}'}
         )
         response.raise_for_status()
-        return response.json()
+        return self.json_codec.loads(response.content)
     
     def logout(self, token: str) -> None:
         """Logout a user"""
@@ -116,32 +320,274 @@ class AuthFlowClient:
         return f"{self.domain}/api/auth/oauth/{provider}?{params}"
 
 
+class SharedTokenCache:
+    """Token verification cache shared across workers via Django's cache framework"""
+    
+    def __init__(self, alias: str = 'default', prefix: str = 'authflow:token:'):
+        self.cache = caches[alias]
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.cache.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        if ttl >= 1:
+            self.cache.set(self.prefix + key, value, int(ttl))
+    
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.cache.aget(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    async def aset(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        if ttl >= 1:
+            await self.cache.aset(self.prefix + key, value, int(ttl))
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class _AuthflowUserResolver:
+    """Verifies a request's bearer token on first use and remembers the result"""
+    
+    __slots__ = ('middleware', 'token', 'user', 'resolved')
+    
+    def __init__(self, middleware: 'AuthFlowMiddleware', token: str):
+        self.middleware = middleware
+        self.token = token
+        self.user: Optional[Dict[str, Any]] = None
+        self.resolved = False
+    
+    def get(self) -> Optional[Dict[str, Any]]:
+        if not self.resolved:
+            try:
+                self.user = self.middleware.verify(self.token).get('user')
+            except Exception:
+                self.user = None
+            self.resolved = True
+        return self.user
+    
+    async def aget(self) -> Optional[Dict[str, Any]]:
+        if not self.resolved:
+            try:
+                self.user = (await self.middleware.averify(self.token)).get('user')
+            except Exception:
+                self.user = None
+            self.resolved = True
+        return self.user
+
+
+async def _no_authflow_user() -> None:
+    return None
+
+
 class AuthFlowMiddleware:
-    """Django middleware for AuthFlow authentication"""
+    """
+    Django middleware for AuthFlow authentication
+    
+    Runs natively in both WSGI and ASGI stacks: when the next handler is a
+    coroutine the middleware becomes async and verifies tokens without a
+    sync_to_async thread hop.
+    
+    Like request.user, request.authflow_user is lazy: the bearer token is
+    verified the first time it is read, so requests that never look at the
+    user cost nothing. Async views should use
+    `await request.aauthflow_user()`, which verifies without blocking the
+    event loop; both share one result per request. Paths under
+    AUTHFLOW['EXEMPT_PATHS'] are never verified and get None.
+    """
+    
+    sync_capable = True
+    async_capable = True
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
         config = settings.AUTHFLOW
+        configure_instrumentation()
+        self.hooks = hooks
+        self.revocation_list = configure_revocation()
         self.client = AuthFlowClient(
             config['DOMAIN'],
             config['CLIENT_ID'],
-            config['CLIENT_SECRET']
+            config['CLIENT_SECRET'],
+            issuer=config.get('ISSUER'),
+            leeway=config.get('LEEWAY', 0),
+            revocation_list=self.revocation_list,
         )
+        self.verify_mode = config.get('VERIFY_MODE', 'remote')
+        self.check_revocation = config.get('CHECK_REVOCATION', False)
+        self.exempt_paths = tuple(config.get('EXEMPT_PATHS', ()))
+        
+        cache_config = config.get('TOKEN_CACHE', {})
+        self.token_cache = TTLCache(
+            maxsize=cache_config.get('MAX_SIZE', 10000),
+            ttl=cache_config.get('TTL', 300),
+        )
+        shared_alias = cache_config.get('SHARED')
+        self.shared_token_cache = SharedTokenCache(shared_alias) if shared_alias else None
     
-    def __call__(self, request):
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Verify a bearer token, serving repeat tokens from the cache"""
+        if not self.hooks.on_verify:
+            return self._verify(token)[0]
+        started = time.perf_counter()
+        try:
+            user_data, cached = self._verify(token)
+        except Exception as e:
+            self._emit_verify(started, None, e)
+            raise
+        self._emit_verify(started, cached, None)
+        return user_data
+    
+    async def averify(self, token: str) -> Dict[str, Any]:
+        """Verify a bearer token, serving repeat tokens from the cache (async)"""
+        if not self.hooks.on_verify:
+            return (await self._averify(token))[0]
+        started = time.perf_counter()
+        try:
+            user_data, cached = await self._averify(token)
+        except Exception as e:
+            self._emit_verify(started, None, e)
+            raise
+        self._emit_verify(started, cached, None)
+        return user_data
+    
+    def _verify(self, token: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Returns the user data and which cache answered ('local', 'shared' or None)"""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        user_data = self.token_cache.get(cache_key)
+        if user_data is not None:
+            self._check_revoked(token, cache_key)
+            self._cache_hit('verify')
+            return user_data, 'local'
+        
+        ttl = self._cache_ttl(token)
+        if self.shared_token_cache is not None:
+            user_data = self.shared_token_cache.get(cache_key)
+            if user_data is not None:
+                self._check_revoked(token, cache_key)
+                self._cache_hit('verify_shared')
+                self.token_cache.set(cache_key, user_data, ttl)
+                return user_data, 'shared'
+        
+        user_data = self._verify_uncached(token)
+        self.token_cache.set(cache_key, user_data, ttl)
+        if self.shared_token_cache is not None:
+            self.shared_token_cache.set(cache_key, user_data, ttl)
+        return user_data, None
+    
+    async def _averify(self, token: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        user_data = self.token_cache.get(cache_key)
+        if user_data is not None:
+            self._check_revoked(token, cache_key)
+            self._cache_hit('verify')
+            return user_data, 'local'
         
+        ttl = self._cache_ttl(token)
+        if self.shared_token_cache is not None:
+            user_data = await self.shared_token_cache.aget(cache_key)
+            if user_data is not None:
+                self._check_revoked(token, cache_key)
+                self._cache_hit('verify_shared')
+                self.token_cache.set(cache_key, user_data, ttl)
+                return user_data, 'shared'
+        
+        user_data = await self._averify_uncached(token)
+        self.token_cache.set(cache_key, user_data, ttl)
+        if self.shared_token_cache is not None:
+            await self.shared_token_cache.aset(cache_key, user_data, ttl)
+        return user_data, None
+    
+    def _check_revoked(self, token: str, cache_key: str) -> None:
+        """Reject cached results for tokens revoked since they were cached"""
+        revocations = self.revocation_list
+        # cache_key is the token's SHA-256, the same digest revocation records use
+        if revocations and revocations.is_revoked(peek_claims(token), digest=cache_key):
+            raise AuthflowError('Token has been revoked', 401)
+    
+    def _cache_hit(self, cache: str) -> None:
+        if self.hooks.on_cache_hit:
+            self.hooks.emit('on_cache_hit', cache=cache)
+    
+    def _emit_verify(self, started: float, cached: Optional[str], error: Optional[Exception]) -> None:
+        self.hooks.emit(
+            'on_verify',
+            mode=self.verify_mode,
+            duration=time.perf_counter() - started,
+            cached=cached,
+            error=error,
+        )
+    
+    def _cache_ttl(self, token: str) -> float:
+        """Cache lifetime for a token: the configured TTL, but never past exp"""
+        exp = peek_claims(token).get('exp')
+        if isinstance(exp, (int, float)):
+            return min(self.token_cache.ttl, exp - time.time())
+        return self.token_cache.ttl
+    
+    def _verify_uncached(self, token: str) -> Dict[str, Any]:
+        if self.verify_mode == 'local':
+            return self.client.verify_token_local(token, check_revocation=self.check_revocation)
+        return self.client.verify_token(token)
+    
+    async def _averify_uncached(self, token: str) -> Dict[str, Any]:
+        if self.verify_mode == 'local':
+            return await self.client.verify_token_local_async(token, check_revocation=self.check_revocation)
+        return await self.client.verify_token_async(token)
+    
+    def token_cache_stats(self) -> Dict[str, Any]:
+        """Hit ratio and eviction counters for sizing TOKEN_CACHE"""
+        stats = {'local': self.token_cache.stats()}
+        if self.shared_token_cache is not None:
+            stats['shared'] = self.shared_token_cache.stats()
+        return stats
+    
+    def _bearer_token(self, request) -> Optional[str]:
+        if self.exempt_paths and request.path_info.startswith(self.exempt_paths):
+            return None
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         if auth_header.startswith('Bearer '):
-            token = auth_header[7:]
-            try:
-                user_data = self.client.verify_token(token)
-                request.authflow_user = user_data.get('user')
-            except Exception:
-                request.authflow_user = None
-        else:
+            return auth_header[7:]
+        return None
+    
+    def _attach_user(self, request) -> None:
+        token = self._bearer_token(request)
+        if token is None:
             request.authflow_user = None
-        
+            request.aauthflow_user = _no_authflow_user
+        else:
+            resolver = _AuthflowUserResolver(self, token)
+            request.authflow_user = SimpleLazyObject(resolver.get)
+            request.aauthflow_user = resolver.aget
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        self._attach_user(request)
         return self.get_response(request)
+    
+    async def __acall__(self, request):
+        self._attach_user(request)
+        return await self.get_response(request)
 
 
 def require_authflow_auth(view_func):
@@ -158,12 +604,83 @@ def require_authflow_auth_async(view_func):
     """Async decorator to require AuthFlow authentication"""
     @wraps(view_func)
     async def wrapped_view(request, *args, **kwargs):
-        if not hasattr(request, 'authflow_user') or not request.authflow_user:
+        if not hasattr(request, 'aauthflow_user') or not await request.aauthflow_user():
             return JsonResponse({'error': 'Unauthorized'}, status=401)
         return await view_func(request, *args, **kwargs)
     return wrapped_view
 
 
+_webhook_receiver: Optional[WebhookReceiver] = None
+_webhook_receiver_lock = threading.Lock()
+
+
+def get_webhook_receiver() -> WebhookReceiver:
+    """Process-wide WebhookReceiver configured from AUTHFLOW['WEBHOOKS']"""
+    global _webhook_receiver
+    if _webhook_receiver is None:
+        with _webhook_receiver_lock:
+            if _webhook_receiver is None:
+                config = settings.AUTHFLOW['WEBHOOKS']
+                if config.get('QUEUE', 'memory') == 'sqlite':
+                    queue = SQLiteWebhookQueue(
+                        config.get('QUEUE_PATH', 'authflow-webhooks.sqlite3'),
+                        maxsize=config.get('QUEUE_SIZE'),
+                    )
+                else:
+                    queue = MemoryWebhookQueue(maxsize=config.get('QUEUE_SIZE', 1000))
+                receiver = WebhookReceiver(
+                    config['SECRETS'],
+                    tolerance=config.get('TOLERANCE', 300),
+                    max_workers=config.get('WORKERS', 4),
+                    queue=queue,
+                )
+                revocations = configure_revocation()
+                if revocations is not None:
+                    revocations.subscribe(receiver)
+                _webhook_receiver = receiver
+    return _webhook_receiver
+
+
+def _webhook_error(error: Exception) -> JsonResponse:
+    if isinstance(error, WebhookQueueFull):
+        response = JsonResponse({'error': error.message}, status=503)
+        response['Retry-After'] = '30'
+        return response
+    return JsonResponse({'error': error.message}, status=400)
+
+
+@csrf_exempt
+def authflow_webhook_view(request):
+    """
+    Webhook endpoint: verifies the delivery, queues it and acks immediately
+    
+    Handlers run on the receiver's consumer threads; register them with
+    get_webhook_receiver().on('event.name').
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        queued = get_webhook_receiver().handle(request.body, request.headers)
+    except (WebhookVerificationError, WebhookQueueFull) as e:
+        return _webhook_error(e)
+    return JsonResponse({'received': True, 'duplicate': not queued}, status=202 if queued else 200)
+
+
+async def authflow_webhook_view_async(request):
+    """Async webhook endpoint for ASGI deployments (see authflow_webhook_view)"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        queued = await get_webhook_receiver().handle_async(request.body, request.headers)
+    except (WebhookVerificationError, WebhookQueueFull) as e:
+        return _webhook_error(e)
+    return JsonResponse({'received': True, 'duplicate': not queued}, status=202 if queued else 200)
+
+
+# Set directly: csrf_exempt wraps coroutines in a sync function before Django 5.0
+authflow_webhook_view_async.csrf_exempt = True
+
+
 # Example usage in views.py:
 """
 from authflow_django import AuthFlowClient, require_authflow_auth
@@ -177,11 +694,26 @@ authflow = AuthFlowClient(
 
 @require_authflow_auth
 def protected_view(request):
-    user = request.authflow_user
+    # authflow_user is a lazy proxy; copy it before serializing
+    user = dict(request.authflow_user)
+    return JsonResponse({'user': user})
+
+@require_authflow_auth_async
+async def async_protected_view(request):
+    user = await request.aauthflow_user()
     return JsonResponse({'user': user})
 
 async def async_login(request):
     data = json.loads(request.body)
     result = await authflow.login_async(data['email'], data['password'])
     return JsonResponse(result)
+
+# Webhooks (urls.py / apps.py)
+from authflow_django import authflow_webhook_view, get_webhook_receiver
+
+urlpatterns = [path('webhooks/authflow/', authflow_webhook_view)]
+
+@get_webhook_receiver().on('user.created')
+def on_user_created(event):
+    provision_account(event.data)
 """
@@ -4,6 +4,30 @@ Official Python client for Authflow Authentication Platform
 """
 
 from .client import AuthflowClient
+from .async_client import AsyncAuthflowClient
+from .cache import TTLCache
+from .codec import JSONCodec, OrjsonCodec, MsgspecCodec, get_json_codec
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from .hooks import Hooks, endpoint_template
+from .telemetry import instrument_opentelemetry, instrument_prometheus
+from .ratelimit import RateLimiter, TokenBucket, RateLimitedError
+from .revocation import RevocationList, REVOCATION_EVENTS, token_hash
+from .sessions import SessionStore, InMemorySessionStore, FileSessionStore, RedisSessionStore
+from .token_manager import TokenManager, TokenAuth
+from .api_keys import APIKeyAuthenticator, api_key_hash
+from .registry import AuthflowClientRegistry, AsyncAuthflowClientRegistry
+from .webhooks import (
+    WebhookReceiver,
+    WebhookEvent,
+    WebhookVerificationError,
+    WebhookQueue,
+    WebhookQueueFull,
+    MemoryWebhookQueue,
+    SQLiteWebhookQueue,
+    verify_webhook_signature,
+)
+from .jwks import JWKSKeyStore, verify_jwt, verify_jwt_async, peek_claims
+from .models import UserView, APIKeyView, ClaimsUser, parse_datetime
 from .types import (
     AuthflowConfig,
     User,
@@ -20,11 +44,56 @@ from .types import (
     OAuth2TokenResponse,
     APIKeyCreateRequest,
     APIKey,
+    APIKeyGrant,
+    UserImportResult,
+    BatchItemResult,
+    AuthflowError,
 )
 
 __version__ = "1.0.0"
 __all__ = [
     "AuthflowClient",
+    "AsyncAuthflowClient",
+    "JWKSKeyStore",
+    "verify_jwt",
+    "verify_jwt_async",
+    "peek_claims",
+    "TTLCache",
+    "JSONCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "get_json_codec",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Hooks",
+    "endpoint_template",
+    "instrument_opentelemetry",
+    "instrument_prometheus",
+    "RateLimiter",
+    "RevocationList",
+    "REVOCATION_EVENTS",
+    "token_hash",
+    "TokenBucket",
+    "RateLimitedError",
+    "TokenManager",
+    "APIKeyAuthenticator",
+    "AuthflowClientRegistry",
+    "AsyncAuthflowClientRegistry",
+    "api_key_hash",
+    "TokenAuth",
+    "WebhookReceiver",
+    "WebhookEvent",
+    "WebhookVerificationError",
+    "WebhookQueue",
+    "WebhookQueueFull",
+    "MemoryWebhookQueue",
+    "SQLiteWebhookQueue",
+    "verify_webhook_signature",
+    "SessionStore",
+    "InMemorySessionStore",
+    "FileSessionStore",
+    "RedisSessionStore",
     "AuthflowConfig",
     "User",
     "Session",
@@ -40,4 +109,12 @@ __all__ = [
     "OAuth2TokenResponse",
     "APIKeyCreateRequest",
     "APIKey",
+    "APIKeyGrant",
+    "UserImportResult",
+    "BatchItemResult",
+    "UserView",
+    "ClaimsUser",
+    "APIKeyView",
+    "parse_datetime",
+    "AuthflowError",
 ]
@@ -0,0 +1,333 @@
+"""In-memory authentication of AuthFlow API keys for services that accept them"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from .cache import TTLCache
+from .client import AuthflowClient
+from .models import _optional_datetime
+from .types import APIKeyGrant, AuthflowError
+
+# Leading characters of a key the server stores as keyPrefix
+KEY_PREFIX_LENGTH = 16
+
+# Webhook events handled by APIKeyAuthenticator.subscribe()
+API_KEY_EVENTS = ("api_key.created", "api_key.updated", "api_key.revoked", "api_key.deleted")
+
+
+def api_key_hash(key: str) -> str:
+    """SHA-256 hex digest of an API key, as the server stores it"""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _grant_fields(record: Mapping[str, Any]) -> tuple:
+    """The parts of a key record a cached grant depends on (not lastUsedAt)"""
+    return (record.get("permissions"), record.get("isActive", True), record.get("expiresAt"), record.get("keyPrefix"))
+
+
+class APIKeyAuthenticator:
+    """
+    Authenticates API keys and answers permission checks from memory
+
+    Keys are indexed by their SHA-256 hash. A key seen for the first time
+    is confirmed once against the server (/auth/me accepts API keys) and
+    matched by prefix to the key metadata loaded from /admin/api-keys;
+    the resulting grant is cached until the key expires or ttl passes.
+    Rejected keys are remembered for negative_ttl so repeated invalid keys
+    never reach the server, and at most max_pending validations run at
+    once.
+
+    Cache hits cost a hash and a dict lookup. Revocations reach the index
+    through subscribe() (webhooks), revoke(), or the periodic reload of
+    start_sync(); ttl bounds how long a revoked key can go unnoticed
+    without them.
+    """
+
+    def __init__(
+        self,
+        client: AuthflowClient,
+        ttl: float = 300.0,
+        maxsize: int = 10000,
+        negative_ttl: float = 60.0,
+        negative_maxsize: int = 100000,
+        max_pending: int = 16,
+        reload_interval: float = 10.0,
+    ):
+        """
+        Initialize the authenticator
+
+        Args:
+            client: AuthflowClient signed in as a tenant admin (or with an
+                api_keys:read key) used to load and confirm keys
+            ttl: Longest time a confirmed key is trusted without the server
+            maxsize: Maximum number of cached grants
+            negative_ttl: How long a rejected key is refused locally
+            negative_maxsize: Maximum number of remembered rejected keys
+            max_pending: Concurrent server validations before new unknown
+                keys are refused with 429
+            reload_interval: Minimum seconds between index reloads triggered
+                by a valid key missing from the index
+        """
+        self.client = client
+        self.reload_interval = reload_interval
+        self._grants = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._rejected = TTLCache(maxsize=negative_maxsize, ttl=negative_ttl)
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_prefix: Dict[str, List[Dict[str, Any]]] = {}
+        # key id -> hashes of its cached grants, to drop them on revocation
+        self._digests: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._loaded_at = 0.0
+        self._sync_stop: Optional[threading.Event] = None
+
+        self.validations = 0
+        self.rejections = 0
+        self.throttled = 0
+
+    # ==================
+    # INDEX
+    # ==================
+
+    def load(self, records: Optional[Iterable[Mapping[str, Any]]] = None) -> int:
+        """
+        Replace the key metadata index
+
+        Cached grants of keys that are gone, revoked or changed are dropped.
+
+        Args:
+            records: /admin/api-keys records (fetched through the client when None)
+
+        Returns:
+            Number of keys indexed
+        """
+        if records is None:
+            records = self.client.iter_api_keys(page_size=100, prefetch=False, view="raw")
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_prefix: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            record = dict(record)
+            by_id[record["id"]] = record
+            by_prefix.setdefault(record.get("keyPrefix", ""), []).append(record)
+        with self._lock:
+            previous = self._records
+            self._records, self._by_prefix = by_id, by_prefix
+            self._loaded_at = time.monotonic()
+        for key_id, record in previous.items():
+            current = by_id.get(key_id)
+            if current is None or _grant_fields(current) != _grant_fields(record):
+                self._drop_grants(key_id)
+        return len(by_id)
+
+    def upsert(self, record: Mapping[str, Any]) -> None:
+        """Add or replace one key's metadata (e.g. from an api_key.created event)"""
+        record = dict(record)
+        with self._lock:
+            old = self._records.get(record["id"])
+            if old is not None:
+                self._by_prefix[old.get("keyPrefix", "")] = [
+                    r for r in self._by_prefix.get(old.get("keyPrefix", ""), []) if r["id"] != record["id"]
+                ]
+            self._records[record["id"]] = record
+            self._by_prefix.setdefault(record.get("keyPrefix", ""), []).append(record)
+        if old is not None and _grant_fields(old) != _grant_fields(record):
+            self._drop_grants(record["id"])
+
+    def revoke(self, key_id: str) -> None:
+        """Stop accepting a key immediately"""
+        with self._lock:
+            record = self._records.get(key_id)
+            if record is not None:
+                self._records[key_id] = record = dict(record, isActive=False)
+                prefix = record.get("keyPrefix", "")
+                self._by_prefix[prefix] = [
+                    record if r["id"] == key_id else r for r in self._by_prefix.get(prefix, [])
+                ]
+        self._drop_grants(key_id)
+
+    def _drop_grants(self, key_id: str) -> None:
+        with self._lock:
+            digests = self._digests.pop(key_id, ())
+        for digest in digests:
+            self._grants.delete(digest)
+
+    def handle_event(self, event: Any) -> None:
+        """Webhook handler for api_key.* events (a WebhookEvent)"""
+        data = event.data or {}
+        key_id = data.get("id") or data.get("keyId")
+        if not key_id:
+            return
+        if event.event in ("api_key.revoked", "api_key.deleted"):
+            self.revoke(key_id)
+        else:
+            self.upsert(dict(data, id=key_id))
+
+    def subscribe(self, receiver: Any, events: Iterable[str] = API_KEY_EVENTS) -> None:
+        """Register handle_event on a WebhookReceiver"""
+        for name in events:
+            receiver.add_handler(name, self.handle_event)
+
+    def start_sync(self, interval: float = 300.0) -> None:
+        """Reload the index on a background thread (loads it first)"""
+        if self._sync_stop is not None:
+            return
+        self.load()
+        stop = self._sync_stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.load()
+                except AuthflowError:
+                    pass  # keep serving from the current index; retry next interval
+
+        threading.Thread(target=run, name="authflow-api-key-sync", daemon=True).start()
+
+    def stop_sync(self) -> None:
+        """Stop the background reload"""
+        if self._sync_stop is not None:
+            self._sync_stop.set()
+            self._sync_stop = None
+
+    # ==================
+    # AUTHENTICATION
+    # ==================
+
+    def authenticate(self, key: str) -> APIKeyGrant:
+        """
+        Authenticate an API key
+
+        Args:
+            key: The key as presented by the caller (ak_...)
+
+        Returns:
+            The key's grant
+
+        Raises:
+            AuthflowError: 401 if the key is invalid, revoked or expired;
+                429 if too many unknown keys are being validated
+        """
+        digest = api_key_hash(key)
+        grant = self._cached(digest)
+        if grant is not None:
+            return grant
+        return self._validate(key, digest)
+
+    async def authenticate_async(self, key: str) -> APIKeyGrant:
+        """Authenticate an API key; cache hits are answered inline, misses off the event loop"""
+        digest = api_key_hash(key)
+        grant = self._cached(digest)
+        if grant is not None:
+            return grant
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._validate, key, digest)
+
+    def has_permission(self, key: str, permission: str) -> bool:
+        """True if the key is valid and grants permission"""
+        try:
+            return self.authenticate(key).allows(permission)
+        except AuthflowError:
+            return False
+
+    async def has_permission_async(self, key: str, permission: str) -> bool:
+        """True if the key is valid and grants permission"""
+        try:
+            return (await self.authenticate_async(key)).allows(permission)
+        except AuthflowError:
+            return False
+
+    def _cached(self, digest: str) -> Optional[APIKeyGrant]:
+        """Return a cached grant, or raise if the key was recently rejected"""
+        hooks = self.client.hooks
+        grant = self._grants.get(digest)
+        if grant is not None:
+            if hooks.on_cache_hit:
+                hooks.emit("on_cache_hit", cache="api_key")
+            return grant
+        if self._rejected.get(digest) is not None:
+            if hooks.on_cache_hit:
+                hooks.emit("on_cache_hit", cache="api_key_rejected")
+            self.rejections += 1
+            raise AuthflowError("Invalid or revoked API key", 401)
+        return None
+
+    def _reject(self, digest: str, message: str = "Invalid or revoked API key") -> AuthflowError:
+        self._rejected.set(digest, True)
+        self.rejections += 1
+        return AuthflowError(message, 401)
+
+    def _validate(self, key: str, digest: str) -> APIKeyGrant:
+        if not key.startswith("ak_"):
+            raise self._reject(digest)
+        if not self._pending.acquire(blocking=False):
+            self.throttled += 1
+            raise AuthflowError("Too many API key validations in progress", 429)
+        try:
+            # Another caller may have validated the same key while we waited
+            grant = self._grants.get(digest)
+            if grant is not None:
+                return grant
+            self.validations += 1
+            try:
+                response = self.client._request(
+                    "GET", "/auth/me", headers={"Authorization": f"Bearer {key}"}, idempotent=True
+                )
+            except AuthflowError as e:
+                if e.status_code in (401, 403):
+                    raise self._reject(digest, e.message)
+                raise
+            owner = self.client._me_user(response)
+            if "id" not in owner:
+                raise AuthflowError("Unexpected /auth/me response: user has no id")
+            record = self._find_record(key)
+            if record is None:
+                raise self._reject(digest)
+            grant = APIKeyGrant(
+                key_id=record["id"],
+                user_id=owner["id"],
+                permissions=tuple(record.get("permissions") or ()),
+                name=record.get("name"),
+                tenant_id=owner.get("tenantId"),
+                expires_at=_optional_datetime(record.get("expiresAt")),
+            )
+            ttl = None
+            if grant.expires_at is not None:
+                ttl = grant.expires_at.timestamp() - time.time()
+                if ttl <= 0:
+                    raise self._reject(digest, "API key has expired")
+            self._grants.set(digest, grant, ttl)
+            with self._lock:
+                self._digests.setdefault(grant.key_id, set()).add(digest)
+            return grant
+        finally:
+            self._pending.release()
+
+    def _find_record(self, key: str) -> Optional[Dict[str, Any]]:
+        """Metadata of an active key matching the presented key's prefix"""
+        record = self._match_prefix(key)
+        if record is None and time.monotonic() - self._loaded_at >= self.reload_interval:
+            # The key may have been created after the last load
+            self.load()
+            record = self._match_prefix(key)
+        return record
+
+    def _match_prefix(self, key: str) -> Optional[Dict[str, Any]]:
+        candidates = [
+            r for r in self._by_prefix.get(key[:KEY_PREFIX_LENGTH], ()) if r.get("isActive", True)
+        ]
+        # The prefix carries 32 random bits; an ambiguous match can't be resolved locally
+        return candidates[0] if len(candidates) == 1 else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size, cache hit ratios and validation counters"""
+        return {
+            "indexed": len(self._records),
+            "grants": self._grants.stats(),
+            "rejected": self._rejected.stats(),
+            "validations": self.validations,
+            "rejections": self.rejections,
+            "throttled": self.throttled,
+        }
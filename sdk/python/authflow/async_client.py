@@ -0,0 +1,497 @@
+"""Authflow asyncio client"""
+
+import asyncio
+import time
+import weakref
+from datetime import datetime
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Iterable, Tuple
+
+from .base import ApiCall, BaseAuthflowClient
+from .types import (
+    AuthflowConfig,
+    User,
+    Session,
+    LoginCredentials,
+    RegisterData,
+    MFASetupResponse,
+    MFAVerifyRequest,
+    MagicLinkRequest,
+    PasswordResetRequest,
+    PasswordResetComplete,
+    OAuth2TokenRequest,
+    OAuth2TokenResponse,
+    APIKeyCreateRequest,
+    APIKey,
+    BatchItemResult,
+    AuthflowError,
+)
+from .batch import arun_batch
+from .pagination import DEFAULT_PAGE_SIZE, aiterate_pages
+from .jwks import JWKSKeyStore, verify_jwt_async
+from .models import ClaimsUser
+from .cache import TTLCache
+from .codec import JSONCodec
+from .hooks import Hooks
+from .ratelimit import RateLimiter
+from .revocation import RevocationList
+from .retry import CircuitBreaker, RetryPolicy
+from .sessions import SessionStore
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncAuthflowClient(BaseAuthflowClient):
+    """
+    Authflow Authentication Client for asyncio
+
+    Same surface as AuthflowClient, with every network method awaitable.
+    All calls share one pooled httpx.AsyncClient (HTTP/2 when the h2
+    package is installed), so a single event loop can multiplex many
+    concurrent auth calls over a few connections.
+    """
+
+    def __init__(
+        self,
+        config: AuthflowConfig,
+        key_store: Optional[JWKSKeyStore] = None,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        http2: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        session_store: Optional[SessionStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_codec: Optional[JSONCodec] = None,
+        hooks: Optional[Hooks] = None,
+        profile_cache: Optional[TTLCache] = None,
+        revocation_list: Optional[RevocationList] = None,
+    ):
+        """
+        Initialize async Authflow client
+
+        Args:
+            config: AuthflowConfig object with domain and optional tenant_slug
+            key_store: Optional shared JWKSKeyStore for offline token verification
+            http_client: Optional httpx.AsyncClient to use instead of creating one
+            http2: Negotiate HTTP/2 (requires httpx[http2])
+            retry_policy: Retry policy for failed requests (RetryPolicy(max_retries=0) disables)
+            circuit_breaker: Circuit breaker shared by all requests of this client
+            session_store: Where sessions are kept (in memory by default)
+            rate_limiter: Per-endpoint-class pacing and server block tracking
+            json_codec: JSON encoder/decoder for bodies (orjson or msgspec if installed)
+            hooks: Instrumentation callbacks, e.g. for instrument_prometheus(client.hooks)
+            profile_cache: Profiles fetched for get_token_user(), by user id
+            revocation_list: Revoked tokens to reject in offline verification
+        """
+        if httpx is None:
+            raise AuthflowError("httpx is required for AsyncAuthflowClient: pip install authflow[async]")
+
+        super().__init__(
+            config,
+            key_store,
+            retry_policy,
+            circuit_breaker,
+            session_store,
+            rate_limiter,
+            json_codec,
+            hooks,
+            profile_cache,
+            revocation_list,
+        )
+        self._refresh_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._auto_refresh_task: Optional["asyncio.Task[None]"] = None
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(
+            http2=http2 and self._h2_available(),
+            limits=httpx.Limits(
+                max_connections=config.pool_maxsize,
+                max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+                keepalive_expiry=config.keep_alive_expiry,
+            ),
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+        )
+
+    def _init_view(self) -> None:
+        self._auto_refresh_task = None
+        self._owns_http_client = False
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """
+        Make an HTTP request to the API
+
+        Requests are paced by rate_limiter, transient failures are retried
+        according to retry_policy, and the request fails fast with
+        CircuitOpenError while the circuit is open. Each attempt is reported
+        to hooks.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint path
+            data: Request body data
+            headers: Additional headers
+            idempotent: Whether the call is safe to repeat (defaults by method)
+
+        Returns:
+            Response data (JSON decoded)
+
+        Raises:
+            AuthflowError: If request fails
+        """
+        url = f"{self.base_url}{endpoint}"
+        req_headers = self._build_headers(headers)
+        body = self._encode_body(data)
+        hooks = self.hooks
+        attempt = 0
+
+        while True:
+            pause = self.rate_limiter.acquire(endpoint, data)
+            if pause:
+                await asyncio.sleep(pause)
+            self.circuit_breaker.before_request()
+            if hooks.before_request:
+                hooks.emit("before_request", method=method, endpoint=endpoint, attempt=attempt)
+            started = time.perf_counter()
+            status_code: Optional[int] = None
+            error: Optional[Exception] = None
+            try:
+                response = await self._http_client.request(
+                    method,
+                    url,
+                    content=body,
+                    headers=req_headers,
+                )
+            except httpx.HTTPError as e:
+                error = e
+                if hooks.after_response:
+                    self._emit_response(method, endpoint, attempt, started, None, e)
+                self.circuit_breaker.record_failure()
+                retryable = isinstance(e, httpx.TransportError)
+                delay = self.retry_policy.next_delay(
+                    method,
+                    attempt,
+                    sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                    idempotent=idempotent,
+                ) if retryable else None
+                if delay is None:
+                    raise AuthflowError(f"Request failed: {str(e)}")
+            else:
+                status_code = response.status_code
+                if hooks.after_response:
+                    self._emit_response(method, endpoint, attempt, started, status_code, None)
+                retry_after = self._record_response(endpoint, data, response)
+                delay = self.retry_policy.next_delay(
+                    method,
+                    attempt,
+                    status_code=response.status_code,
+                    retry_after=retry_after,
+                    idempotent=idempotent,
+                ) if response.status_code >= 400 else None
+                if delay is None:
+                    return self._parse_response(response)
+
+            if hooks.on_retry:
+                hooks.emit(
+                    "on_retry",
+                    method=method,
+                    endpoint=endpoint,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=status_code,
+                    error=error,
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _call(self, call: ApiCall) -> Any:
+        """Execute an ApiCall and parse its response"""
+        if call.refresh_first and self.config.auto_refresh:
+            await self._refresh_if_needed()
+        response = await self._request(call.method, call.endpoint, call.data, idempotent=call.idempotent)
+        return call.parse(response) if call.parse else response
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        self.stop_auto_refresh()
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncAuthflowClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # ==================
+    # AUTHENTICATION
+    # ==================
+
+    async def register(self, data: RegisterData) -> User:
+        """Register a new user"""
+        return await self._call(self._register_call(data))
+
+    async def login(self, credentials: LoginCredentials) -> Session:
+        """Login user and create session"""
+        return await self._call(self._login_call(credentials))
+
+    async def logout(self) -> None:
+        """Logout current user and end session"""
+        try:
+            await self._call(self._logout_call())
+        finally:
+            self._clear_session()
+
+    async def get_current_user(self) -> User:
+        """Get current authenticated user"""
+        return await self._call(self._current_user_call())
+
+    async def get_token_user(self, token: Optional[str] = None) -> ClaimsUser:
+        """Get the user an access token belongs to from its verified claims (await load_profile() for other fields)"""
+        token = self._access_token(token)
+        claims = await verify_jwt_async(
+            token, self.jwks, issuer=self.config.issuer, revocation_list=self.revocation_list
+        )
+        return ClaimsUser(claims, aload=lambda: self._load_profile(claims["userId"], token))
+
+    async def _load_profile(self, user_id: str, token: str) -> User:
+        user = self._cached_profile(user_id)
+        if user is None:
+            user = self._store_profile(user_id, await self._request("GET", "/auth/me", headers=self._bearer(token)))
+        return user
+
+    async def refresh_token(self) -> Session:
+        """Refresh access token using refresh token (concurrent callers share one request)"""
+        lock = self._refresh_locks.get(self.session_key)
+        if lock is None:
+            lock = self._refresh_locks[self.session_key] = asyncio.Lock()
+        session = self.session
+        async with lock:
+            current = self.session
+            if self._refreshed_elsewhere(session, current):
+                return current
+            started = time.perf_counter()
+            try:
+                refreshed = await self._call(self._refresh_call())
+            except AuthflowError as e:
+                if self.hooks.on_refresh:
+                    self._emit_refresh(started, e)
+                raise
+            if self.hooks.on_refresh:
+                self._emit_refresh(started, None)
+            return refreshed
+
+    async def _refresh_if_needed(self) -> None:
+        """Refresh ahead of expiry; an expiring-but-valid token is kept if refresh fails"""
+        session = self.session
+        if not self._needs_refresh(session):
+            return
+        try:
+            await self.refresh_token()
+        except AuthflowError:
+            if session.expires_at <= datetime.now():
+                raise
+
+    def start_auto_refresh(self) -> None:
+        """Refresh the session from an asyncio task shortly before it expires"""
+        if self._auto_refresh_task is not None:
+            return
+
+        async def run() -> None:
+            while True:
+                session = self.session
+                delay = self._seconds_until_refresh(session) if session else self.config.refresh_ahead
+                await asyncio.sleep(max(delay, 1.0))
+                try:
+                    await self._refresh_if_needed()
+                except AuthflowError:
+                    pass
+
+        self._auto_refresh_task = asyncio.get_running_loop().create_task(run())
+
+    def stop_auto_refresh(self) -> None:
+        """Cancel the background refresh task"""
+        if self._auto_refresh_task is not None:
+            self._auto_refresh_task.cancel()
+            self._auto_refresh_task = None
+
+    # ==================
+    # MFA
+    # ==================
+
+    async def setup_mfa(self, method: str = 'totp') -> MFASetupResponse:
+        """Setup MFA for current user"""
+        return await self._call(self._setup_mfa_call(method))
+
+    async def verify_mfa(self, data: MFAVerifyRequest) -> Session:
+        """Verify MFA code"""
+        return await self._call(self._verify_mfa_call(data))
+
+    async def disable_mfa(self) -> None:
+        """Disable MFA for current user"""
+        await self._call(self._disable_mfa_call())
+
+    # ==================
+    # MAGIC LINKS
+    # ==================
+
+    async def request_magic_link(self, data: MagicLinkRequest) -> Dict[str, str]:
+        """Request a magic link for passwordless login"""
+        return await self._call(self._request_magic_link_call(data))
+
+    async def verify_magic_link(self, token: str) -> Session:
+        """Verify magic link token"""
+        return await self._call(self._verify_magic_link_call(token))
+
+    # ==================
+    # PASSWORD RESET
+    # ==================
+
+    async def request_password_reset(self, data: PasswordResetRequest) -> Dict[str, str]:
+        """Request password reset link"""
+        return await self._call(self._request_password_reset_call(data))
+
+    async def reset_password(self, data: PasswordResetComplete) -> Dict[str, str]:
+        """Complete password reset"""
+        return await self._call(self._reset_password_call(data))
+
+    # ==================
+    # OAUTH2 / OIDC
+    # ==================
+
+    async def exchange_code_for_token(self, data: OAuth2TokenRequest) -> OAuth2TokenResponse:
+        """Exchange authorization code for access token"""
+        return await self._call(self._exchange_code_call(data))
+
+    async def get_oauth2_user_info(self) -> User:
+        """Get user info from OAuth2 token"""
+        return await self._call(self._oauth2_user_info_call())
+
+    # ==================
+    # API KEYS
+    # ==================
+
+    async def create_api_key(self, data: APIKeyCreateRequest) -> APIKey:
+        """Create a new API key"""
+        return await self._call(self._create_api_key_call(data))
+
+    async def list_api_keys(self, view: str = "model") -> List[APIKey]:
+        """List all API keys ('model', 'lazy' or 'raw' records, see AuthflowClient.list_api_keys)"""
+        return await self._call(self._list_api_keys_call(view))
+
+    async def delete_api_key(self, key_id: str) -> None:
+        """Delete an API key"""
+        await self._call(self._delete_api_key_call(key_id))
+
+    # ==================
+    # PAGINATED LISTS
+    # ==================
+
+    def _iter_pages(
+        self,
+        endpoint: str,
+        convert: Optional[Callable[[Dict[str, Any]], Any]],
+        page_size: int,
+        prefetch: bool,
+        params: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[Any]:
+        return aiterate_pages(
+            lambda limit, offset: self._call(self._list_page_call(endpoint, limit, offset, params)),
+            convert,
+            page_size,
+            prefetch,
+        )
+
+    def iter_users(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, view: str = "model"
+    ) -> AsyncIterator[User]:
+        """Iterate over the users of the current tenant (use with async for)"""
+        return self._iter_pages("/tenant-admin/users", self._converter("user", view), page_size, prefetch)
+
+    def iter_sessions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over active sessions in the current tenant (tenant admin only)"""
+        return self._iter_pages("/tenant-admin/sessions", None, page_size, prefetch)
+
+    def iter_login_history(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the current user's login history"""
+        return self._iter_pages("/user/login-history", None, page_size, prefetch)
+
+    def iter_security_events(
+        self, user_id: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over security events for the current user, or user_id (admins only)"""
+        params = {"userId": user_id} if user_id else None
+        return self._iter_pages("/security-events", None, page_size, prefetch, params)
+
+    def iter_webhook_deliveries(
+        self, webhook_id: str, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over recent deliveries of a webhook (admin only)"""
+        return self._iter_pages(f"/admin/webhooks/{webhook_id}/deliveries", None, page_size, prefetch)
+
+    def iter_api_keys(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, view: str = "model"
+    ) -> AsyncIterator[APIKey]:
+        """Iterate over the tenant's API keys from /admin/api-keys, converting each only when it is consumed"""
+        return self._iter_pages("/admin/api-keys", self._converter("api_key", view), page_size, prefetch)
+
+    # ==================
+    # ADMIN
+    # ==================
+
+    async def revoke_session(self, session_id: str) -> None:
+        """Revoke a session in the current tenant (tenant admin only)"""
+        await self._call(self._revoke_session_call(session_id))
+
+    async def delete_user(self, user_id: str) -> None:
+        """Delete a user in the current tenant (tenant admin only)"""
+        await self._call(self._delete_user_call(user_id))
+
+    async def update_user_role(self, user_id: str, role: str) -> Dict[str, Any]:
+        """Change a user's role (tenant admin only); returns the server's partial user dict"""
+        return await self._call(self._update_user_role_call(user_id, role))
+
+    # ==================
+    # BATCH OPERATIONS
+    # ==================
+
+    async def revoke_sessions(self, session_ids: Iterable[str], concurrency: int = 16) -> List[BatchItemResult]:
+        """Revoke many sessions with bounded concurrency; failures are reported per item"""
+        return await arun_batch(self.revoke_session, session_ids, concurrency)
+
+    async def delete_users(self, user_ids: Iterable[str], concurrency: int = 16) -> List[BatchItemResult]:
+        """Delete many users with bounded concurrency; failures are reported per item"""
+        return await arun_batch(self.delete_user, user_ids, concurrency)
+
+    async def update_user_roles(
+        self, changes: Iterable[Tuple[str, str]], concurrency: int = 16
+    ) -> List[BatchItemResult]:
+        """Apply (user_id, role) changes with bounded concurrency; failures are reported per item"""
+        return await arun_batch(lambda change: self.update_user_role(*change), changes, concurrency)
+
+    async def delete_api_keys(self, key_ids: Iterable[str], concurrency: int = 16) -> List[BatchItemResult]:
+        """Delete many API keys with bounded concurrency; failures are reported per item"""
+        return await arun_batch(self.delete_api_key, key_ids, concurrency)
+
+    # ==================
+    # UTILITIES
+    # ==================
+
+    async def check_password_breach(self, password: str) -> Dict[str, bool]:
+        """Check if password has been breached (Have I Been Pwned)"""
+        return await self._call(self._check_password_breach_call(password))
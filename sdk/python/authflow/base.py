@@ -0,0 +1,779 @@
+"""Transport-independent request building and response parsing shared by the sync and async clients"""
+
+import copy
+import dataclasses
+import time
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Callable, NamedTuple
+from urllib.parse import urlencode
+
+from .types import (
+    AuthflowConfig,
+    User,
+    Session,
+    LoginCredentials,
+    RegisterData,
+    MFASetupResponse,
+    MFAVerifyRequest,
+    MagicLinkRequest,
+    PasswordResetRequest,
+    PasswordResetComplete,
+    OAuth2AuthorizeParams,
+    OAuth2TokenRequest,
+    OAuth2TokenResponse,
+    APIKeyCreateRequest,
+    APIKey,
+    AuthflowError,
+)
+from .cache import TTLCache
+from .models import APIKeyView, ClaimsUser, UserView, parse_datetime
+from .codec import JSONCodec, get_json_codec
+from .hooks import Hooks
+from .jwks import JWKSFetcher, JWKSKeyStore, peek_claims, verify_jwt
+from .ratelimit import RateLimiter
+from .revocation import RevocationList
+from .retry import CircuitBreaker, RetryPolicy
+from .sessions import InMemorySessionStore, SessionStore
+
+
+class ApiCall(NamedTuple):
+    """A single API call: what to send and how to turn the response into a result"""
+    method: str
+    endpoint: str
+    data: Optional[Dict[str, Any]] = None
+    parse: Optional[Callable[[Any], Any]] = None
+    idempotent: Optional[bool] = None
+    refresh_first: bool = True
+
+
+class BaseAuthflowClient:
+    """
+    Shared core of AuthflowClient and AsyncAuthflowClient
+
+    Subclasses supply the transport (_request / _call); everything else,
+    including request payloads and response-to-model conversion, lives here.
+    """
+
+    def __init__(
+        self,
+        config: AuthflowConfig,
+        key_store: Optional[JWKSKeyStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        session_store: Optional[SessionStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_codec: Optional[JSONCodec] = None,
+        hooks: Optional[Hooks] = None,
+        profile_cache: Optional[TTLCache] = None,
+        revocation_list: Optional[RevocationList] = None,
+    ):
+        """
+        Initialize Authflow client
+
+        Args:
+            config: AuthflowConfig object with domain and optional tenant_slug
+            key_store: Optional shared JWKSKeyStore for offline token verification
+            retry_policy: Retry policy for failed requests (RetryPolicy(max_retries=0) disables)
+            circuit_breaker: Circuit breaker shared by all requests of this client
+            session_store: Where sessions are kept (in memory by default)
+            rate_limiter: Per-endpoint-class pacing and server block tracking
+            json_codec: JSON encoder/decoder for bodies (fastest installed by default)
+            hooks: Instrumentation callbacks (see Hooks)
+            profile_cache: User profiles fetched for get_token_user(), by user id
+                (5 minutes, 10000 users by default)
+            revocation_list: Revoked tokens to reject in offline verification
+        """
+        self.config = config
+        self.session_store = session_store or InMemorySessionStore()
+        self.session_key = "default"
+        self._key_store = key_store
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.json_codec = json_codec or get_json_codec()
+        self.hooks = hooks or Hooks()
+        self.profile_cache = profile_cache or TTLCache(maxsize=10000, ttl=300)
+        self.revocation_list = revocation_list
+
+    @property
+    def base_url(self) -> str:
+        """Get base API URL"""
+        return f"{self.config.domain}/api"
+
+    def _build_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Build request headers, adding the session's bearer token"""
+        req_headers = {
+            "Content-Type": "application/json",
+            **(headers or {}),
+        }
+
+        if self.session and self.session.access_token and "Authorization" not in req_headers:
+            req_headers["Authorization"] = f"Bearer {self.session.access_token}"
+
+        return req_headers
+
+    def _record_status(self, status_code: int) -> None:
+        """Feed a response status into the circuit breaker"""
+        if status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _record_response(self, endpoint: str, data: Optional[Dict[str, Any]], response: Any) -> Optional[str]:
+        """Feed a response into the circuit breaker and rate limiter; returns its retry delay"""
+        self._record_status(response.status_code)
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code != 429:
+            self.rate_limiter.record(endpoint, response.status_code, data=data)
+            return retry_after
+        seconds = RateLimiter.retry_after_from(retry_after, self._decode_body(response, None))
+        self.rate_limiter.record(endpoint, 429, seconds, data)
+        return None if seconds is None else str(seconds)
+
+    def _emit_response(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        started: float,
+        status_code: Optional[int],
+        error: Optional[Exception],
+    ) -> None:
+        self.hooks.emit(
+            "after_response",
+            method=method,
+            endpoint=endpoint,
+            status_code=status_code,
+            duration=time.perf_counter() - started,
+            attempt=attempt,
+            error=error,
+        )
+
+    def _emit_refresh(self, started: float, error: Optional[Exception]) -> None:
+        self.hooks.emit("on_refresh", kind="session", duration=time.perf_counter() - started, error=error)
+
+    def _encode_body(self, data: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        """Encode a request body with the client's JSON codec"""
+        return None if data is None else self.json_codec.dumps(data)
+
+    def _decode_body(self, response: Any, default: Any = None) -> Any:
+        """Decode a response body once, from its raw bytes; default if empty or not JSON"""
+        content = response.content
+        if not content:
+            return default
+        try:
+            return self.json_codec.loads(content)
+        except ValueError:
+            return default
+
+    def _parse_response(self, response: Any) -> Any:
+        """
+        Decode a requests/httpx response
+
+        Raises:
+            AuthflowError: If the response status is an error
+        """
+        if response.status_code >= 400:
+            error_data = self._decode_body(response)
+            raise AuthflowError(
+                error_data.get("error", f"Request failed with status {response.status_code}")
+                if isinstance(error_data, dict)
+                else f"Request failed with status {response.status_code}",
+                response.status_code
+            )
+
+        # Handle empty responses
+        if response.status_code == 204 or not response.content:
+            return {}
+
+        try:
+            return self.json_codec.loads(response.content)
+        except ValueError:
+            raise AuthflowError(f"Invalid JSON in response (status {response.status_code})", response.status_code)
+
+    @property
+    def session(self) -> Optional[Session]:
+        """Session for this client's session_key"""
+        return self.session_store.get(self.session_key)
+
+    @session.setter
+    def session(self, session: Optional[Session]) -> None:
+        if session is None:
+            self.session_store.delete(self.session_key)
+        else:
+            self.session_store.set(self.session_key, session)
+
+    def _save_session(self, session: Session) -> None:
+        """Save session to the session store"""
+        self.session = session
+
+    def _clear_session(self) -> None:
+        """Clear current session"""
+        self.session = None
+
+    def for_session(self, key: str):
+        """
+        Get a view of this client bound to another session
+
+        The view shares the connection pool, retry policy, circuit breaker,
+        key store and session store; only the session key differs. Use it
+        to act for many users from one client, e.g. keyed by user id.
+
+        Args:
+            key: Session key (user id, session id, ...)
+
+        Returns:
+            Client of the same type operating on the session stored under key
+        """
+        view = copy.copy(self)
+        view.session_key = key
+        view._init_view()
+        return view
+
+    def for_tenant(self, tenant_slug: str, hooks: Optional[Hooks] = None):
+        """
+        Get a view of this client bound to another tenant
+
+        Like for_session(), the view shares the connection pool, key store,
+        caches and session store. Its config carries tenant_slug, and its
+        default session is kept under 'tenant:<slug>'.
+
+        Args:
+            tenant_slug: Tenant slug used for login, registration and magic links
+            hooks: Instrumentation callbacks for the view (this client's by default)
+
+        Returns:
+            Client of the same type scoped to the tenant
+        """
+        # Create the key store now so every view shares it
+        self.jwks
+        view = copy.copy(self)
+        view.config = dataclasses.replace(self.config, tenant_slug=tenant_slug)
+        view.session_key = f"tenant:{tenant_slug}"
+        if hooks is not None:
+            view.hooks = hooks
+        view._init_view()
+        return view
+
+    def _init_view(self) -> None:
+        """Reset per-view state after for_session() or for_tenant() copies the client"""
+
+    @staticmethod
+    def _refreshed_elsewhere(before: Optional[Session], current: Optional[Session]) -> bool:
+        """True if another caller replaced the session while we waited to refresh it"""
+        return current is not None and (before is None or current.access_token != before.access_token)
+
+    # ==================
+    # SESSION MANAGEMENT
+    # ==================
+
+    def get_session(self) -> Optional[Session]:
+        """Get current session"""
+        return self.session
+
+    def get_user(self) -> Optional[User]:
+        """Get current user from session"""
+        return self.session.user if self.session else None
+
+    def is_authenticated(self) -> bool:
+        """Check if user is authenticated"""
+        return self.session is not None and self.session.user is not None
+
+    # ==================
+    # TOKEN VERIFICATION
+    # ==================
+
+    def _jwks_fetcher(self) -> Optional[JWKSFetcher]:
+        """Fetcher for the default key store (None uses the key store's own)"""
+        return None
+
+    @property
+    def jwks(self) -> JWKSKeyStore:
+        """JWKS key store used for offline verification (created on first use)"""
+        if self._key_store is None:
+            self._key_store = JWKSKeyStore(
+                self.config.jwks_url or f"{self.config.domain}/.well-known/jwks.json",
+                fetch=self._jwks_fetcher(),
+                hooks=self.hooks,
+            )
+        return self._key_store
+
+    def verify_token(self, token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verify an access token offline against the JWKS
+
+        Args:
+            token: JWT to verify (defaults to the current session's token)
+
+        Returns:
+            Decoded token claims
+        """
+        return verify_jwt(
+            self._access_token(token), self.jwks, issuer=self.config.issuer, revocation_list=self.revocation_list
+        )
+
+    def _access_token(self, token: Optional[str]) -> str:
+        """The given token, or the current session's"""
+        if token is None:
+            if not self.session:
+                raise AuthflowError("No access token available")
+            token = self.session.access_token
+        return token
+
+    def _cached_profile(self, user_id: str) -> Optional[User]:
+        user = self.profile_cache.get(user_id)
+        if user is not None and self.hooks.on_cache_hit:
+            self.hooks.emit("on_cache_hit", cache="profile")
+        return user
+
+    def _store_profile(self, user_id: str, response: Dict[str, Any]) -> User:
+        """Convert a /auth/me response for get_token_user() and cache it under the token's userId"""
+        user = self._dict_to_user(self._me_user(response))
+        self.profile_cache.set(user_id, user)
+        return user
+
+    @staticmethod
+    def _bearer(token: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    # ==================
+    # AUTHENTICATION
+    # ==================
+
+    def _register_call(self, data: RegisterData) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/register",
+            {
+                "email": data.email,
+                "password": data.password,
+                "firstName": data.first_name,
+                "lastName": data.last_name,
+                "tenantSlug": data.tenant_slug or self.config.tenant_slug,
+            },
+            self._dict_to_user,
+            refresh_first=False,
+        )
+
+    def _login_call(self, credentials: LoginCredentials) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/login",
+            {
+                "email": credentials.email,
+                "password": credentials.password,
+                "tenantSlug": credentials.tenant_slug or self.config.tenant_slug,
+            },
+            self._session_from_response,
+            refresh_first=False,
+        )
+
+    def _logout_call(self) -> ApiCall:
+        token = self.session.access_token if self.session else None
+        return ApiCall("POST", "/auth/logout", parse=lambda _: self._revoke_locally(token=token))
+
+    def _current_user_call(self) -> ApiCall:
+        return ApiCall("GET", "/auth/me", parse=self._update_session_user)
+
+    def _refresh_call(self) -> ApiCall:
+        if not self.session or not self.session.refresh_token:
+            raise AuthflowError("No refresh token available")
+
+        return ApiCall(
+            "POST",
+            "/auth/refresh",
+            {"refreshToken": self.session.refresh_token},
+            self._session_from_refresh,
+            refresh_first=False,
+        )
+
+    def _session_from_response(self, response: Dict[str, Any]) -> Session:
+        """Build and save a session from a login/MFA/magic-link response"""
+        session = Session(
+            user=self._dict_to_user(response["user"]),
+            access_token=response["token"],
+            refresh_token=response.get("refreshToken"),
+            expires_at=self._token_expiry(response["token"]),
+        )
+
+        self._save_session(session)
+        return session
+
+    def _session_from_refresh(self, response: Dict[str, Any]) -> Session:
+        """Build and save a session from a /auth/refresh response"""
+        session = Session(
+            user=self.session.user,
+            access_token=response["token"],
+            refresh_token=response["refreshToken"],
+            expires_at=self._token_expiry(response["token"]),
+        )
+
+        self._save_session(session)
+        return session
+
+    @staticmethod
+    def _token_expiry(token: str) -> datetime:
+        """Expiry of an access token from its exp claim (1 day if it has none)"""
+        exp = peek_claims(token).get("exp")
+        if isinstance(exp, (int, float)):
+            return datetime.fromtimestamp(exp)
+        return datetime.now() + timedelta(days=1)
+
+    def _needs_refresh(self, session: Optional[Session]) -> bool:
+        """True if the session can be refreshed and is within refresh_ahead of expiry"""
+        return (
+            session is not None
+            and session.refresh_token is not None
+            and self._seconds_until_refresh(session) <= 0
+        )
+
+    def _seconds_until_refresh(self, session: Session) -> float:
+        """Seconds until the session enters its refresh_ahead window"""
+        remaining = (session.expires_at - datetime.now()).total_seconds()
+        return remaining - self.config.refresh_ahead
+
+    def _update_session_user(self, response: Dict[str, Any]) -> User:
+        """Convert a /auth/me response and store it on the current session"""
+        user = self._dict_to_user(self._me_user(response))
+
+        session = self.session
+        if session:
+            session.user = user
+            self._save_session(session)
+
+        return user
+
+    # ==================
+    # MFA
+    # ==================
+
+    def _setup_mfa_call(self, method: str) -> ApiCall:
+        return ApiCall("POST", f"/auth/mfa/setup/{method}", parse=self._dict_to_mfa_setup)
+
+    def _verify_mfa_call(self, data: MFAVerifyRequest) -> ApiCall:
+        return ApiCall(
+            "POST",
+            f"/auth/mfa/verify/{data.method}",
+            {
+                "code": data.code,
+                "trustDevice": data.trust_device,
+            },
+            self._session_from_response,
+        )
+
+    def _disable_mfa_call(self) -> ApiCall:
+        return ApiCall("POST", "/auth/mfa/disable")
+
+    # ==================
+    # MAGIC LINKS
+    # ==================
+
+    def _request_magic_link_call(self, data: MagicLinkRequest) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/magic-link/request",
+            {
+                "email": data.email,
+                "tenantSlug": data.tenant_slug,
+                "redirectUrl": data.redirect_url,
+            },
+        )
+
+    def _verify_magic_link_call(self, token: str) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/magic-link/verify",
+            {"token": token},
+            self._session_from_response,
+        )
+
+    # ==================
+    # PASSWORD RESET
+    # ==================
+
+    def _request_password_reset_call(self, data: PasswordResetRequest) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/forgot-password",
+            {
+                "email": data.email,
+                "tenantSlug": data.tenant_slug or self.config.tenant_slug,
+            },
+        )
+
+    def _reset_password_call(self, data: PasswordResetComplete) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/reset-password",
+            {
+                "token": data.token,
+                "newPassword": data.new_password,
+            },
+        )
+
+    # ==================
+    # OAUTH2 / OIDC
+    # ==================
+
+    def get_oauth2_authorize_url(self, params: OAuth2AuthorizeParams) -> str:
+        """
+        Generate OAuth2 authorization URL
+
+        Args:
+            params: OAuth2 authorization parameters
+
+        Returns:
+            Authorization URL string
+        """
+        query_params = {
+            "client_id": params.client_id,
+            "redirect_uri": params.redirect_uri,
+            "response_type": params.response_type,
+        }
+
+        if params.scope:
+            query_params["scope"] = params.scope
+        if params.state:
+            query_params["state"] = params.state
+        if params.code_challenge:
+            query_params["code_challenge"] = params.code_challenge
+            query_params["code_challenge_method"] = params.code_challenge_method
+
+        return f"{self.config.domain}/oauth2/authorize?{urlencode(query_params)}"
+
+    def _exchange_code_call(self, data: OAuth2TokenRequest) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/oauth2/token",
+            {
+                "grant_type": "authorization_code",
+                "code": data.code,
+                "client_id": data.client_id,
+                "client_secret": data.client_secret,
+                "redirect_uri": data.redirect_uri,
+                "code_verifier": data.code_verifier,
+            },
+            self._dict_to_token_response,
+        )
+
+    def _oauth2_user_info_call(self) -> ApiCall:
+        return ApiCall("GET", "/oauth2/userinfo", parse=self._dict_to_user)
+
+    # ==================
+    # API KEYS
+    # ==================
+
+    def _create_api_key_call(self, data: APIKeyCreateRequest) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/admin/api-keys",
+            {
+                "name": data.name,
+                "expiresAt": data.expires_at,
+                "permissions": data.permissions,
+            },
+            self._dict_to_api_key,
+        )
+
+    def _list_api_keys_call(self, view: str = "model") -> ApiCall:
+        convert = self._converter("api_key", view)
+        return ApiCall(
+            "GET",
+            "/admin/api-keys",
+            parse=(lambda data: [convert(key) for key in data]) if convert else None,
+        )
+
+    def _delete_api_key_call(self, key_id: str) -> ApiCall:
+        return ApiCall("DELETE", f"/admin/api-keys/{key_id}")
+
+    # ==================
+    # ADMIN
+    # ==================
+
+    def _revoke_session_call(self, session_id: str) -> ApiCall:
+        return ApiCall(
+            "DELETE",
+            f"/tenant-admin/sessions/{session_id}",
+            parse=lambda _: self._revoke_locally(session_id=session_id),
+        )
+
+    def _delete_user_call(self, user_id: str) -> ApiCall:
+        return ApiCall(
+            "DELETE",
+            f"/tenant-admin/users/{user_id}",
+            parse=lambda _: self._revoke_locally(user_id=user_id),
+        )
+
+    def _revoke_locally(
+        self, token: Optional[str] = None, session_id: Optional[str] = None, user_id: Optional[str] = None
+    ) -> None:
+        """Record a revocation this client made in its revocation list"""
+        revocations = self.revocation_list
+        if revocations is None:
+            return
+        if token:
+            revocations.revoke_token(token)
+        if session_id:
+            revocations.revoke_session(session_id)
+        if user_id:
+            revocations.revoke_user(user_id)
+
+    def _update_user_role_call(self, user_id: str, role: str) -> ApiCall:
+        return ApiCall(
+            "PATCH",
+            f"/tenant-admin/users/{user_id}/role",
+            {"role": role},
+            # The response is a partial user (no createdAt), returned as is
+            idempotent=True,
+        )
+
+    def _list_page_call(
+        self, endpoint: str, limit: int, offset: int, params: Optional[Dict[str, str]] = None
+    ) -> ApiCall:
+        query = dict(params or {}, limit=limit, offset=offset)
+        return ApiCall("GET", f"{endpoint}?{urlencode(query)}")
+
+    def _import_users_call(self, users: List[Dict[str, Any]], options: Optional[Dict[str, Any]] = None) -> ApiCall:
+        # Sent as JSON even for CSV sources: the server's CSV parser can't handle quoted newlines
+        return ApiCall(
+            "POST",
+            "/admin/import-users",
+            {
+                "data": self.json_codec.dumps(users).decode("utf-8"),
+                "format": "json",
+                "options": options or {},
+            },
+            lambda response: response.get("result", {}),
+            # Re-sending a chunk is safe: existing users are skipped or overwritten with the same data
+            idempotent=True,
+        )
+
+    # ==================
+    # UNIVERSAL LOGIN
+    # ==================
+
+    def get_universal_login_url(self, tenant_slug: str, return_to: Optional[str] = None) -> str:
+        """
+        Get universal login page URL
+
+        Args:
+            tenant_slug: Tenant slug
+            return_to: Optional return URL
+
+        Returns:
+            Login URL
+        """
+        params = {"tenant": tenant_slug}
+        if return_to:
+            params["redirect_uri"] = return_to
+
+        return f"{self.config.domain}/auth/universal-login?{urlencode(params)}"
+
+    def get_universal_register_url(self, tenant_slug: str, return_to: Optional[str] = None) -> str:
+        """
+        Get universal registration page URL
+
+        Args:
+            tenant_slug: Tenant slug
+            return_to: Optional return URL
+
+        Returns:
+            Registration URL
+        """
+        params = {"tenant": tenant_slug}
+        if return_to:
+            params["redirect_uri"] = return_to
+
+        return f"{self.config.domain}/auth/universal-register?{urlencode(params)}"
+
+    # ==================
+    # UTILITIES
+    # ==================
+
+    def _check_password_breach_call(self, password: str) -> ApiCall:
+        return ApiCall(
+            "POST",
+            "/auth/check-password-breach",
+            {"password": password},
+            idempotent=True,
+        )
+
+    # ==================
+    # HELPER METHODS
+    # ==================
+
+    @staticmethod
+    def _me_user(response: Any) -> Dict[str, Any]:
+        """The user record of a /auth/me response ({"user": {...}})"""
+        user = response.get("user") if isinstance(response, dict) else None
+        if not isinstance(user, dict):
+            raise AuthflowError("Unexpected /auth/me response: no user record")
+        return user
+
+    @staticmethod
+    def _dict_to_user(data: Dict[str, Any]) -> User:
+        """Convert dict to User object"""
+        last_login = data.get("lastLogin")
+        return User(
+            id=data["id"],
+            email=data["email"],
+            role=data["role"],
+            email_verified=data["emailVerified"],
+            mfa_enabled=data["mfaEnabled"],
+            created_at=parse_datetime(data["createdAt"]),
+            name=data.get("name"),
+            tenant_id=data.get("tenantId"),
+            last_login=parse_datetime(last_login) if last_login else None,
+        )
+
+    @staticmethod
+    def _dict_to_api_key(data: Dict[str, Any]) -> APIKey:
+        """Convert dict to APIKey object (listed keys carry keyPrefix instead of key)"""
+        last_used = data.get("lastUsed") or data.get("lastUsedAt")
+        expires_at = data.get("expiresAt")
+        return APIKey(
+            id=data["id"],
+            name=data["name"],
+            key=data.get("key") or data["keyPrefix"],
+            created_at=parse_datetime(data["createdAt"]),
+            last_used=parse_datetime(last_used) if last_used else None,
+            expires_at=parse_datetime(expires_at) if expires_at else None,
+        )
+
+    @classmethod
+    def _converter(cls, kind: str, view: str) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        """
+        Pick how raw records of a kind ('user' or 'api_key') are returned
+
+        'model' builds full dataclasses, 'lazy' wraps each record in a view
+        that converts fields on access, 'raw' returns the dicts untouched.
+        """
+        if view == "raw":
+            return None
+        converters = {
+            "model": {"user": cls._dict_to_user, "api_key": cls._dict_to_api_key},
+            "lazy": {"user": UserView, "api_key": APIKeyView},
+        }
+        if view not in converters:
+            raise ValueError(f"view must be 'model', 'lazy' or 'raw', not {view!r}")
+        return converters[view][kind]
+
+    @staticmethod
+    def _dict_to_mfa_setup(data: Dict[str, Any]) -> MFASetupResponse:
+        """Convert dict to MFASetupResponse object"""
+        return MFASetupResponse(
+            secret=data["secret"],
+            qr_code=data["qrCode"],
+            backup_codes=data.get("backupCodes"),
+        )
+
+    @staticmethod
+    def _dict_to_token_response(data: Dict[str, Any]) -> OAuth2TokenResponse:
+        """Convert dict to OAuth2TokenResponse object"""
+        return OAuth2TokenResponse(
+            access_token=data["access_token"],
+            token_type=data["token_type"],
+            expires_in=data["expires_in"],
+            refresh_token=data.get("refresh_token"),
+            scope=data.get("scope"),
+        )
@@ -0,0 +1,202 @@
+"""Bounded-concurrency batch execution with adaptive throttling"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from .types import AuthflowError, BatchItemResult
+
+
+T = TypeVar("T")
+
+
+class _AdaptiveLimit:
+    """
+    AIMD concurrency limit shared by the workers of one batch
+
+    A 429 halves the limit and pauses new calls for a backoff that grows
+    with consecutive throttles. The limit then creeps back up by one per
+    `increase_after` rounds of successful calls, up to the maximum.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        increase_after: int = 4,
+    ):
+        self.max_concurrency = max_concurrency
+        self.increase_after = increase_after
+        self.limit = max_concurrency
+        self.active = 0
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.paused_until = 0.0
+        self._successes = 0
+        self._throttles = 0
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds to wait before a call may start, or None if it may start now"""
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            return pause
+        if self.active >= self.limit:
+            return self.backoff
+        return None
+
+    def record(self, throttled: bool) -> None:
+        self.active -= 1
+        if throttled:
+            now = time.monotonic()
+            # Calls that were in flight together get throttled together; react once per pause
+            if now < self.paused_until:
+                return
+            self.limit = max(1, self.limit // 2)
+            self.paused_until = now + min(self.backoff * (2 ** self._throttles), self.max_backoff)
+            self._throttles += 1
+            self._successes = 0
+            return
+        self._throttles = 0
+        self._successes += 1
+        if self._successes >= self.limit * self.increase_after and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._successes = 0
+
+
+def run_batch(
+    operation: Callable[[T], Any],
+    items: Iterable[T],
+    concurrency: int = 8,
+    max_throttle_retries: int = 5,
+) -> List[BatchItemResult]:
+    """
+    Run operation for every item on a pool of threads
+
+    An exception for one item is recorded in its result and the batch
+    continues. Items rejected with 429 are retried after the batch slows
+    down, up to max_throttle_retries times.
+
+    Args:
+        operation: Called once per item
+        items: Items to process (consumed lazily)
+        concurrency: Maximum calls in flight
+        max_throttle_retries: Retries per item after a 429
+
+    Returns:
+        One result per item, in input order
+    """
+    limit = _AdaptiveLimit(concurrency)
+    condition = threading.Condition()
+    source = iter(enumerate(items))
+    results: List[Tuple[int, BatchItemResult]] = []
+
+    def acquire() -> None:
+        with condition:
+            while True:
+                delay = limit.wait_time()
+                if delay is None:
+                    limit.active += 1
+                    return
+                condition.wait(delay)
+
+    def release(throttled: bool) -> None:
+        with condition:
+            limit.record(throttled)
+            condition.notify_all()
+
+    def worker() -> None:
+        while True:
+            with condition:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    return
+            attempt = 0
+            while True:
+                acquire()
+                try:
+                    value = operation(item)
+                except Exception as e:
+                    throttled = isinstance(e, AuthflowError) and e.status_code == 429
+                    release(throttled)
+                    if throttled and attempt < max_throttle_retries:
+                        attempt += 1
+                        continue
+                    result = BatchItemResult(item, error=e)
+                else:
+                    release(False)
+                    result = BatchItemResult(item, value)
+                break
+            with condition:
+                results.append((index, result))
+
+    threads = [
+        threading.Thread(target=worker, name=f"authflow-batch-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.sort(key=lambda pair: pair[0])
+    return [result for _, result in results]
+
+
+async def arun_batch(
+    operation: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    concurrency: int = 8,
+    max_throttle_retries: int = 5,
+) -> List[BatchItemResult]:
+    """
+    Run a coroutine function for every item with bounded concurrency
+
+    Same semantics as run_batch, using asyncio tasks instead of threads.
+    """
+    limit = _AdaptiveLimit(concurrency)
+    condition = asyncio.Condition()
+    source = iter(enumerate(items))
+    results: List[Tuple[int, BatchItemResult]] = []
+
+    async def acquire() -> None:
+        async with condition:
+            while True:
+                delay = limit.wait_time()
+                if delay is None:
+                    limit.active += 1
+                    return
+                try:
+                    await asyncio.wait_for(condition.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(throttled: bool) -> None:
+        async with condition:
+            limit.record(throttled)
+            condition.notify_all()
+
+    async def worker() -> None:
+        for index, item in source:
+            attempt = 0
+            while True:
+                await acquire()
+                try:
+                    value = await operation(item)
+                except Exception as e:
+                    throttled = isinstance(e, AuthflowError) and e.status_code == 429
+                    await release(throttled)
+                    if throttled and attempt < max_throttle_retries:
+                        attempt += 1
+                        continue
+                    result = BatchItemResult(item, error=e)
+                else:
+                    await release(False)
+                    result = BatchItemResult(item, value)
+                break
+            results.append((index, result))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    results.sort(key=lambda pair: pair[0])
+    return [result for _, result in results]
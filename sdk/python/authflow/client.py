@@ -1,11 +1,15 @@
 """Authflow Python Client"""
 
-import json
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from urllib.parse import urlencode
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
 
+from .base import ApiCall, BaseAuthflowClient
 from .types import (
     AuthflowConfig,
     User,
@@ -17,33 +21,108 @@ from .types import (
     MagicLinkRequest,
     PasswordResetRequest,
     PasswordResetComplete,
-    OAuth2AuthorizeParams,
     OAuth2TokenRequest,
     OAuth2TokenResponse,
     APIKeyCreateRequest,
     APIKey,
+    UserImportResult,
+    BatchItemResult,
     AuthflowError,
 )
-
-
-class AuthflowClient:
+from .batch import run_batch
+from .bulk_import import (
+    DEFAULT_MAX_CHUNK_BYTES,
+    DEFAULT_MAX_CHUNK_USERS,
+    ImportCheckpoint,
+    ImportSource,
+    import_fingerprint,
+    iter_chunks,
+    iter_import_records,
+)
+from .pagination import DEFAULT_PAGE_SIZE, iterate_pages
+from .jwks import JWKSFetcher, JWKSKeyStore
+from .models import ClaimsUser
+from .cache import TTLCache
+from .codec import JSONCodec
+from .hooks import Hooks
+from .ratelimit import RateLimiter
+from .revocation import RevocationList
+from .retry import CircuitBreaker, RetryPolicy
+from .sessions import SessionStore
+
+
+class AuthflowClient(BaseAuthflowClient):
     """Authflow Authentication Client"""
 
-    def __init__(self, config: AuthflowConfig):
+    def __init__(
+        self,
+        config: AuthflowConfig,
+        key_store: Optional[JWKSKeyStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        session_store: Optional[SessionStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        json_codec: Optional[JSONCodec] = None,
+        hooks: Optional[Hooks] = None,
+        profile_cache: Optional[TTLCache] = None,
+        revocation_list: Optional[RevocationList] = None,
+    ):
         """
         Initialize Authflow client
-        
+
         Args:
             config: AuthflowConfig object with domain and optional tenant_slug
-        """
-        self.config = config
-        self.session: Optional[Session] = None
-        self._requests_session = requests.Session()
+            key_store: Optional shared JWKSKeyStore for offline token verification
+            retry_policy: Retry policy for failed requests (RetryPolicy(max_retries=0) disables)
+            circuit_breaker: Circuit breaker shared by all requests of this client
+            session_store: Where sessions are kept (in memory by default)
+            rate_limiter: Per-endpoint-class pacing and server block tracking
+            json_codec: JSON encoder/decoder for bodies (orjson or msgspec if installed)
+            hooks: Instrumentation callbacks, e.g. for instrument_prometheus(client.hooks)
+            profile_cache: Profiles fetched for get_token_user(), by user id
+            revocation_list: Revoked tokens to reject in offline verification
+        """
+        super().__init__(
+            config,
+            key_store,
+            retry_policy,
+            circuit_breaker,
+            session_store,
+            rate_limiter,
+            json_codec,
+            hooks,
+            profile_cache,
+            revocation_list,
+        )
+        self._requests_session = self._create_requests_session(config)
+        self._timeout = (config.connect_timeout, config.read_timeout)
+        self._owns_requests_session = True
+        self._auto_refresh_stop: Optional[threading.Event] = None
 
-    @property
-    def base_url(self) -> str:
-        """Get base API URL"""
-        return f"{self.config.domain}/api"
+    def _init_view(self) -> None:
+        self._owns_requests_session = False
+        self._auto_refresh_stop = None
+
+    @staticmethod
+    def _create_requests_session(config: AuthflowConfig) -> requests.Session:
+        """Create a requests.Session with a connection pool sized from config"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not config.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections (a no-op on for_session() views)"""
+        self.stop_auto_refresh()
+        if self._owns_requests_session:
+            self._requests_session.close()
 
     def _request(
         self,
@@ -51,78 +130,117 @@ class AuthflowClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None,
     ) -> Any:
         """
         Make an HTTP request to the API
-        
+
+        Requests are paced by rate_limiter, transient failures are retried
+        according to retry_policy, and the request fails fast with
+        CircuitOpenError while the circuit is open. Each attempt is reported
+        to hooks.
+
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint path
             data: Request body data
             headers: Additional headers
-            
+            idempotent: Whether the call is safe to repeat (defaults by method)
+
         Returns:
             Response data (JSON decoded)
-            
+
         Raises:
             AuthflowError: If request fails
         """
         url = f"{self.base_url}{endpoint}"
-        req_headers = {
-            "Content-Type": "application/json",
-            **(headers or {}),
-        }
-
-        if self.session and self.session.access_token:
-            req_headers["Authorization"] = f"Bearer {self.session.access_token}"
-
-        try:
-            response = self._requests_session.request(
-                method=method,
-                url=url,
-                json=data,
-                headers=req_headers,
-            )
-
-            if not response.ok:
-                error_data = response.json() if response.text else {}
-                raise AuthflowError(
-                    error_data.get("error", f"Request failed with status {response.status_code}"),
-                    response.status_code
+        req_headers = self._build_headers(headers)
+        body = self._encode_body(data)
+        hooks = self.hooks
+        attempt = 0
+
+        while True:
+            pause = self.rate_limiter.acquire(endpoint, data)
+            if pause:
+                time.sleep(pause)
+            self.circuit_breaker.before_request()
+            if hooks.before_request:
+                hooks.emit("before_request", method=method, endpoint=endpoint, attempt=attempt)
+            started = time.perf_counter()
+            status_code: Optional[int] = None
+            error: Optional[Exception] = None
+            try:
+                response = self._requests_session.request(
+                    method=method,
+                    url=url,
+                    data=body,
+                    headers=req_headers,
+                    timeout=self._timeout,
                 )
+            except requests.RequestException as e:
+                error = e
+                if hooks.after_response:
+                    self._emit_response(method, endpoint, attempt, started, None, e)
+                self.circuit_breaker.record_failure()
+                retryable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                delay = self.retry_policy.next_delay(
+                    method, attempt, sent=not self._connect_failed(e), idempotent=idempotent
+                ) if retryable else None
+                if delay is None:
+                    raise AuthflowError(f"Request failed: {str(e)}")
+            else:
+                status_code = response.status_code
+                if hooks.after_response:
+                    self._emit_response(method, endpoint, attempt, started, status_code, None)
+                retry_after = self._record_response(endpoint, data, response)
+                delay = self.retry_policy.next_delay(
+                    method,
+                    attempt,
+                    status_code=response.status_code,
+                    retry_after=retry_after,
+                    idempotent=idempotent,
+                ) if response.status_code >= 400 else None
+                if delay is None:
+                    return self._parse_response(response)
+
+            if hooks.on_retry:
+                hooks.emit(
+                    "on_retry",
+                    method=method,
+                    endpoint=endpoint,
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=status_code,
+                    error=error,
+                )
+            time.sleep(delay)
+            attempt += 1
 
-            # Handle empty responses
-            if response.status_code == 204 or not response.text:
-                return {}
-
-            return response.json()
-
-        except requests.RequestException as e:
-            raise AuthflowError(f"Request failed: {str(e)}")
-
-    def _save_session(self, session: Session) -> None:
-        """Save session to instance"""
-        self.session = session
-
-    def _clear_session(self) -> None:
-        """Clear current session"""
-        self.session = None
-
-    # ==================
-    # SESSION MANAGEMENT
-    # ==================
-
-    def get_session(self) -> Optional[Session]:
-        """Get current session"""
-        return self.session
-
-    def get_user(self) -> Optional[User]:
-        """Get current user from session"""
-        return self.session.user if self.session else None
-
-    def is_authenticated(self) -> bool:
-        """Check if user is authenticated"""
-        return self.session is not None and self.session.user is not None
+    @staticmethod
+    def _connect_failed(error: requests.RequestException) -> bool:
+        """True if the connection was never established, so nothing was sent"""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        # urllib3 reports refused/unresolvable connections as NewConnectionError,
+        # a ConnectTimeoutError subclass, wrapped in MaxRetryError.reason
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, ConnectTimeoutError)
+
+    def _call(self, call: ApiCall) -> Any:
+        """Execute an ApiCall and parse its response"""
+        if call.refresh_first and self.config.auto_refresh:
+            self._refresh_if_needed()
+        response = self._request(call.method, call.endpoint, call.data, idempotent=call.idempotent)
+        return call.parse(response) if call.parse else response
+
+    def _fetch_jwks(self, url: str):
+        """Fetch the JWKS document over the client's connection pool"""
+        response = self._requests_session.get(url, timeout=self._timeout)
+        response.raise_for_status()
+        return self.json_codec.loads(response.content), response.headers
+
+    def _jwks_fetcher(self) -> Optional[JWKSFetcher]:
+        return self._fetch_jwks
 
     # ==================
     # AUTHENTICATION
@@ -131,104 +249,135 @@ class AuthflowClient:
     def register(self, data: RegisterData) -> User:
         """
         Register a new user
-        
+
         Args:
             data: Registration data (email, password, name, etc.)
-            
+
         Returns:
             Created user object
         """
-        response = self._request(
-            "POST",
-            "/auth/register",
-            {
-                "email": data.email,
-                "password": data.password,
-                "firstName": data.first_name,
-                "lastName": data.last_name,
-                "tenantSlug": data.tenant_slug or self.config.tenant_slug,
-            },
-        )
-        return self._dict_to_user(response)
+        return self._call(self._register_call(data))
 
     def login(self, credentials: LoginCredentials) -> Session:
         """
         Login user and create session
-        
+
         Args:
             credentials: Login credentials (email, password)
-            
+
         Returns:
             Session object with user and tokens
         """
-        response = self._request(
-            "POST",
-            "/auth/login",
-            {
-                "email": credentials.email,
-                "password": credentials.password,
-                "tenantSlug": credentials.tenant_slug or self.config.tenant_slug,
-            },
-        )
-
-        session = Session(
-            user=self._dict_to_user(response["user"]),
-            access_token=response["token"],
-            refresh_token=response.get("refreshToken"),
-            expires_at=datetime.now() + timedelta(days=1),
-        )
-
-        self._save_session(session)
-        return session
+        return self._call(self._login_call(credentials))
 
     def logout(self) -> None:
         """Logout current user and end session"""
         try:
-            self._request("POST", "/auth/logout")
+            self._call(self._logout_call())
         finally:
             self._clear_session()
 
     def get_current_user(self) -> User:
         """
         Get current authenticated user
-        
+
+        Use get_token_user() instead when the token's claims (id, email,
+        role, tenant) are enough; it needs no request.
+
         Returns:
             User object
         """
-        response = self._request("GET", "/auth/me")
-        user = self._dict_to_user(response)
-        
-        if self.session:
-            self.session.user = user
-            self._save_session(self.session)
-        
+        return self._call(self._current_user_call())
+
+    def get_token_user(self, token: Optional[str] = None) -> ClaimsUser:
+        """
+        Get the user an access token belongs to without calling /auth/me
+
+        The token is verified offline and id, email, role and tenant_id are
+        read from its claims. Reading any other field fetches the profile
+        once; profiles are cached per user in profile_cache.
+
+        Args:
+            token: Access token (defaults to the current session's token)
+
+        Returns:
+            ClaimsUser backed by the token's claims
+
+        Raises:
+            AuthflowError: If the token is invalid or expired
+        """
+        token = self._access_token(token)
+        claims = self.verify_token(token)
+        return ClaimsUser(claims, load=lambda: self._load_profile(claims["userId"], token))
+
+    def _load_profile(self, user_id: str, token: str) -> User:
+        user = self._cached_profile(user_id)
+        if user is None:
+            user = self._store_profile(user_id, self._request("GET", "/auth/me", headers=self._bearer(token)))
         return user
 
     def refresh_token(self) -> Session:
         """
         Refresh access token using refresh token
-        
+
+        Concurrent callers for the same session share one /auth/refresh
+        request: threads that were waiting while another refreshed get that
+        refreshed session.
+
         Returns:
             New session with refreshed tokens
         """
-        if not self.session or not self.session.refresh_token:
-            raise AuthflowError("No refresh token available")
-
-        response = self._request(
-            "POST",
-            "/auth/refresh",
-            {"refreshToken": self.session.refresh_token},
-        )
-
-        session = Session(
-            user=self.session.user,
-            access_token=response["token"],
-            refresh_token=response["refreshToken"],
-            expires_at=datetime.now() + timedelta(days=1),
-        )
-
-        self._save_session(session)
-        return session
+        session = self.session
+        with self.session_store.lock(self.session_key):
+            current = self.session
+            if self._refreshed_elsewhere(session, current):
+                return current
+            started = time.perf_counter()
+            try:
+                refreshed = self._call(self._refresh_call())
+            except AuthflowError as e:
+                if self.hooks.on_refresh:
+                    self._emit_refresh(started, e)
+                raise
+            if self.hooks.on_refresh:
+                self._emit_refresh(started, None)
+            return refreshed
+
+    def _refresh_if_needed(self) -> None:
+        """Refresh ahead of expiry; an expiring-but-valid token is kept if refresh fails"""
+        session = self.session
+        if not self._needs_refresh(session):
+            return
+        try:
+            self.refresh_token()
+        except AuthflowError:
+            if session.expires_at <= datetime.now():
+                raise
+
+    def start_auto_refresh(self) -> None:
+        """Refresh the session on a background thread shortly before it expires"""
+        if self._auto_refresh_stop is not None:
+            return
+        stop = self._auto_refresh_stop = threading.Event()
+
+        def run() -> None:
+            while True:
+                session = self.session
+                delay = self._seconds_until_refresh(session) if session else self.config.refresh_ahead
+                if stop.wait(max(delay, 1.0)):
+                    return
+                try:
+                    self._refresh_if_needed()
+                except AuthflowError:
+                    pass
+
+        threading.Thread(target=run, name="authflow-token-refresh", daemon=True).start()
+
+    def stop_auto_refresh(self) -> None:
+        """Stop the background refresh thread"""
+        if self._auto_refresh_stop is not None:
+            self._auto_refresh_stop.set()
+            self._auto_refresh_stop = None
 
     # ==================
     # MFA
@@ -237,51 +386,30 @@ class AuthflowClient:
     def setup_mfa(self, method: str = 'totp') -> MFASetupResponse:
         """
         Setup MFA for current user
-        
+
         Args:
             method: MFA method ('totp' or 'email')
-            
+
         Returns:
             MFA setup response with secret and QR code
         """
-        response = self._request("POST", f"/auth/mfa/setup/{method}")
-        return MFASetupResponse(
-            secret=response["secret"],
-            qr_code=response["qrCode"],
-            backup_codes=response.get("backupCodes"),
-        )
+        return self._call(self._setup_mfa_call(method))
 
     def verify_mfa(self, data: MFAVerifyRequest) -> Session:
         """
         Verify MFA code
-        
+
         Args:
             data: MFA verification request
-            
+
         Returns:
             Session object
         """
-        response = self._request(
-            "POST",
-            f"/auth/mfa/verify/{data.method}",
-            {
-                "code": data.code,
-                "trustDevice": data.trust_device,
-            },
-        )
-
-        session = Session(
-            user=self._dict_to_user(response["user"]),
-            access_token=response["token"],
-            expires_at=datetime.now() + timedelta(days=1),
-        )
-
-        self._save_session(session)
-        return session
+        return self._call(self._verify_mfa_call(data))
 
     def disable_mfa(self) -> None:
         """Disable MFA for current user"""
-        self._request("POST", "/auth/mfa/disable")
+        self._call(self._disable_mfa_call())
 
     # ==================
     # MAGIC LINKS
@@ -290,47 +418,26 @@ class AuthflowClient:
     def request_magic_link(self, data: MagicLinkRequest) -> Dict[str, str]:
         """
         Request a magic link for passwordless login
-        
+
         Args:
             data: Magic link request data
-            
+
         Returns:
             Success message
         """
-        return self._request(
-            "POST",
-            "/auth/magic-link/request",
-            {
-                "email": data.email,
-                "tenantSlug": data.tenant_slug,
-                "redirectUrl": data.redirect_url,
-            },
-        )
+        return self._call(self._request_magic_link_call(data))
 
     def verify_magic_link(self, token: str) -> Session:
         """
         Verify magic link token
-        
+
         Args:
             token: Magic link token
-            
+
         Returns:
             Session object
         """
-        response = self._request(
-            "POST",
-            "/auth/magic-link/verify",
-            {"token": token},
-        )
-
-        session = Session(
-            user=self._dict_to_user(response["user"]),
-            access_token=response["token"],
-            expires_at=datetime.now() + timedelta(days=1),
-        )
-
-        self._save_session(session)
-        return session
+        return self._call(self._verify_magic_link_call(token))
 
     # ==================
     # PASSWORD RESET
@@ -339,111 +446,51 @@ class AuthflowClient:
     def request_password_reset(self, data: PasswordResetRequest) -> Dict[str, str]:
         """
         Request password reset link
-        
+
         Args:
             data: Password reset request
-            
+
         Returns:
             Success message
         """
-        return self._request(
-            "POST",
-            "/auth/forgot-password",
-            {
-                "email": data.email,
-                "tenantSlug": data.tenant_slug or self.config.tenant_slug,
-            },
-        )
+        return self._call(self._request_password_reset_call(data))
 
     def reset_password(self, data: PasswordResetComplete) -> Dict[str, str]:
         """
         Complete password reset
-        
+
         Args:
             data: Password reset completion data
-            
+
         Returns:
             Success message
         """
-        return self._request(
-            "POST",
-            "/auth/reset-password",
-            {
-                "token": data.token,
-                "newPassword": data.new_password,
-            },
-        )
+        return self._call(self._reset_password_call(data))
 
     # ==================
     # OAUTH2 / OIDC
     # ==================
 
-    def get_oauth2_authorize_url(self, params: OAuth2AuthorizeParams) -> str:
-        """
-        Generate OAuth2 authorization URL
-        
-        Args:
-            params: OAuth2 authorization parameters
-            
-        Returns:
-            Authorization URL string
-        """
-        query_params = {
-            "client_id": params.client_id,
-            "redirect_uri": params.redirect_uri,
-            "response_type": params.response_type,
-        }
-
-        if params.scope:
-            query_params["scope"] = params.scope
-        if params.state:
-            query_params["state"] = params.state
-        if params.code_challenge:
-            query_params["code_challenge"] = params.code_challenge
-            query_params["code_challenge_method"] = params.code_challenge_method
-
-        return f"{self.config.domain}/oauth2/authorize?{urlencode(query_params)}"
-
     def exchange_code_for_token(self, data: OAuth2TokenRequest) -> OAuth2TokenResponse:
         """
         Exchange authorization code for access token
-        
+
         Args:
             data: Token exchange request
-            
+
         Returns:
             OAuth2 token response
         """
-        response = self._request(
-            "POST",
-            "/oauth2/token",
-            {
-                "grant_type": "authorization_code",
-                "code": data.code,
-                "client_id": data.client_id,
-                "client_secret": data.client_secret,
-                "redirect_uri": data.redirect_uri,
-                "code_verifier": data.code_verifier,
-            },
-        )
-
-        return OAuth2TokenResponse(
-            access_token=response["access_token"],
-            token_type=response["token_type"],
-            expires_in=response["expires_in"],
-            refresh_token=response.get("refresh_token"),
-            scope=response.get("scope"),
-        )
+        return self._call(self._exchange_code_call(data))
 
     def get_oauth2_user_info(self) -> User:
         """
         Get user info from OAuth2 token
-        
+
         Returns:
             User object
         """
-        response = self._request("GET", "/oauth2/userinfo")
-        return self._dict_to_user(response)
+        return self._call(self._oauth2_user_info_call())
 
     # ==================
     # API KEYS
@@ -452,134 +499,357 @@ class AuthflowClient:
     def create_api_key(self, data: APIKeyCreateRequest) -> APIKey:
         """
         Create a new API key
-        
+
         Args:
             data: API key creation request
-            
+
         Returns:
             Created API key
         """
-        response = self._request(
-            "POST",
-            "/api-keys",
-            {
-                "name": data.name,
-                "expiresAt": data.expires_at,
-                "permissions": data.permissions,
-            },
-        )
-        return self._dict_to_api_key(response)
+        return self._call(self._create_api_key_call(data))
 
-    def list_api_keys(self) -> List[APIKey]:
+    def list_api_keys(self, view: str = "model") -> List[APIKey]:
         """
         List all API keys
-        
+
+        Args:
+            view: 'model' for APIKey objects, 'lazy' for APIKeyViews that
+                convert fields on access, 'raw' for the response dicts
+
         Returns:
             List of API keys
         """
-        response = self._request("GET", "/api-keys")
-        return [self._dict_to_api_key(key) for key in response]
+        return self._call(self._list_api_keys_call(view))
 
     def delete_api_key(self, key_id: str) -> None:
         """
         Delete an API key
-        
+
         Args:
             key_id: API key ID
         """
-        self._request("DELETE", f"/api-keys/{key_id}")
+        self._call(self._delete_api_key_call(key_id))
 
     # ==================
-    # UNIVERSAL LOGIN
+    # PAGINATED LISTS
     # ==================
 
-    def get_universal_login_url(self, tenant_slug: str, return_to: Optional[str] = None) -> str:
+    def _iter_pages(
+        self,
+        endpoint: str,
+        convert: Optional[Callable[[Dict[str, Any]], Any]],
+        page_size: int,
+        prefetch: bool,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Iterator[Any]:
+        return iterate_pages(
+            lambda limit, offset: self._call(self._list_page_call(endpoint, limit, offset, params)),
+            convert,
+            page_size,
+            prefetch,
+        )
+
+    def iter_users(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, view: str = "model"
+    ) -> Iterator[User]:
+        """
+        Iterate over the users of the current tenant (tenant admin only)
+
+        Records are fetched page by page and converted as they are consumed;
+        the next page is requested while the current one is processed.
+
+        Args:
+            page_size: Users per request
+            prefetch: Fetch the next page in the background
+            view: 'model' for User objects, 'lazy' for UserViews that convert
+                fields on access, 'raw' for the response dicts
+
+        Returns:
+            Iterator of users
+        """
+        return self._iter_pages("/tenant-admin/users", self._converter("user", view), page_size, prefetch)
+
+    def iter_sessions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over active sessions in the current tenant (tenant admin only)
+
+        Args:
+            page_size: Sessions per request
+            prefetch: Fetch the next page in the background
+
+        Returns:
+            Iterator of session dicts
+        """
+        return self._iter_pages("/tenant-admin/sessions", None, page_size, prefetch)
+
+    def iter_login_history(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the current user's login history
+
+        Args:
+            page_size: Entries per request
+            prefetch: Fetch the next page in the background
+
+        Returns:
+            Iterator of login history dicts
+        """
+        return self._iter_pages("/user/login-history", None, page_size, prefetch)
+
+    def iter_security_events(
+        self, user_id: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over security events
+
+        Args:
+            user_id: Another user's events (admins only); defaults to the current user
+            page_size: Events per request
+            prefetch: Fetch the next page in the background
+
+        Returns:
+            Iterator of security event dicts
+        """
+        params = {"userId": user_id} if user_id else None
+        return self._iter_pages("/security-events", None, page_size, prefetch, params)
+
+    def iter_webhook_deliveries(
+        self, webhook_id: str, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Get universal login page URL
-        
+        Iterate over recent deliveries of a webhook (admin only)
+
         Args:
-            tenant_slug: Tenant slug
-            return_to: Optional return URL
-            
+            webhook_id: Webhook ID
+            page_size: Deliveries per request
+            prefetch: Fetch the next page in the background
+
         Returns:
-            Login URL
+            Iterator of delivery dicts
         """
-        params = {"tenant": tenant_slug}
-        if return_to:
-            params["redirect_uri"] = return_to
-        
-        return f"{self.config.domain}/auth/universal-login?{urlencode(params)}"
+        return self._iter_pages(f"/admin/webhooks/{webhook_id}/deliveries", None, page_size, prefetch)
 
-    def get_universal_register_url(self, tenant_slug: str, return_to: Optional[str] = None) -> str:
+    def iter_api_keys(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, view: str = "model"
+    ) -> Iterator[APIKey]:
         """
-        Get universal registration page URL
-        
+        Iterate over the tenant's API keys without loading them all at once
+
+        Pages /admin/api-keys (tenant admins, or keys with api_keys:read).
+        Listed keys carry only their prefix, so APIKey.key holds the
+        keyPrefix and the full key is never returned.
+
         Args:
-            tenant_slug: Tenant slug
-            return_to: Optional return URL
-            
+            page_size: Keys per request
+            prefetch: Fetch the next page in the background
+            view: 'model', 'lazy' or 'raw' (see list_api_keys)
+
         Returns:
-            Registration URL
+            Iterator of API keys
         """
-        params = {"tenant": tenant_slug}
-        if return_to:
-            params["redirect_uri"] = return_to
-        
-        return f"{self.config.domain}/auth/universal-register?{urlencode(params)}"
+        return self._iter_pages("/admin/api-keys", self._converter("api_key", view), page_size, prefetch)
 
     # ==================
-    # UTILITIES
+    # ADMIN
     # ==================
 
-    def check_password_breach(self, password: str) -> Dict[str, bool]:
+    def revoke_session(self, session_id: str) -> None:
         """
-        Check if password has been breached (Have I Been Pwned)
-        
+        Revoke a session in the current tenant (tenant admin only)
+
         Args:
-            password: Password to check
-            
+            session_id: Session ID
+        """
+        self._call(self._revoke_session_call(session_id))
+
+    def delete_user(self, user_id: str) -> None:
+        """
+        Delete a user in the current tenant (tenant admin only)
+
+        Args:
+            user_id: User ID
+        """
+        self._call(self._delete_user_call(user_id))
+
+    def update_user_role(self, user_id: str, role: str) -> Dict[str, Any]:
+        """
+        Change a user's role (tenant admin only)
+
+        Args:
+            user_id: User ID
+            role: 'user' or 'tenant_admin'
+
         Returns:
-            Dict with 'breached' and 'safe' flags
+            The updated user's fields as returned by the server (id, email,
+            firstName, lastName, role, isActive, emailVerified, mfaEnabled)
         """
-        return self._request(
-            "POST",
-            "/auth/check-password-breach",
-            {"password": password},
-        )
+        return self._call(self._update_user_role_call(user_id, role))
+
+    def import_users(
+        self,
+        source: ImportSource,
+        format: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        concurrency: int = 4,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        max_chunk_users: int = DEFAULT_MAX_CHUNK_USERS,
+        checkpoint: Optional[str] = None,
+        on_progress: Optional[Callable[[UserImportResult], None]] = None,
+    ) -> UserImportResult:
+        """
+        Import users in parallel chunks via /admin/import-users (admin only)
+
+        The source is read lazily and split into chunks small enough for the
+        server's request size limit. At most `concurrency` chunks are in
+        flight; reading pauses until one completes, so memory use stays
+        bounded for exports of any size.
+
+        Args:
+            source: CSV, JSON array or NDJSON (Auth0 export) file path, or an iterable of user dicts
+            format: 'csv', 'json' or 'ndjson' (inferred from the file extension)
+            options: Server import options (defaultRole, overwriteExisting, generatePasswordsIfMissing)
+            concurrency: Chunks uploaded at the same time
+            max_chunk_bytes: Upper bound for a chunk's encoded size
+            max_chunk_users: Upper bound for users per chunk
+            checkpoint: File recording finished chunks; rerunning with the same
+                file and source skips them
+            on_progress: Called with the running result after each chunk
+
+        Returns:
+            Import result; per-user errors cover this run only
+
+        Raises:
+            AuthflowError: If a chunk fails (after the chunks in flight finish and are checkpointed)
+        """
+        state = None
+        if checkpoint:
+            state = ImportCheckpoint(
+                checkpoint, import_fingerprint(source, format, max_chunk_bytes, max_chunk_users)
+            )
+        result = UserImportResult()
+        if state:
+            result.total = state.totals["total"]
+            result.imported = state.totals["imported"]
+            result.skipped = state.totals["skipped"]
+        started = time.monotonic()
+        failures: List[AuthflowError] = []
+
+        def upload(index: int, chunk: List[Dict[str, Any]]) -> Any:
+            return index, len(chunk), self._call(self._import_users_call(chunk, options))
+
+        def collect(futures: Iterable["Future[Any]"]) -> None:
+            for future in futures:
+                try:
+                    index, sent, response = future.result()
+                except AuthflowError as e:
+                    failures.append(e)
+                    continue
+                result.chunks += 1
+                result.sent += sent
+                result.total += response.get("total", 0)
+                result.imported += response.get("imported", 0)
+                result.skipped += response.get("skipped", 0)
+                result.errors.extend(response.get("errors", []))
+                result.elapsed = time.monotonic() - started
+                if state:
+                    state.mark_done(index, response)
+                if on_progress:
+                    on_progress(result)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="authflow-import") as pool:
+            pending: "set[Future[Any]]" = set()
+            for index, chunk in iter_chunks(iter_import_records(source, format), max_chunk_bytes, max_chunk_users):
+                if state and state.is_done(index):
+                    result.resumed_chunks += 1
+                    continue
+                while len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                if failures:
+                    break
+                pending.add(pool.submit(upload, index, chunk))
+            collect(wait(pending)[0])
+
+        result.elapsed = time.monotonic() - started
+        if failures:
+            error = failures[0]
+            hint = f"; rerun with checkpoint={checkpoint!r} to resume" if checkpoint else ""
+            raise AuthflowError(
+                f"User import stopped after {result.chunks} chunks: {error.message}{hint}", error.status_code
+            )
+        return result
 
     # ==================
-    # HELPER METHODS
+    # BATCH OPERATIONS
     # ==================
 
-    def _dict_to_user(self, data: Dict[str, Any]) -> User:
-        """Convert dict to User object"""
-        return User(
-            id=data["id"],
-            email=data["email"],
-            role=data["role"],
-            email_verified=data["emailVerified"],
-            mfa_enabled=data["mfaEnabled"],
-            created_at=self._parse_datetime(data["createdAt"]),
-            name=data.get("name"),
-            tenant_id=data.get("tenantId"),
-            last_login=self._parse_datetime(data.get("lastLogin")) if data.get("lastLogin") else None,
-        )
+    def revoke_sessions(self, session_ids: Iterable[str], concurrency: int = 8) -> List[BatchItemResult]:
+        """
+        Revoke many sessions concurrently
 
-    def _dict_to_api_key(self, data: Dict[str, Any]) -> APIKey:
-        """Convert dict to APIKey object"""
-        return APIKey(
-            id=data["id"],
-            name=data["name"],
-            key=data["key"],
-            created_at=self._parse_datetime(data["createdAt"]),
-            last_used=self._parse_datetime(data.get("lastUsed")) if data.get("lastUsed") else None,
-            expires_at=self._parse_datetime(data.get("expiresAt")) if data.get("expiresAt") else None,
-        )
+        Calls share this client's connection pool; keep concurrency at or
+        below AuthflowConfig.pool_maxsize. Failures are reported per item
+        and 429 responses make the batch back off and slow down.
 
-    @staticmethod
-    def _parse_datetime(date_str: str) -> datetime:
-        """Parse ISO datetime string"""
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except:
-            return datetime.now()
+        Args:
+            session_ids: Session IDs
+            concurrency: Maximum requests in flight
+
+        Returns:
+            One BatchItemResult per ID, in input order
+        """
+        return run_batch(self.revoke_session, session_ids, concurrency)
+
+    def delete_users(self, user_ids: Iterable[str], concurrency: int = 8) -> List[BatchItemResult]:
+        """
+        Delete many users concurrently (see revoke_sessions)
+
+        Args:
+            user_ids: User IDs
+            concurrency: Maximum requests in flight
+
+        Returns:
+            One BatchItemResult per ID, in input order
+        """
+        return run_batch(self.delete_user, user_ids, concurrency)
+
+    def update_user_roles(self, changes: Iterable[Tuple[str, str]], concurrency: int = 8) -> List[BatchItemResult]:
+        """
+        Change many users' roles concurrently (see revoke_sessions)
+
+        Args:
+            changes: (user_id, role) pairs
+            concurrency: Maximum requests in flight
+
+        Returns:
+            One BatchItemResult per pair, in input order, with the updated user dict as value
+        """
+        return run_batch(lambda change: self.update_user_role(*change), changes, concurrency)
+
+    def delete_api_keys(self, key_ids: Iterable[str], concurrency: int = 8) -> List[BatchItemResult]:
+        """
+        Delete many API keys concurrently (see revoke_sessions)
+
+        Args:
+            key_ids: API key IDs
+            concurrency: Maximum requests in flight
+
+        Returns:
+            One BatchItemResult per ID, in input order
+        """
+        return run_batch(self.delete_api_key, key_ids, concurrency)
+
+    # ==================
+    # UTILITIES
+    # ==================
+
+    def check_password_breach(self, password: str) -> Dict[str, bool]:
+        """
+        Check if password has been breached (Have I Been Pwned)
+
+        Args:
+            password: Password to check
+
+        Returns:
+            Dict with 'breached' and 'safe' flags
+        """
+        return self._call(self._check_password_breach_call(password))
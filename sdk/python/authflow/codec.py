@@ -0,0 +1,107 @@
+"""Pluggable JSON encoding for request and response bodies"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+class JSONCodec:
+    """
+    Encodes request bodies to bytes and decodes response bytes
+
+    Subclasses wrap a JSON library. loads() raises ValueError on invalid
+    input whichever library is used.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON via orjson (pip install authflow[fast])"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed: pip install authflow[fast]")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError subclasses ValueError
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON via msgspec"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed: pip install msgspec")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+_CODECS = {"orjson": OrjsonCodec, "msgspec": MsgspecCodec, "json": JSONCodec}
+_default: Dict[str, JSONCodec] = {}
+
+
+def get_json_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Get a JSON codec
+
+    Args:
+        name: 'orjson', 'msgspec' or 'json'; None picks the fastest
+            installed library, in that order
+
+    Returns:
+        A shared codec instance
+
+    Raises:
+        ImportError: If the named library is not installed
+    """
+    if name is not None and name not in _CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    key = name or "auto"
+    codec = _default.get(key)
+    if codec is None:
+        if name is not None:
+            codec = _CODECS[name]()
+        elif orjson is not None:
+            codec = OrjsonCodec()
+        elif msgspec is not None:
+            codec = MsgspecCodec()
+        else:
+            codec = JSONCodec()
+        _default[key] = codec
+    return codec
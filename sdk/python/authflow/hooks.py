@@ -0,0 +1,125 @@
+"""Instrumentation hooks for the clients' hot paths"""
+
+import logging
+import re
+import threading
+import weakref
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ("before_request", "after_response", "on_retry", "on_refresh", "on_cache_hit", "on_verify")
+
+# Whole path segments that look like ids: UUIDs, long hex, all digits, or
+# prefixed ids such as 'usr_2x8k1' (so '/oauth2/token' is left alone)
+_ID_SEGMENT = re.compile(
+    r"/(?:"
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,}"
+    r"|\d+"
+    r"|[A-Za-z]+_[A-Za-z0-9_-]*\d[A-Za-z0-9_-]*"
+    r")(?=/|$)"
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse ids in an API path so it can be used as a metric label
+
+    Id-like path segments (UUIDs, long hex, numbers, prefixed ids such as
+    'usr_2x8k1') become ':id' and the query string is dropped:
+    '/tenant-admin/users/8c1e.../role?x=1' -> '/tenant-admin/users/:id/role'.
+    """
+    return _ID_SEGMENT.sub("/:id", endpoint.split("?", 1)[0])
+
+
+class Hooks:
+    """
+    Callbacks invoked at instrumentation points
+
+    Each event attribute is a tuple of callbacks, empty by default. Call
+    sites test it before building anything, so unused events cost one
+    attribute lookup. Callbacks get keyword arguments; exceptions they
+    raise are logged and swallowed.
+
+    Hooks created with a parent also run the parent's callbacks, including
+    ones added later. The inherited callbacks are copied into the event
+    tuples, so an event stays empty while neither has a callback for it.
+
+    Events:
+        before_request(method, endpoint, attempt)
+        after_response(method, endpoint, status_code, duration, attempt, error)
+            status_code is None and error the exception when nothing came back
+        on_retry(method, endpoint, attempt, delay, status_code, error)
+        on_refresh(kind, duration, error)
+            kind is 'session' (/auth/refresh), or the /oauth2/token grant used:
+            'client_credentials' or 'refresh_token'
+        on_cache_hit(cache)
+            cache is 'jwks', 'token', 'profile' or, in the Django SDK, 'verify'/'verify_shared'
+        on_verify(mode, duration, cached, error)
+            token verification in the Django middleware; cached is 'local',
+            'shared' or None when the token was verified
+    """
+
+    def __init__(self, parent: Optional["Hooks"] = None):
+        """
+        Args:
+            parent: Hooks whose callbacks also run for this object's events
+        """
+        self.before_request: Tuple[Callable[..., Any], ...] = ()
+        self.after_response: Tuple[Callable[..., Any], ...] = ()
+        self.on_retry: Tuple[Callable[..., Any], ...] = ()
+        self.on_refresh: Tuple[Callable[..., Any], ...] = ()
+        self.on_cache_hit: Tuple[Callable[..., Any], ...] = ()
+        self.on_verify: Tuple[Callable[..., Any], ...] = ()
+        self._lock = threading.Lock()
+        self._own = dict.fromkeys(EVENTS, ())
+        self._parent = parent
+        self._children: "weakref.WeakSet[Hooks]" = weakref.WeakSet()
+        if parent is not None:
+            with parent._lock:
+                parent._children.add(self)
+            for event in EVENTS:
+                self._rebuild(event)
+
+    def add(self, event: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+        """Register a callback for an event (returned unchanged)"""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown hook event: {event}")
+        with self._lock:
+            self._own[event] += (callback,)
+        self._rebuild(event)
+        return callback
+
+    def remove(self, event: str, callback: Callable[..., Any]) -> None:
+        """Unregister a callback"""
+        with self._lock:
+            self._own[event] = tuple(cb for cb in self._own[event] if cb is not callback)
+        self._rebuild(event)
+
+    def _rebuild(self, event: str) -> None:
+        """Recompute an event's callbacks from our own and the parent's, then update children"""
+        with self._lock:
+            inherited = getattr(self._parent, event) if self._parent is not None else ()
+            # Replace rather than mutate: emitting threads iterate the old tuple safely
+            setattr(self, event, self._own[event] + inherited)
+            children = list(self._children)
+        for child in children:
+            child._rebuild(event)
+
+    def on(self, event: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of add()"""
+        return lambda callback: self.add(event, callback)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Invoke every callback for an event"""
+        for callback in getattr(self, event):
+            try:
+                callback(**fields)
+            except Exception:
+                logger.exception("authflow %s hook failed", event)
+
+    @property
+    def enabled(self) -> bool:
+        """True if any callback is registered"""
+        return any(getattr(self, event) for event in EVENTS)
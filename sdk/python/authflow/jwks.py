@@ -0,0 +1,414 @@
+"""JWKS key store for offline JWT verification"""
+
+import asyncio
+import base64
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import requests
+
+from .hooks import Hooks
+from .types import AuthflowError
+
+try:
+    import jwt
+except ImportError:  # pragma: no cover - optional dependency
+    jwt = None
+
+
+JWKSFetcher = Callable[[str], Tuple[Dict[str, Any], Mapping[str, str]]]
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _require_jwt() -> None:
+    if jwt is None:
+        raise AuthflowError(
+            "PyJWT is required for offline token verification: pip install authflow[jwt]"
+        )
+
+
+def _requests_fetcher(url: str) -> Tuple[Dict[str, Any], Mapping[str, str]]:
+    """Default fetcher: GET the JWKS with requests"""
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    return response.json(), response.headers
+
+
+class _Flight:
+    """A single in-progress JWKS fetch that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class JWKSKeyStore:
+    """
+    Thread-safe cache of RS256 signing keys from /.well-known/jwks.json
+
+    Keys are cached by kid for as long as the response's Cache-Control
+    max-age allows (clamped to [min_ttl, max_ttl]). Concurrent refetches,
+    whether from a kid miss or an expired set, collapse into one request.
+    When the endpoint is unreachable the last known keys keep being served
+    for up to max_stale seconds past their expiry; stale hits then trigger
+    at most one background refetch per min_ttl.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        fetch: Optional[JWKSFetcher] = None,
+        default_ttl: float = 300,
+        min_ttl: float = 30,
+        max_ttl: float = 86400,
+        max_stale: float = 3600,
+        refresh_ahead: float = 0.2,
+        miss_refetch_interval: float = 10,
+        fetch_timeout: float = 15,
+        background_refresh: bool = True,
+        hooks: Optional[Hooks] = None,
+    ):
+        """
+        Initialize the key store
+
+        Args:
+            jwks_url: Absolute URL of the JWKS document
+            fetch: Callable returning (jwks_json, response_headers) for a URL
+            default_ttl: Key lifetime when the response has no max-age
+            min_ttl: Lower bound for the key lifetime
+            max_ttl: Upper bound for the key lifetime
+            max_stale: Seconds past expiry that stale keys may still be served
+            refresh_ahead: Fraction of the lifetime left when a refresh starts
+            miss_refetch_interval: Minimum seconds between kid-miss refetches
+            fetch_timeout: Seconds a caller waits on another thread's fetch
+            background_refresh: Refresh on a daemon thread ahead of expiry
+            hooks: Instrumentation hooks (on_cache_hit with cache='jwks')
+        """
+        self.jwks_url = jwks_url
+        self._fetch = fetch or _requests_fetcher
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.max_stale = max_stale
+        self.refresh_ahead = refresh_ahead
+        self.miss_refetch_interval = miss_refetch_interval
+        self.fetch_timeout = fetch_timeout
+        self.background_refresh = background_refresh
+        self.hooks = hooks or Hooks()
+
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._flight: Optional[_Flight] = None
+        self._failed_at: Optional[float] = None
+        self._background_pending = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.stale_hits = 0
+
+    # ==================
+    # KEY LOOKUP
+    # ==================
+
+    def get_key(self, kid: str) -> Any:
+        """
+        Get the public key for a kid
+
+        Args:
+            kid: Key ID from the JWT header
+
+        Returns:
+            Public key object usable with jwt.decode
+
+        Raises:
+            AuthflowError: If the kid is unknown after a refetch, or the
+                refetch fails and no key is within max_stale of its expiry
+        """
+        now = time.monotonic()
+        key = self._keys.get(kid)
+
+        if key is not None and now < self._expires_at:
+            self.hits += 1
+            if self.hooks.on_cache_hit:
+                self.hooks.emit("on_cache_hit", cache="jwks")
+            return key
+
+        if key is not None and now < self._expires_at + self.max_stale:
+            # Expired but usable: serve it and revalidate off the hot path
+            self.stale_hits += 1
+            self._refresh_in_background()
+            return key
+
+        self.misses += 1
+        if key is None and self._fetched_at and now - self._fetched_at < self.miss_refetch_interval:
+            raise AuthflowError(f"Unknown signing key: {kid}", 401)
+
+        # Past max_stale a cached key is no longer trusted, even if the refetch fails
+        self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise AuthflowError(f"Unknown signing key: {kid}", 401)
+        return key
+
+    async def get_key_async(self, kid: str) -> Any:
+        """
+        Get the public key for a kid without blocking the event loop
+
+        Cache hits are answered inline; anything that may need a fetch runs
+        get_key on the default executor.
+        """
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() < self._expires_at:
+            self.hits += 1
+            if self.hooks.on_cache_hit:
+                self.hooks.emit("on_cache_hit", cache="jwks")
+            return key
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_key, kid)
+
+    def get_keys(self) -> Dict[str, Any]:
+        """Get a snapshot of all cached keys, loading them if needed"""
+        if not self._fetched_at:
+            self.refresh()
+        return dict(self._keys)
+
+    # ==================
+    # REFRESH
+    # ==================
+
+    def refresh(self) -> None:
+        """
+        Refetch the JWKS
+
+        Concurrent callers share a single in-flight request. If the fetch
+        fails the previously cached keys are left in place.
+
+        Raises:
+            AuthflowError: If the fetch fails
+        """
+        with self._lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+
+        if not leader:
+            if not flight.done.wait(self.fetch_timeout):
+                raise AuthflowError("Timed out waiting for JWKS refresh")
+            if flight.error is not None:
+                raise AuthflowError(f"JWKS refresh failed: {flight.error}")
+            return
+
+        try:
+            self._load()
+        except Exception as e:
+            flight.error = e
+            self.refresh_errors += 1
+            self._failed_at = time.monotonic()
+            raise AuthflowError(f"JWKS refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+        if self.background_refresh:
+            self._start_refresher()
+
+    def _load(self) -> None:
+        _require_jwt()
+        body, headers = self._fetch(self.jwks_url)
+
+        keys = {}
+        for jwk in body.get("keys", []):
+            if jwk.get("kty") == "RSA" and jwk.get("kid"):
+                keys[jwk["kid"]] = jwt.PyJWK(jwk, algorithm="RS256").key
+
+        ttl = self._ttl_from_headers(headers)
+        now = time.monotonic()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + ttl
+            self._failed_at = None
+        self.refreshes += 1
+
+    def _ttl_from_headers(self, headers: Mapping[str, str]) -> float:
+        cache_control = (headers.get("Cache-Control") or headers.get("cache-control") or "").lower()
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return self.min_ttl
+        match = _MAX_AGE_RE.search(cache_control)
+        ttl = float(match.group(1)) if match else self.default_ttl
+        return max(self.min_ttl, min(ttl, self.max_ttl))
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._flight is not None or self._background_pending:
+                return
+            # Back off after a failed fetch instead of refetching on every stale hit
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.min_ttl:
+                return
+            self._background_pending = True
+        threading.Thread(target=self._refresh_quietly, daemon=True).start()
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except AuthflowError:
+            pass
+        finally:
+            with self._lock:
+                self._background_pending = False
+
+    def _start_refresher(self) -> None:
+        with self._lock:
+            if self._thread is not None or self._stop.is_set():
+                return
+            self._thread = threading.Thread(
+                target=self._run_refresher, name="authflow-jwks-refresh", daemon=True
+            )
+        self._thread.start()
+
+    def _run_refresher(self) -> None:
+        while not self._stop.is_set():
+            lifetime = self._expires_at - self._fetched_at
+            refresh_at = self._expires_at - lifetime * self.refresh_ahead
+            delay = max(refresh_at - time.monotonic(), self.min_ttl * self.refresh_ahead)
+            if self._stop.wait(delay):
+                return
+            try:
+                self.refresh()
+            except AuthflowError:
+                # Keep serving stale keys; retry after the minimum lifetime
+                self._stop.wait(self.min_ttl)
+
+    def close(self) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+
+    # ==================
+    # STATS
+    # ==================
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        return {
+            "keys": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "expires_in": max(self._expires_at - time.monotonic(), 0.0),
+        }
+
+
+def verify_jwt(
+    token: str,
+    key_store: JWKSKeyStore,
+    issuer: Optional[str] = None,
+    audience: Optional[str] = None,
+    leeway: float = 0,
+    revocation_list: Any = None,
+) -> Dict[str, Any]:
+    """
+    Verify an RS256 JWT offline
+
+    Args:
+        token: Encoded JWT
+        key_store: Key store to resolve the kid against
+        issuer: Expected iss claim (not checked when None)
+        audience: Expected aud claim (not checked when None)
+        leeway: Allowed clock skew in seconds
+        revocation_list: RevocationList to reject revoked tokens against
+
+    Returns:
+        Decoded claims
+
+    Raises:
+        AuthflowError: If the token is malformed, expired, badly signed or revoked
+    """
+    _require_jwt()
+    key = key_store.get_key(_unverified_kid(token))
+    claims = _decode(token, key, issuer, audience, leeway)
+    if revocation_list is not None:
+        revocation_list.check(claims, token)
+    return claims
+
+
+async def verify_jwt_async(
+    token: str,
+    key_store: JWKSKeyStore,
+    issuer: Optional[str] = None,
+    audience: Optional[str] = None,
+    leeway: float = 0,
+    revocation_list: Any = None,
+) -> Dict[str, Any]:
+    """Verify an RS256 JWT offline without blocking the event loop (see verify_jwt)"""
+    _require_jwt()
+    key = await key_store.get_key_async(_unverified_kid(token))
+    claims = _decode(token, key, issuer, audience, leeway)
+    if revocation_list is not None:
+        revocation_list.check(claims, token)
+    return claims
+
+
+def _unverified_kid(token: str) -> str:
+    try:
+        return jwt.get_unverified_header(token).get("kid", "")
+    except jwt.PyJWTError as e:
+        raise AuthflowError(f"Invalid token: {e}", 401)
+
+
+def _decode(
+    token: str,
+    key: Any,
+    issuer: Optional[str],
+    audience: Optional[str],
+    leeway: float,
+) -> Dict[str, Any]:
+    try:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            issuer=issuer,
+            audience=audience,
+            leeway=leeway,
+            options={
+                "require": ["exp"],
+                "verify_iss": issuer is not None,
+                "verify_aud": audience is not None,
+            },
+        )
+    except jwt.PyJWTError as e:
+        raise AuthflowError(f"Invalid token: {e}", 401)
+
+
+def peek_claims(token: str) -> Dict[str, Any]:
+    """
+    Decode a JWT payload WITHOUT verifying it
+
+    Only use this for scheduling decisions (cache lifetimes, refresh
+    timing) on tokens that were verified some other way.
+
+    Returns:
+        Decoded claims, or an empty dict if the token is not a JWT
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
@@ -0,0 +1,180 @@
+"""Fast timestamp parsing and lazy, read-only views over raw API records and token claims"""
+
+import re
+import sys
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .types import APIKey, AuthflowError, User
+
+
+# Fractional seconds and offsets fromisoformat() only accepts on 3.11+
+_FRACTION = re.compile(r"\.(\d+)")
+_COMPACT_OFFSET = re.compile(r"([+-]\d{2})(\d{2})$")
+
+
+def _normalize(value: str) -> str:
+    value = value.replace(" ", "T", 1)
+    value = _FRACTION.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), value, count=1)
+    return _COMPACT_OFFSET.sub(r"\1:\2", value)
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> datetime:
+    """
+    Parse an ISO-8601 timestamp from the API
+
+    Results are cached: listings repeat the same timestamps (bulk-created
+    users, never-used keys) and datetimes are immutable.
+
+    Raises:
+        AuthflowError: If the value isn't an ISO-8601 timestamp
+    """
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    if sys.version_info < (3, 11):
+        try:
+            return datetime.fromisoformat(_normalize(value))
+        except ValueError:
+            pass
+    raise AuthflowError(f"Invalid timestamp in API response: {value!r}")
+
+
+def _optional_datetime(value: Optional[str]) -> Optional[datetime]:
+    return parse_datetime(value) if value else None
+
+
+class RecordView:
+    """
+    Read-only attribute access to a raw API record
+
+    Nothing is converted up front; each attribute is read from the record
+    (and timestamps parsed) when it is accessed.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and other.raw == self.raw  # type: ignore[attr-defined]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.raw.get('id')!r})"
+
+
+class UserView(RecordView):
+    """Lazy counterpart of User"""
+
+    __slots__ = ()
+
+    id = property(lambda self: self.raw["id"])
+    email = property(lambda self: self.raw["email"])
+    role = property(lambda self: self.raw["role"])
+    email_verified = property(lambda self: self.raw["emailVerified"])
+    mfa_enabled = property(lambda self: self.raw["mfaEnabled"])
+    created_at = property(lambda self: parse_datetime(self.raw["createdAt"]))
+    name = property(lambda self: self.raw.get("name"))
+    tenant_id = property(lambda self: self.raw.get("tenantId"))
+    last_login = property(lambda self: _optional_datetime(self.raw.get("lastLogin")))
+
+    def to_model(self) -> User:
+        """Convert to a full User"""
+        return User(
+            id=self.id,
+            email=self.email,
+            role=self.role,
+            email_verified=self.email_verified,
+            mfa_enabled=self.mfa_enabled,
+            created_at=self.created_at,
+            name=self.name,
+            tenant_id=self.tenant_id,
+            last_login=self.last_login,
+        )
+
+
+class APIKeyView(RecordView):
+    """Lazy counterpart of APIKey"""
+
+    __slots__ = ()
+
+    id = property(lambda self: self.raw["id"])
+    name = property(lambda self: self.raw["name"])
+    key = property(lambda self: self.raw.get("key") or self.raw["keyPrefix"])
+    created_at = property(lambda self: parse_datetime(self.raw["createdAt"]))
+    last_used = property(lambda self: _optional_datetime(self.raw.get("lastUsed") or self.raw.get("lastUsedAt")))
+    expires_at = property(lambda self: _optional_datetime(self.raw.get("expiresAt")))
+
+    def to_model(self) -> APIKey:
+        """Convert to a full APIKey"""
+        return APIKey(
+            id=self.id,
+            name=self.name,
+            key=self.key,
+            created_at=self.created_at,
+            last_used=self.last_used,
+            expires_at=self.expires_at,
+        )
+
+
+class ClaimsUser:
+    """
+    User built from a verified access token's claims
+
+    id, email, role and tenant_id come from the token. Reading any other
+    User field fetches the full profile once; with an async client, await
+    load_profile() before reading them.
+    """
+
+    __slots__ = ("claims", "_load", "_aload", "_profile")
+
+    def __init__(
+        self,
+        claims: Dict[str, Any],
+        load: Optional[Callable[[], User]] = None,
+        aload: Optional[Callable[[], Awaitable[User]]] = None,
+    ):
+        self.claims = claims
+        self._load = load
+        self._aload = aload
+        self._profile: Optional[User] = None
+
+    id = property(lambda self: self.claims["userId"])
+    email = property(lambda self: self.claims["email"])
+    role = property(lambda self: self.claims["role"])
+    tenant_id = property(lambda self: self.claims.get("tenantId"))
+    email_verified = property(lambda self: self.profile.email_verified)
+    mfa_enabled = property(lambda self: self.profile.mfa_enabled)
+    created_at = property(lambda self: self.profile.created_at)
+    name = property(lambda self: self.profile.name)
+    last_login = property(lambda self: self.profile.last_login)
+
+    @property
+    def profile(self) -> User:
+        """The full User, fetched on first access"""
+        if self._profile is None:
+            if self._load is None:
+                raise AuthflowError("Profile not loaded; await load_profile() first")
+            self._profile = self._load()
+        return self._profile
+
+    async def load_profile(self) -> User:
+        """Fetch the full User without blocking the event loop"""
+        if self._profile is None:
+            if self._aload is None:
+                return self.profile
+            self._profile = await self._aload()
+        return self._profile
+
+    def to_model(self) -> User:
+        """Convert to a full User (fetches the profile)"""
+        return self.profile
+
+    def __repr__(self) -> str:
+        return f"ClaimsUser(id={self.id!r}, role={self.role!r}, tenant_id={self.tenant_id!r})"
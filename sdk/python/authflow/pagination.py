@@ -0,0 +1,120 @@
+"""Lazy, prefetching iteration over paginated list endpoints"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+
+# The server caps ?limit= at this; larger pages would look short and end iteration
+MAX_PAGE_SIZE = 100
+
+PageFetcher = Callable[[int, int], List[Dict[str, Any]]]
+AsyncPageFetcher = Callable[[int, int], Awaitable[List[Dict[str, Any]]]]
+
+
+def _repeats(page: List[Dict[str, Any]], previous: Optional[List[Dict[str, Any]]]) -> bool:
+    """
+    True if a page is the previous one again
+
+    Servers that ignore ?limit= return every record on each request. That
+    shows as a page longer than page_size, except for listings of exactly
+    page_size records, where the second request repeats the first.
+    """
+    return previous is not None and bool(page) and page[0] == previous[0]
+
+
+def iterate_pages(
+    fetch_page: PageFetcher,
+    convert: Optional[Callable[[Dict[str, Any]], T]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator[T]:
+    """
+    Yield records page by page, converting each only when it is consumed
+
+    Args:
+        fetch_page: Called with (limit, offset); returns one page of raw records
+        convert: Turns a raw record into the yielded object (raw dicts if None)
+        page_size: Records per request (at most MAX_PAGE_SIZE)
+        prefetch: Fetch the next page on a background thread while the
+            current one is being consumed
+
+    Yields:
+        Converted records
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="authflow-page") if prefetch else None
+    try:
+        offset = 0
+        previous: Optional[List[Dict[str, Any]]] = None
+        page = fetch_page(page_size, offset)
+        while True:
+            if _repeats(page, previous):
+                return
+            # A short page ends the listing; a longer one means the server sent everything
+            last = len(page) != page_size
+            upcoming: "Optional[Future[List[Dict[str, Any]]]]" = None
+            if not last and executor is not None:
+                upcoming = executor.submit(fetch_page, page_size, offset + page_size)
+
+            for raw in page:
+                yield convert(raw) if convert else raw
+
+            if last:
+                return
+            offset += page_size
+            previous = page
+            page = upcoming.result() if upcoming is not None else fetch_page(page_size, offset)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiterate_pages(
+    fetch_page: AsyncPageFetcher,
+    convert: Optional[Callable[[Dict[str, Any]], T]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[T]:
+    """
+    Async version of iterate_pages; the next page is prefetched in a task
+
+    Args:
+        fetch_page: Coroutine function called with (limit, offset)
+        convert: Turns a raw record into the yielded object (raw dicts if None)
+        page_size: Records per request (at most MAX_PAGE_SIZE)
+        prefetch: Fetch the next page concurrently while the current one is consumed
+
+    Yields:
+        Converted records
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    upcoming: "Optional[asyncio.Future[List[Dict[str, Any]]]]" = None
+    try:
+        offset = 0
+        previous: Optional[List[Dict[str, Any]]] = None
+        page = await fetch_page(page_size, offset)
+        while True:
+            if _repeats(page, previous):
+                return
+            last = len(page) != page_size
+            upcoming = None
+            if not last and prefetch:
+                upcoming = asyncio.ensure_future(fetch_page(page_size, offset + page_size))
+
+            for raw in page:
+                yield convert(raw) if convert else raw
+
+            if last:
+                return
+            offset += page_size
+            previous = page
+            page = await upcoming if upcoming is not None else await fetch_page(page_size, offset)
+            upcoming = None
+    finally:
+        if upcoming is not None and not upcoming.done():
+            upcoming.cancel()
@@ -0,0 +1,256 @@
+"""Client-side adaptive rate limiting"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .cache import TTLCache
+from .types import AuthflowError
+
+
+# Endpoint classes, matched by path prefix (relative to /api)
+ENDPOINT_CLASSES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("refresh", ("/auth/refresh",)),
+    (
+        "login",
+        (
+            "/auth/login",
+            "/auth/register",
+            "/auth/magic-link",
+            "/auth/mfa/verify",
+            "/auth/forgot-password",
+            "/auth/reset-password",
+        ),
+    ),
+    ("admin", ("/admin/", "/tenant-admin/", "/super-admin/")),
+)
+
+
+class RateLimitedError(AuthflowError):
+    """Raised without contacting the server while it is blocking this client"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to throttling
+
+    throttle() cuts the rate multiplicatively; each success adds back a
+    small fraction of the configured rate, so the bucket settles just
+    below the rate at which the server starts refusing requests.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Requests per second
+            burst: Bucket capacity (defaults to one second's worth, at least 1)
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """
+        Take a token, returning how long to wait before using it
+
+        If the wait would exceed max_wait no token is taken, so refused
+        callers don't push later ones further back; the wait is still
+        returned for the caller to report.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is None or wait <= max_wait:
+                self._tokens -= 1
+            return wait
+
+    def throttle(self, factor: float, min_rate: float) -> None:
+        """Slow down after the server refused a request"""
+        with self._lock:
+            self.rate = max(min_rate, self.rate * factor)
+            self._tokens = min(self._tokens, 0.0)
+
+    def recover(self, fraction: float) -> None:
+        """Speed back up by a fraction of the configured rate"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * fraction)
+
+
+class RateLimiter:
+    """
+    Per-endpoint-class rate limits that react to the server's 429s
+
+    Classes are 'login', 'refresh', 'admin' and 'default'. Classes given a
+    (rate, burst) in limits are paced by an adaptive TokenBucket. Every
+    class honors server blocks: after a 429 with Retry-After (or the
+    server's blockedUntil), calls in that class wait out a short block or
+    fail fast with RateLimitedError instead of hitting the server again.
+    Login-class blocks are tracked per email, matching the server.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, Tuple[float, Optional[float]]]] = None,
+        max_wait: float = 30.0,
+        decrease_factor: float = 0.5,
+        recovery: float = 0.02,
+        min_rate: float = 0.1,
+        default_block: float = 1.0,
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            limits: {class: (requests per second, burst or None)}, e.g. {'admin': (20, 40)}
+            max_wait: Wait up to this long for a token or block to clear, else raise
+            decrease_factor: Multiply a class's rate by this on each 429
+            recovery: Fraction of the configured rate regained per success
+            min_rate: Floor for adapted rates
+            default_block: Block length when a 429 carries no retry information
+        """
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, burst) for name, (rate, burst) in (limits or {}).items()
+        }
+        self.max_wait = max_wait
+        self.decrease_factor = decrease_factor
+        self.recovery = recovery
+        self.min_rate = min_rate
+        self.default_block = default_block
+        self._blocks = TTLCache(maxsize=10000, ttl=86400)
+        self.throttled = 0
+
+    @staticmethod
+    def classify(endpoint: str) -> str:
+        """Get the endpoint class of an API path"""
+        for name, prefixes in ENDPOINT_CLASSES:
+            if endpoint.startswith(prefixes):
+                return name
+        return "default"
+
+    @staticmethod
+    def _scope(endpoint_class: str, data: Optional[Mapping[str, Any]]) -> Optional[str]:
+        if endpoint_class == "login" and data and isinstance(data.get("email"), str):
+            return data["email"].lower()
+        return None
+
+    def acquire(self, endpoint: str, data: Optional[Mapping[str, Any]] = None) -> float:
+        """
+        Reserve a request slot
+
+        Args:
+            endpoint: API path
+            data: Request body (login-class blocks are per email)
+
+        Returns:
+            Seconds to wait before sending
+
+        Raises:
+            RateLimitedError: If the wait would exceed max_wait
+        """
+        endpoint_class = self.classify(endpoint)
+        delay = 0.0
+        for key in ((endpoint_class, None), (endpoint_class, self._scope(endpoint_class, data))):
+            blocked_until = self._blocks.get(key)
+            if blocked_until is not None:
+                delay = max(delay, blocked_until - time.monotonic())
+        if delay > self.max_wait:
+            raise RateLimitedError(
+                f"Rate limited by the server; {endpoint_class} requests blocked for another {delay:.0f}s",
+                delay,
+            )
+
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is not None:
+            wait = bucket.reserve(self.max_wait)
+            if wait > self.max_wait:
+                raise RateLimitedError(
+                    f"Client rate limit for {endpoint_class} requests exceeded; next slot in {wait:.0f}s",
+                    wait,
+                )
+            delay = max(delay, wait)
+        return max(delay, 0.0)
+
+    def record(
+        self,
+        endpoint: str,
+        status_code: int,
+        retry_after: Optional[float] = None,
+        data: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """
+        Feed a response back into the limiter
+
+        Args:
+            endpoint: API path
+            status_code: Response status
+            retry_after: Seconds the server asked us to wait, if known
+            data: Request body (login-class blocks are per email)
+        """
+        endpoint_class = self.classify(endpoint)
+        bucket = self.buckets.get(endpoint_class)
+        if status_code != 429:
+            if bucket is not None and status_code < 500:
+                bucket.recover(self.recovery)
+            return
+
+        self.throttled += 1
+        if bucket is not None:
+            bucket.throttle(self.decrease_factor, self.min_rate)
+        block = retry_after if retry_after is not None else self.default_block
+        key = (endpoint_class, self._scope(endpoint_class, data))
+        self._blocks.set(key, time.monotonic() + block, ttl=block)
+
+    @staticmethod
+    def retry_after_from(header: Optional[str], body: Any) -> Optional[float]:
+        """
+        Seconds to wait after a 429, from Retry-After or the server's JSON body
+
+        The server's rate-limit responses carry blockedUntil (ISO time) and
+        retryAfter (minutes) instead of a header.
+        """
+        if header:
+            try:
+                return max(float(header), 0.0)
+            except ValueError:
+                pass
+        if not isinstance(body, dict):
+            return None
+        blocked_until = body.get("blockedUntil")
+        if isinstance(blocked_until, str):
+            try:
+                until = datetime.fromisoformat(blocked_until.replace("Z", "+00:00"))
+            except ValueError:
+                pass
+            else:
+                if until.tzinfo is None:
+                    until = until.replace(tzinfo=timezone.utc)
+                return max((until - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        minutes = body.get("retryAfter")
+        if isinstance(minutes, (int, float)):
+            return float(minutes) * 60
+        return None
+
+    def rate(self, endpoint_class: str) -> Optional[float]:
+        """Current requests per second for a class (None if it isn't paced)"""
+        bucket = self.buckets.get(endpoint_class)
+        return bucket.rate if bucket is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current rates and the number of throttled responses"""
+        return {
+            "rates": {name: bucket.rate for name, bucket in self.buckets.items()},
+            "throttled": self.throttled,
+            "active_blocks": len(self._blocks),
+        }
@@ -0,0 +1,217 @@
+"""Tenant-scoped client views sharing one transport"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Optional, TypeVar
+
+from .async_client import AsyncAuthflowClient
+from .client import AuthflowClient
+from .hooks import Hooks
+from .types import AuthflowConfig
+
+_C = TypeVar("_C", AuthflowClient, AsyncAuthflowClient)
+
+
+class TenantMetrics:
+    """Request counters of one tenant view"""
+
+    __slots__ = (
+        "tenant_slug",
+        "requests",
+        "errors",
+        "retries",
+        "refreshes",
+        "request_seconds",
+        "created_at",
+        "last_used",
+    )
+
+    def __init__(self, tenant_slug: str):
+        self.tenant_slug = tenant_slug
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.refreshes = 0
+        self.request_seconds = 0.0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def _after_response(self, status_code: Optional[int], duration: float, error: Optional[BaseException], **_) -> None:
+        self.requests += 1
+        self.request_seconds += duration
+        if error is not None or (status_code is not None and status_code >= 500):
+            self.errors += 1
+
+    def _on_retry(self, **_) -> None:
+        self.retries += 1
+
+    def _on_refresh(self, **_) -> None:
+        self.refreshes += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "refreshes": self.refreshes,
+            "avg_request_seconds": self.request_seconds / self.requests if self.requests else 0.0,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+        }
+
+
+def _tenant_hooks(shared: Hooks, metrics: TenantMetrics) -> Hooks:
+    """Hooks for a tenant view: the registry's hooks (also ones added later) plus its counters"""
+    hooks = Hooks(parent=shared)
+    hooks.add("after_response", metrics._after_response)
+    hooks.add("on_retry", metrics._on_retry)
+    hooks.add("on_refresh", metrics._on_refresh)
+    return hooks
+
+
+class _Registry(Generic[_C]):
+    """LRU of tenant views over one client; see AuthflowClientRegistry"""
+
+    def __init__(self, client: _C, max_tenants: int = 256):
+        if max_tenants <= 0:
+            raise ValueError("max_tenants must be positive")
+        self.client = client
+        self.max_tenants = max_tenants
+        self._views: "OrderedDict[str, _C]" = OrderedDict()
+        self._metrics: Dict[str, TenantMetrics] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+
+    @property
+    def hooks(self) -> Hooks:
+        """Hooks shared by every tenant view (e.g. for instrument_prometheus)"""
+        return self.client.hooks
+
+    def get(self, tenant_slug: str) -> _C:
+        """
+        Get the client view for a tenant, creating it on first use
+
+        Views are cheap copies of the shared client; the least recently
+        used view is dropped once max_tenants are held. Sessions live in
+        the shared session store, so a re-created view picks them up again.
+        """
+        with self._lock:
+            view = self._views.get(tenant_slug)
+            if view is not None:
+                self._views.move_to_end(tenant_slug)
+                self._metrics[tenant_slug].last_used = time.time()
+                return view
+            metrics = TenantMetrics(tenant_slug)
+            view = self.client.for_tenant(tenant_slug, hooks=_tenant_hooks(self.client.hooks, metrics))
+            self._views[tenant_slug] = view
+            self._metrics[tenant_slug] = metrics
+            self.created += 1
+            evicted = []
+            while len(self._views) > self.max_tenants:
+                slug, old = self._views.popitem(last=False)
+                del self._metrics[slug]
+                evicted.append(old)
+                self.evictions += 1
+        for old in evicted:
+            old.stop_auto_refresh()
+        return view
+
+    __getitem__ = get
+
+    def __contains__(self, tenant_slug: str) -> bool:
+        return tenant_slug in self._views
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def evict(self, tenant_slug: str) -> None:
+        """Drop a tenant's view"""
+        with self._lock:
+            view = self._views.pop(tenant_slug, None)
+            self._metrics.pop(tenant_slug, None)
+        if view is not None:
+            view.stop_auto_refresh()
+
+    def metrics(self, tenant_slug: Optional[str] = None) -> Dict[str, Any]:
+        """Counters of one tenant, or of every live tenant by slug"""
+        with self._lock:
+            if tenant_slug is not None:
+                return self._metrics[tenant_slug].snapshot()
+            return {slug: m.snapshot() for slug, m in self._metrics.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """View counts of the registry itself"""
+        return {
+            "tenants": len(self._views),
+            "max_tenants": self.max_tenants,
+            "created": self.created,
+            "evictions": self.evictions,
+        }
+
+
+class AuthflowClientRegistry(_Registry[AuthflowClient]):
+    """
+    Per-tenant AuthflowClient views over one connection pool
+
+    Every view shares the registry client's requests.Session pool, JWKS key
+    store, profile cache, rate limiter, circuit breaker and session store,
+    so serving hundreds of tenants costs one pool and one set of TLS
+    connections. Per-tenant request counters are kept while a view is live.
+
+    Example:
+        registry = AuthflowClientRegistry(AuthflowConfig(domain="https://auth.example.com"))
+        registry.get("acme").login(credentials)
+        registry.metrics("acme")
+    """
+
+    def __init__(self, config: AuthflowConfig, max_tenants: int = 256, **client_kwargs: Any):
+        """
+        Initialize the registry
+
+        Args:
+            config: Shared configuration (tenant_slug is set per view)
+            max_tenants: Views kept before the least recently used is evicted
+            **client_kwargs: Passed to AuthflowClient (key_store, session_store, hooks, ...)
+        """
+        super().__init__(AuthflowClient(config, **client_kwargs), max_tenants)
+
+    def close(self) -> None:
+        """Stop every view and close the shared pool"""
+        with self._lock:
+            views = list(self._views.values())
+            self._views.clear()
+            self._metrics.clear()
+        for view in views:
+            view.stop_auto_refresh()
+        self.client.close()
+
+    def __enter__(self) -> "AuthflowClientRegistry":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncAuthflowClientRegistry(_Registry[AsyncAuthflowClient]):
+    """Per-tenant AsyncAuthflowClient views over one httpx pool (see AuthflowClientRegistry)"""
+
+    def __init__(self, config: AuthflowConfig, max_tenants: int = 256, **client_kwargs: Any):
+        super().__init__(AsyncAuthflowClient(config, **client_kwargs), max_tenants)
+
+    async def aclose(self) -> None:
+        """Stop every view and close the shared pool"""
+        with self._lock:
+            views = list(self._views.values())
+            self._views.clear()
+            self._metrics.clear()
+        for view in views:
+            view.stop_auto_refresh()
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncAuthflowClientRegistry":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,186 @@
+"""Retry policy and circuit breaker for API requests"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Collection, Dict, Any, Optional
+
+from .types import AuthflowError
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(AuthflowError):
+    """Raised without contacting the server while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried
+
+    Only idempotent calls are retried after the request may have reached
+    the server. Any call is retried when the connection could not be
+    established at all, since nothing was sent.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_factor: float = 0.25,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+        max_retry_after: float = 30.0,
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_factor: Base delay; attempt n waits backoff_factor * 2**n
+            max_backoff: Upper bound for the computed delay
+            jitter: Randomize delays ("full jitter") to spread out retries
+            retry_statuses: Response statuses worth retrying
+            max_retry_after: Give up instead of honoring a longer Retry-After
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def next_delay(
+        self,
+        method: str,
+        attempt: int,
+        status_code: Optional[int] = None,
+        retry_after: Optional[str] = None,
+        sent: bool = True,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[float]:
+        """
+        Get the delay before the next attempt
+
+        Args:
+            method: HTTP method of the failed request
+            attempt: Zero-based number of the attempt that failed
+            status_code: Response status, or None for a transport error
+            retry_after: Retry-After response header, if any
+            sent: False if the request never reached the server
+            idempotent: Override the method-based idempotency check
+
+        Returns:
+            Seconds to wait, or None if the request must not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if sent and not idempotent:
+            return None
+        if status_code is not None and status_code not in self.retry_statuses:
+            return None
+
+        if retry_after:
+            delay = self._parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_retry_after else None
+
+        delay = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests fail fast with CircuitOpenError. Once recovery_timeout has
+    passed a single trial request is let through (half-open); its outcome
+    closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self) -> None:
+        """
+        Check that a request may be sent
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                remaining = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Auth server unavailable; circuit open for another {remaining:.1f}s"
+                    )
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                raise CircuitOpenError("Auth server unavailable; recovery check in progress")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy server"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a transport error or server-side (5xx) failure"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and consecutive failure count"""
+        return {"state": self.state, "consecutive_failures": self._failures}
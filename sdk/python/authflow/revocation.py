@@ -0,0 +1,276 @@
+"""Local revocation list for offline-verified access tokens"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from .jwks import peek_claims
+from .models import parse_datetime
+from .types import AuthflowError
+
+logger = logging.getLogger(__name__)
+
+# Access tokens live 7 days (JWT_EXPIRES_IN); older revocations can't match a live token
+DEFAULT_RETENTION = 7 * 24 * 3600.0
+
+# Webhook events handled by RevocationList.subscribe()
+REVOCATION_EVENTS = (
+    "session.revoked",
+    "user.logout",
+    "user.deleted",
+    "user.deactivated",
+    "user.sessions_revoked",
+)
+_USER_EVENTS = frozenset(("user.deleted", "user.deactivated", "user.sessions_revoked"))
+
+# fetch(cursor) -> (revocation records, next cursor)
+RevocationFetcher = Callable[[Optional[str]], Tuple[Iterable[Mapping[str, Any]], Optional[str]]]
+
+
+def token_hash(token: str) -> str:
+    """SHA-256 hex digest identifying a token in revocation records"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RevocationList:
+    """
+    In-memory set of revoked tokens, sessions and users
+
+    Consulted by verify_jwt() (and the clients' verify_token()) so offline
+    verification rejects logged-out or revoked tokens without a request.
+    A token is revoked if its hash, jti or sid claim was revoked, or if
+    its user was revoked in a later second than the token's iat. iat has
+    whole-second precision, so a token issued in the same second as a
+    user-wide revocation (e.g. an immediate re-login) stays valid.
+    Entries are dropped once no token they could match is still valid.
+
+    The list is filled incrementally: from webhook deliveries
+    (subscribe()), by polling a feed (start_polling()), and by the
+    clients' own logout() and delete_user() calls.
+    """
+
+    def __init__(self, retention: float = DEFAULT_RETENTION, prune_interval: float = 60.0):
+        """
+        Args:
+            retention: Seconds to keep entries without a known expiry
+                (the maximum access token lifetime)
+            prune_interval: Minimum seconds between expiry sweeps
+        """
+        self.retention = retention
+        self.prune_interval = prune_interval
+        # ('token' | 'jti' | 'sid', id) -> wall-clock expiry
+        self._ids: Dict[Tuple[str, str], float] = {}
+        # user id -> (second of the revocation, wall-clock expiry)
+        self._users: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._next_prune = time.time() + prune_interval
+        self._poll_stop: Optional[threading.Event] = None
+
+        self.checks = 0
+        self.rejections = 0
+        self.poll_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._users)
+
+    # ==================
+    # REVOKING
+    # ==================
+
+    def revoke_token(self, token: str, expires_at: Optional[float] = None) -> None:
+        """Revoke one access token (until its exp when expires_at is not given)"""
+        if expires_at is None:
+            exp = peek_claims(token).get("exp")
+            expires_at = exp if isinstance(exp, (int, float)) else None
+        self._add(("token", token_hash(token)), expires_at)
+
+    def revoke_token_hash(self, digest: str, expires_at: Optional[float] = None) -> None:
+        """Revoke a token by its token_hash()"""
+        self._add(("token", digest.lower()), expires_at)
+
+    def revoke_token_id(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """Revoke the token carrying this jti claim"""
+        self._add(("jti", jti), expires_at)
+
+    def revoke_session(self, session_id: str, expires_at: Optional[float] = None) -> None:
+        """Revoke tokens carrying this sid claim"""
+        self._add(("sid", session_id), expires_at)
+
+    def revoke_user(self, user_id: str, revoked_at: Optional[float] = None) -> None:
+        """Revoke every token issued to a user before the second of revoked_at (now by default)"""
+        revoked_second = math.floor(time.time() if revoked_at is None else revoked_at)
+        with self._lock:
+            previous = self._users.get(user_id)
+            if previous is None or previous[0] < revoked_second:
+                self._users[user_id] = (revoked_second, revoked_second + self.retention)
+            self._maybe_prune()
+
+    def _add(self, key: Tuple[str, str], expires_at: Optional[float]) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.retention
+        with self._lock:
+            self._ids[key] = max(expires_at, self._ids.get(key, 0.0))
+            self._maybe_prune()
+
+    def apply(self, record: Mapping[str, Any]) -> None:
+        """
+        Apply one revocation record from a webhook or poll feed
+
+        Recognized keys: token, tokenHash, jti, sessionId, userId (with
+        allSessions or revokedAt for user-wide revocation) and expiresAt.
+        Timestamps may be epoch seconds or ISO-8601 strings.
+        """
+        expires_at = _timestamp(record.get("expiresAt"))
+        if record.get("token"):
+            self.revoke_token(record["token"], expires_at)
+        if record.get("tokenHash"):
+            self.revoke_token_hash(record["tokenHash"], expires_at)
+        if record.get("jti"):
+            self.revoke_token_id(record["jti"], expires_at)
+        if record.get("sessionId"):
+            self.revoke_session(record["sessionId"], expires_at)
+        if record.get("userId") and (record.get("allSessions") or record.get("revokedAt")):
+            self.revoke_user(record["userId"], _timestamp(record.get("revokedAt")))
+
+    def handle_event(self, event: Any) -> None:
+        """Webhook handler: apply a revocation event (a WebhookEvent)"""
+        data = dict(event.data or {})
+        if event.event in _USER_EVENTS:
+            data.setdefault("allSessions", True)
+            data.setdefault("revokedAt", event.timestamp)
+        self.apply(data)
+
+    def subscribe(self, receiver: Any, events: Iterable[str] = REVOCATION_EVENTS) -> None:
+        """Register handle_event on a WebhookReceiver for revocation events"""
+        for name in events:
+            receiver.add_handler(name, self.handle_event)
+
+    # ==================
+    # CHECKING
+    # ==================
+
+    def is_revoked(self, claims: Mapping[str, Any], token: Optional[str] = None, digest: Optional[str] = None) -> bool:
+        """
+        Check verified claims against the list
+
+        Args:
+            claims: Claims of the token (already verified)
+            token: The encoded token, to match token-hash entries
+            digest: token_hash(token), if the caller already has it
+        """
+        self.checks += 1
+        if not self._ids and not self._users:
+            return False
+        revoked = self._match(claims, token, digest)
+        if revoked:
+            self.rejections += 1
+        return revoked
+
+    def _match(self, claims: Mapping[str, Any], token: Optional[str], digest: Optional[str]) -> bool:
+        ids = self._ids
+        if ids:
+            if digest is None and token is not None:
+                digest = token_hash(token)
+            if digest is not None and ("token", digest) in ids:
+                return True
+            jti = claims.get("jti")
+            if jti and ("jti", jti) in ids:
+                return True
+            sid = claims.get("sid") or claims.get("sessionId")
+            if sid and ("sid", sid) in ids:
+                return True
+        user = self._users.get(claims.get("userId") or claims.get("sub") or "")
+        if user is not None:
+            issued_at = claims.get("iat")
+            # Without iat the token's age is unknown; treat it as issued before the revocation
+            return not isinstance(issued_at, (int, float)) or issued_at < user[0]
+        return False
+
+    def check(self, claims: Mapping[str, Any], token: Optional[str] = None) -> None:
+        """
+        Raise if the token is revoked
+
+        Raises:
+            AuthflowError: 401 if the token, its session or its user was revoked
+        """
+        if self.is_revoked(claims, token):
+            raise AuthflowError("Token has been revoked", 401)
+
+    # ==================
+    # MAINTENANCE
+    # ==================
+
+    def _maybe_prune(self) -> None:
+        """Sweep expired entries (called with the lock held)"""
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.prune_interval
+        self._ids = {key: expires for key, expires in self._ids.items() if expires > now}
+        self._users = {key: entry for key, entry in self._users.items() if entry[1] > now}
+
+    def prune(self) -> int:
+        """Drop expired entries now; returns how many were removed"""
+        with self._lock:
+            before = len(self)
+            self._next_prune = 0.0
+            self._maybe_prune()
+            return before - len(self)
+
+    def start_polling(self, fetch: RevocationFetcher, interval: float = 30.0, cursor: Optional[str] = None) -> None:
+        """
+        Poll a revocation feed on a background thread
+
+        interval bounds how long a revocation takes to reach this process
+        when no webhook delivers it sooner.
+
+        Args:
+            fetch: Called with the last cursor; returns (records, next cursor)
+            interval: Seconds between polls
+            cursor: Starting cursor (None fetches from the beginning)
+        """
+        if self._poll_stop is not None:
+            return
+        stop = self._poll_stop = threading.Event()
+
+        def run() -> None:
+            position = cursor
+            while True:
+                try:
+                    records, position = fetch(position)
+                    for record in records:
+                        self.apply(record)
+                except Exception:
+                    self.poll_errors += 1
+                    logger.exception("authflow revocation poll failed")
+                if stop.wait(interval):
+                    return
+
+        threading.Thread(target=run, name="authflow-revocation-poll", daemon=True).start()
+
+    def stop_polling(self) -> None:
+        """Stop the polling thread"""
+        if self._poll_stop is not None:
+            self._poll_stop.set()
+            self._poll_stop = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and check/rejection counters"""
+        return {
+            "tokens": len(self._ids),
+            "users": len(self._users),
+            "checks": self.checks,
+            "rejections": self.rejections,
+            "poll_errors": self.poll_errors,
+        }
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return parse_datetime(str(value)).timestamp()
@@ -0,0 +1,222 @@
+"""Session stores for serving many user sessions from one client"""
+
+import abc
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from .types import Session, User
+
+
+def session_to_dict(session: Session) -> Dict[str, Any]:
+    """Serialize a Session to a JSON-compatible dict"""
+    user = session.user
+    return {
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "role": user.role,
+            "email_verified": user.email_verified,
+            "mfa_enabled": user.mfa_enabled,
+            "created_at": user.created_at.isoformat(),
+            "name": user.name,
+            "tenant_id": user.tenant_id,
+            "last_login": user.last_login.isoformat() if user.last_login else None,
+        },
+        "access_token": session.access_token,
+        "expires_at": session.expires_at.isoformat(),
+        "refresh_token": session.refresh_token,
+    }
+
+
+def session_from_dict(data: Dict[str, Any]) -> Session:
+    """Deserialize a Session produced by session_to_dict"""
+    user = data["user"]
+    return Session(
+        user=User(
+            id=user["id"],
+            email=user["email"],
+            role=user["role"],
+            email_verified=user["email_verified"],
+            mfa_enabled=user["mfa_enabled"],
+            created_at=datetime.fromisoformat(user["created_at"]),
+            name=user.get("name"),
+            tenant_id=user.get("tenant_id"),
+            last_login=datetime.fromisoformat(user["last_login"]) if user.get("last_login") else None,
+        ),
+        access_token=data["access_token"],
+        expires_at=datetime.fromisoformat(data["expires_at"]),
+        refresh_token=data.get("refresh_token"),
+    )
+
+
+class _KeyLocks:
+    """Per-key locks that are dropped once nobody holds a reference"""
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._guard = threading.Lock()
+
+    def get(self, key: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[key] = lock
+            return lock
+
+
+class SessionStore(abc.ABC):
+    """
+    Storage for user sessions, keyed by user or session id
+
+    Implementations must be safe to call from multiple threads. lock(key)
+    serializes token refreshes for one key so concurrent requests for the
+    same user don't each spend the refresh token.
+    """
+
+    def __init__(self):
+        self._locks = _KeyLocks()
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Session]:
+        """Get the session stored under key"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, session: Session) -> None:
+        """Store a session under key"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the session stored under key"""
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock for key"""
+        with self._locks.get(key):
+            yield
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store"""
+
+    def __init__(self):
+        super().__init__()
+        self._sessions: Dict[str, Session] = {}
+
+    def get(self, key: str) -> Optional[Session]:
+        return self._sessions.get(key)
+
+    def set(self, key: str, session: Session) -> None:
+        self._sessions[key] = session
+
+    def delete(self, key: str) -> None:
+        self._sessions.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class FileSessionStore(SessionStore):
+    """Session store keeping one JSON file per key in a directory"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize file session store
+
+        Args:
+            directory: Directory for session files (created if missing)
+        """
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, key: str) -> Optional[Session]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fh:
+                return session_from_dict(json.load(fh))
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, session: Session) -> None:
+        # Write to a temp file and rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(session_to_dict(session), fh)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store on any Redis-protocol client (redis-py, valkey, fakeredis...)
+
+    If the client provides lock() (as redis-py does) refreshes are
+    serialized across processes, otherwise only within this process.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = "authflow:session:",
+        ttl: Optional[int] = None,
+        lock_timeout: float = 30.0,
+    ):
+        """
+        Initialize Redis session store
+
+        Args:
+            redis_client: Client exposing get/set/delete (and optionally lock)
+            prefix: Key prefix
+            ttl: Expire stored sessions after this many seconds (None keeps them)
+            lock_timeout: Auto-release time for cross-process refresh locks
+        """
+        super().__init__()
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    def get(self, key: str) -> Optional[Session]:
+        raw = self.redis.get(self.prefix + key)
+        if raw is None:
+            return None
+        return session_from_dict(json.loads(raw))
+
+    def set(self, key: str, session: Session) -> None:
+        self.redis.set(self.prefix + key, json.dumps(session_to_dict(session)), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.redis.delete(self.prefix + key)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        if not hasattr(self.redis, "lock"):
+            with super().lock(key):
+                yield
+            return
+        with self._locks.get(key):
+            with self.redis.lock(f"{self.prefix}lock:{key}", timeout=self.lock_timeout):
+                yield
@@ -0,0 +1,176 @@
+"""OpenTelemetry spans and Prometheus metrics driven by Hooks"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .hooks import Hooks, endpoint_template
+from .types import AuthflowError
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+
+def _outcome(status_code: Optional[int], error: Optional[BaseException]) -> str:
+    if status_code is not None:
+        return str(status_code)
+    return type(error).__name__ if error is not None else "ok"
+
+
+# ==================
+# OPENTELEMETRY
+# ==================
+
+def instrument_opentelemetry(hooks: Hooks, tracer_provider: Any = None) -> None:
+    """
+    Record a client span per HTTP attempt, token refresh and verification
+
+    Spans are created when the operation finishes, with its measured start
+    time, so no per-request state is kept while hooks are idle.
+
+    Args:
+        hooks: Hooks of a client (client.hooks) or of the Django middleware
+        tracer_provider: Provider to use (the global one by default)
+
+    Raises:
+        AuthflowError: If opentelemetry-api is not installed
+    """
+    if otel_trace is None:
+        raise AuthflowError("opentelemetry-api is required: pip install authflow[otel]")
+    tracer = otel_trace.get_tracer("authflow", tracer_provider=tracer_provider)
+
+    def record(name: str, duration: float, attributes: Dict[str, Any], error: Optional[BaseException]) -> None:
+        end = time.time_ns()
+        span = tracer.start_span(
+            name, kind=SpanKind.CLIENT, start_time=end - int(duration * 1e9), attributes=attributes
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end(end_time=end)
+
+    def after_response(method, endpoint, status_code, duration, attempt, error, **_):
+        path = endpoint_template(endpoint)
+        attributes = {"http.request.method": method, "url.path": path, "authflow.attempt": attempt}
+        if status_code is not None:
+            attributes["http.response.status_code"] = status_code
+        if error is None and status_code is not None and status_code >= 500:
+            error = AuthflowError(f"HTTP {status_code}", status_code)
+        record(f"authflow {method} {path}", duration, attributes, error)
+
+    def on_refresh(kind, duration, error, **_):
+        record(f"authflow refresh {kind}", duration, {"authflow.refresh.kind": kind}, error)
+
+    def on_verify(mode, duration, cached, error, **_):
+        attributes = {"authflow.verify.mode": mode, "authflow.verify.cache": cached or "miss"}
+        record("authflow verify", duration, attributes, error)
+
+    hooks.add("after_response", after_response)
+    hooks.add("on_refresh", on_refresh)
+    hooks.add("on_verify", on_verify)
+
+
+# ==================
+# PROMETHEUS
+# ==================
+
+_metrics: Dict[Tuple[int, str], Dict[str, Any]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _prometheus_metrics(registry: Any, namespace: str) -> Dict[str, Any]:
+    """Create the metrics once per registry; registering a name twice is an error"""
+    key = (id(registry), namespace)
+    with _metrics_lock:
+        if key not in _metrics:
+            kwargs = {"namespace": namespace, "registry": registry}
+            _metrics[key] = {
+                "request_duration": prometheus_client.Histogram(
+                    "client_request_duration_seconds",
+                    "AuthFlow API request duration per attempt",
+                    ["method", "endpoint", "status"],
+                    **kwargs,
+                ),
+                "retries": prometheus_client.Counter(
+                    "client_retries_total",
+                    "AuthFlow API requests retried",
+                    ["method", "endpoint", "reason"],
+                    **kwargs,
+                ),
+                "refresh_duration": prometheus_client.Histogram(
+                    "token_refresh_duration_seconds",
+                    "Access token refresh duration",
+                    ["kind", "outcome"],
+                    **kwargs,
+                ),
+                "cache_hits": prometheus_client.Counter(
+                    "cache_hits_total",
+                    "Lookups answered from an SDK cache",
+                    ["cache"],
+                    **kwargs,
+                ),
+                "verify_duration": prometheus_client.Histogram(
+                    "token_verification_duration_seconds",
+                    "Bearer token verification duration",
+                    ["mode", "cache", "outcome"],
+                    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+                    **kwargs,
+                ),
+            }
+        return _metrics[key]
+
+
+def instrument_prometheus(hooks: Hooks, registry: Any = None, namespace: str = "authflow") -> Dict[str, Any]:
+    """
+    Export per-endpoint request histograms and refresh, retry, cache and
+    verification metrics
+
+    Endpoint labels have ids collapsed (see endpoint_template) to keep
+    cardinality bounded.
+
+    Args:
+        hooks: Hooks of a client (client.hooks) or of the Django middleware
+        registry: Collector registry (prometheus_client.REGISTRY by default)
+        namespace: Metric name prefix
+
+    Returns:
+        The metric objects by name
+
+    Raises:
+        AuthflowError: If prometheus_client is not installed
+    """
+    if prometheus_client is None:
+        raise AuthflowError("prometheus_client is required: pip install authflow[prometheus]")
+    metrics = _prometheus_metrics(registry or prometheus_client.REGISTRY, namespace)
+
+    def after_response(method, endpoint, status_code, duration, error, **_):
+        metrics["request_duration"].labels(
+            method, endpoint_template(endpoint), _outcome(status_code, error)
+        ).observe(duration)
+
+    def on_retry(method, endpoint, status_code, error, **_):
+        metrics["retries"].labels(method, endpoint_template(endpoint), _outcome(status_code, error)).inc()
+
+    def on_refresh(kind, duration, error, **_):
+        metrics["refresh_duration"].labels(kind, "error" if error else "ok").observe(duration)
+
+    def on_cache_hit(cache, **_):
+        metrics["cache_hits"].labels(cache).inc()
+
+    def on_verify(mode, duration, cached, error, **_):
+        metrics["verify_duration"].labels(mode, cached or "miss", "error" if error else "ok").observe(duration)
+
+    hooks.add("after_response", after_response)
+    hooks.add("on_retry", on_retry)
+    hooks.add("on_refresh", on_refresh)
+    hooks.add("on_cache_hit", on_cache_hit)
+    hooks.add("on_verify", on_verify)
+    return metrics
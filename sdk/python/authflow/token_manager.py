@@ -0,0 +1,293 @@
+"""OAuth2 token manager for service-to-service calls"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Generator, Optional, Tuple
+
+import requests
+
+from .client import AuthflowClient
+from .types import AuthflowError, OAuth2TokenResponse
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class _CachedToken:
+    """An access token and when it must be renewed"""
+
+    __slots__ = ("access_token", "refresh_token", "expires_at", "renew_at")
+
+    def __init__(self, response: OAuth2TokenResponse, refresh_ahead: float, previous_refresh: Optional[str]):
+        now = time.monotonic()
+        self.access_token = response.access_token
+        # refresh_token grants may not return a new refresh token; keep the old one
+        self.refresh_token = response.refresh_token or previous_refresh
+        self.expires_at = now + response.expires_in
+        self.renew_at = self.expires_at - min(refresh_ahead, response.expires_in / 2)
+
+
+class TokenManager:
+    """
+    Fetches and caches OAuth2 access tokens from /oauth2/token
+
+    Tokens are cached per (client_id, scope). A token inside its renewal
+    window is still handed out while a background thread fetches its
+    replacement, so callers only wait when a token has actually expired.
+    Concurrent fetches for the same key are collapsed into one request.
+
+    Uses the refresh_token grant when a refresh token is known for the key,
+    and the client_credentials grant otherwise. Token requests share the
+    client's retry policy and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client: AuthflowClient,
+        client_id: str,
+        client_secret: str,
+        refresh_token: Optional[str] = None,
+        refresh_ahead: float = 60.0,
+    ):
+        """
+        Initialize token manager
+
+        Args:
+            client: AuthflowClient whose domain and connection pool are used
+            client_id: OAuth2 client ID
+            client_secret: OAuth2 client secret
+            refresh_token: Optional refresh token for the default (None) scope
+            refresh_ahead: Renew tokens this many seconds before they expire
+        """
+        self.client = client
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_ahead = refresh_ahead
+        self._tokens: Dict[Tuple[str, Optional[str]], _CachedToken] = {}
+        self._refresh_tokens: Dict[Tuple[str, Optional[str]], str] = {}
+        if refresh_token:
+            self._refresh_tokens[(client_id, None)] = refresh_token
+        self._locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @property
+    def token_url(self) -> str:
+        """Token endpoint URL"""
+        return f"{self.client.config.domain}/oauth2/token"
+
+    def _lock_for(self, key: Tuple[str, Optional[str]]) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_token(self, scope: Optional[str] = None) -> str:
+        """
+        Get a valid access token
+
+        Args:
+            scope: Space-separated scopes (None for the client's default)
+
+        Returns:
+            Access token string
+        """
+        key = (self.client_id, scope)
+        token = self._cached(key)
+        if token is not None:
+            return token
+        return self._fetch(key, self._tokens.get(key)).access_token
+
+    async def get_token_async(self, scope: Optional[str] = None) -> str:
+        """Get a valid access token, fetching off the event loop if needed"""
+        token = self._cached((self.client_id, scope))
+        if token is not None:
+            return token
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_token, scope)
+
+    def _cached(self, key: Tuple[str, Optional[str]]) -> Optional[str]:
+        """Return a still-valid cached token, starting a renewal if it is due"""
+        cached = self._tokens.get(key)
+        if cached is None:
+            return None
+        now = time.monotonic()
+        if now >= cached.expires_at:
+            return None
+        if now >= cached.renew_at:
+            self._renew_in_background(key, cached)
+        hooks = self.client.hooks
+        if hooks.on_cache_hit:
+            hooks.emit("on_cache_hit", cache="token")
+        return cached.access_token
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """Drop the cached token for a scope (e.g. after a 401)"""
+        self._tokens.pop((self.client_id, scope), None)
+
+    def _fetch(self, key: Tuple[str, Optional[str]], stale: Optional[_CachedToken]) -> _CachedToken:
+        """Fetch a token unless another thread replaced `stale` while we waited"""
+        with self._lock_for(key):
+            current = self._tokens.get(key)
+            if current is not None and current is not stale and time.monotonic() < current.expires_at:
+                return current
+
+            refresh_token = (current and current.refresh_token) or self._refresh_tokens.get(key)
+            kind = "refresh_token" if refresh_token else "client_credentials"
+            hooks = self.client.hooks
+            started = time.perf_counter()
+            try:
+                response = self._request_token(key[1], refresh_token)
+            except AuthflowError as e:
+                if hooks.on_refresh:
+                    hooks.emit("on_refresh", kind=kind, duration=time.perf_counter() - started, error=e)
+                raise
+            if hooks.on_refresh:
+                hooks.emit("on_refresh", kind=kind, duration=time.perf_counter() - started, error=None)
+            token = _CachedToken(response, self.refresh_ahead, refresh_token)
+            self._tokens[key] = token
+            if token.refresh_token:
+                self._refresh_tokens[key] = token.refresh_token
+            return token
+
+    def _renew_in_background(self, key: Tuple[str, Optional[str]], stale: _CachedToken) -> None:
+        if self._lock_for(key).locked():
+            return
+
+        def renew() -> None:
+            try:
+                self._fetch(key, stale)
+            except AuthflowError:
+                pass  # the current token stays valid until expires_at; retry on next use
+
+        threading.Thread(target=renew, name="authflow-token-renew", daemon=True).start()
+
+    def _request_token(self, scope: Optional[str], refresh_token: Optional[str]) -> OAuth2TokenResponse:
+        """
+        POST a token grant, retrying per the client's policy and circuit breaker
+
+        Not sent through client._request: /oauth2/token is outside /api, must
+        not carry the user session's bearer token, and its OAuth error body
+        (error, error_description) is needed to spot a dead refresh token.
+        """
+        data = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        if refresh_token:
+            data["grant_type"] = "refresh_token"
+            data["refresh_token"] = refresh_token
+        else:
+            data["grant_type"] = "client_credentials"
+        if scope:
+            data["scope"] = scope
+
+        client = self.client
+        hooks = client.hooks
+        # A refresh token may be rotated by the first attempt, so only resend
+        # a refresh_token grant when it never reached the server
+        idempotent = not refresh_token
+        attempt = 0
+        while True:
+            client.circuit_breaker.before_request()
+            status_code: Optional[int] = None
+            error: Optional[Exception] = None
+            try:
+                response = client._requests_session.post(self.token_url, data=data, timeout=client._timeout)
+            except requests.RequestException as e:
+                error = e
+                client.circuit_breaker.record_failure()
+                retryable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                delay = client.retry_policy.next_delay(
+                    "POST", attempt, sent=not client._connect_failed(e), idempotent=idempotent
+                ) if retryable else None
+                if delay is None:
+                    raise AuthflowError(f"Token request failed: {str(e)}")
+            else:
+                status_code = response.status_code
+                client._record_status(status_code)
+                delay = client.retry_policy.next_delay(
+                    "POST",
+                    attempt,
+                    status_code=status_code,
+                    retry_after=response.headers.get("Retry-After"),
+                    idempotent=idempotent,
+                ) if status_code >= 400 else None
+                if delay is None:
+                    break
+
+            if hooks.on_retry:
+                hooks.emit(
+                    "on_retry",
+                    method="POST",
+                    endpoint="/oauth2/token",
+                    attempt=attempt,
+                    delay=delay,
+                    status_code=status_code,
+                    error=error,
+                )
+            time.sleep(delay)
+            attempt += 1
+
+        body = self.client._decode_body(response, {})
+        if not response.ok:
+            if refresh_token and body.get("error") == "invalid_grant":
+                # Refresh token expired or revoked: fall back to client credentials next time
+                self._refresh_tokens.pop((self.client_id, scope), None)
+            raise AuthflowError(
+                body.get("error_description") or body.get("error") or f"Token request failed with status {response.status_code}",
+                response.status_code,
+            )
+        return AuthflowClient._dict_to_token_response(body)
+
+    # ==================
+    # AUTH ADAPTERS
+    # ==================
+
+    def requests_auth(self, scope: Optional[str] = None) -> "TokenAuth":
+        """Get a requests AuthBase that adds a bearer token to each request"""
+        return TokenAuth(self, scope)
+
+    def httpx_auth(self, scope: Optional[str] = None) -> "httpx.Auth":
+        """Get an httpx Auth that adds a bearer token to each request (sync and async)"""
+        if httpx is None:
+            raise AuthflowError("httpx is required for httpx_auth: pip install authflow[async]")
+        return _HttpxTokenAuth(self, scope)
+
+
+class TokenAuth(requests.auth.AuthBase):
+    """requests auth handler backed by a TokenManager"""
+
+    def __init__(self, manager: TokenManager, scope: Optional[str] = None):
+        self.manager = manager
+        self.scope = scope
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers["Authorization"] = f"Bearer {self.manager.get_token(self.scope)}"
+        return request
+
+
+if httpx is not None:
+
+    class _HttpxTokenAuth(httpx.Auth):
+        """httpx auth flow backed by a TokenManager; retries once with a new token on 401"""
+
+        def __init__(self, manager: TokenManager, scope: Optional[str] = None):
+            self.manager = manager
+            self.scope = scope
+
+        def sync_auth_flow(self, request: "httpx.Request") -> Generator["httpx.Request", "httpx.Response", None]:
+            request.headers["Authorization"] = f"Bearer {self.manager.get_token(self.scope)}"
+            response = yield request
+            if response.status_code == 401:
+                self.manager.invalidate(self.scope)
+                request.headers["Authorization"] = f"Bearer {self.manager.get_token(self.scope)}"
+                yield request
+
+        async def async_auth_flow(self, request: "httpx.Request") -> Any:
+            request.headers["Authorization"] = f"Bearer {await self.manager.get_token_async(self.scope)}"
+            response = yield request
+            if response.status_code == 401:
+                self.manager.invalidate(self.scope)
+                request.headers["Authorization"] = f"Bearer {await self.manager.get_token_async(self.scope)}"
+                yield request
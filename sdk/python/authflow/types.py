@@ -1,8 +1,32 @@
 """Type definitions for Authflow SDK"""
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal, Tuple, Type, TypeVar
+
+
+_T = TypeVar("_T")
+
+
+def _add_slots(cls: Type[_T]) -> Type[_T]:
+    """Recreate a dataclass with __slots__ (what dataclass(slots=True) does on 3.10+)"""
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = names
+    # Defaults are baked into __init__; as class attributes they would clash with the slots
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _slotted(cls: Type[_T]) -> Type[_T]:
+    """Dataclass without a per-instance __dict__"""
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    return _add_slots(dataclass(cls))
 
 
 @dataclass
@@ -12,9 +36,24 @@ class AuthflowConfig:
     tenant_slug: Optional[str] = None
     client_id: Optional[str] = None
     redirect_uri: Optional[str] = None
-
-
-@dataclass
+    jwks_url: Optional[str] = None
+    issuer: Optional[str] = None
+    # HTTP transport tuning
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    keep_alive: bool = True
+    # Seconds an idle pooled connection is kept. AsyncAuthflowClient only:
+    # requests has no idle expiry (urllib3 replaces dropped connections on reuse)
+    keep_alive_expiry: float = 30.0
+    # Refresh the access token this many seconds before it expires
+    auto_refresh: bool = True
+    refresh_ahead: float = 60.0
+
+
+@_slotted
 class User:
     """User object"""
     id: str
@@ -28,7 +67,7 @@ class User:
     last_login: Optional[datetime] = None
 
 
-@dataclass
+@_slotted
 class Session:
     """Session object"""
     user: User
@@ -37,7 +76,7 @@ class Session:
     refresh_token: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class LoginCredentials:
     """Login credentials"""
     email: str
@@ -45,7 +84,7 @@ class LoginCredentials:
     tenant_slug: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class RegisterData:
     """Registration data"""
     email: str
@@ -55,7 +94,7 @@ class RegisterData:
     tenant_slug: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class MFASetupResponse:
     """MFA setup response"""
     secret: str
@@ -63,7 +102,7 @@ class MFASetupResponse:
     backup_codes: Optional[List[str]] = None
 
 
-@dataclass
+@_slotted
 class MFAVerifyRequest:
     """MFA verification request"""
     code: str
@@ -71,7 +110,7 @@ class MFAVerifyRequest:
     trust_device: bool = False
 
 
-@dataclass
+@_slotted
 class MagicLinkRequest:
     """Magic link request"""
     email: str
@@ -79,21 +118,21 @@ class MagicLinkRequest:
     redirect_url: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class PasswordResetRequest:
     """Password reset request"""
     email: str
     tenant_slug: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class PasswordResetComplete:
     """Complete password reset"""
     token: str
     new_password: str
 
 
-@dataclass
+@_slotted
 class OAuth2AuthorizeParams:
     """OAuth2 authorization parameters"""
     client_id: str
@@ -105,7 +144,7 @@ class OAuth2AuthorizeParams:
     code_challenge_method: Literal['S256', 'plain'] = 'S256'
 
 
-@dataclass
+@_slotted
 class OAuth2TokenRequest:
     """OAuth2 token request"""
     code: str
@@ -115,7 +154,7 @@ class OAuth2TokenRequest:
     code_verifier: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class OAuth2TokenResponse:
     """OAuth2 token response"""
     access_token: str
@@ -125,7 +164,7 @@ class OAuth2TokenResponse:
     scope: Optional[str] = None
 
 
-@dataclass
+@_slotted
 class APIKeyCreateRequest:
     """API key creation request"""
     name: str
@@ -133,7 +172,7 @@ class APIKeyCreateRequest:
     permissions: List[str] = field(default_factory=list)
 
 
-@dataclass
+@_slotted
 class APIKey:
     """API key object"""
     id: str
@@ -144,6 +183,51 @@ class APIKey:
     expires_at: Optional[datetime] = None
 
 
+@_slotted
+class APIKeyGrant:
+    """What an authenticated API key may do (see APIKeyAuthenticator)"""
+    key_id: Optional[str]
+    user_id: str
+    permissions: Tuple[str, ...]
+    name: Optional[str] = None
+    tenant_id: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+    def allows(self, permission: str) -> bool:
+        """Permission check with the server's rules ('*' grants everything)"""
+        return "*" in self.permissions or permission in self.permissions
+
+
+@_slotted
+class UserImportResult:
+    """Outcome of a bulk user import (counts include chunks finished by earlier, resumed runs)"""
+    total: int = 0
+    imported: int = 0
+    skipped: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    chunks: int = 0
+    resumed_chunks: int = 0
+    sent: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def users_per_second(self) -> float:
+        """Throughput of this run"""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+@_slotted
+class BatchItemResult:
+    """Outcome of one item of a batch operation"""
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class AuthflowError(Exception):
     """Authflow API error"""
     def __init__(self, message: str, status_code: Optional[int] = None):
@@ -0,0 +1,633 @@
+"""Receiving and verifying Authflow webhook deliveries"""
+
+import abc
+import asyncio
+import hashlib
+import heapq
+import hmac
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .cache import TTLCache
+from .codec import get_json_codec
+from .types import AuthflowError
+
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+EVENT_HEADER = "X-Webhook-Event"
+DELIVERY_ID_HEADER = "X-Webhook-Delivery-Id"
+
+
+class WebhookVerificationError(AuthflowError):
+    """Raised when a webhook delivery fails signature or timestamp checks"""
+
+    def __init__(self, message: str):
+        super().__init__(message, 400)
+
+
+@dataclass
+class WebhookEvent:
+    """A verified webhook delivery"""
+    delivery_id: str
+    event: str
+    tenant_id: Optional[str]
+    data: Any
+    timestamp: Optional[str] = None
+
+
+WebhookHandler = Callable[[WebhookEvent], None]
+
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def compute_webhook_signature(payload: Union[str, bytes], timestamp: str, secret: str) -> str:
+    """HMAC-SHA256 hex digest of "timestamp.payload", as signed by the server"""
+    message = _to_bytes(timestamp) + b"." + _to_bytes(payload)
+    return hmac.new(_to_bytes(secret), message, hashlib.sha256).hexdigest()
+
+
+def verify_webhook_signature(
+    payload: Union[str, bytes],
+    signature: str,
+    timestamp: str,
+    secrets: Union[str, Iterable[str]],
+    tolerance: float = 300,
+) -> bool:
+    """
+    Verify a webhook signature
+
+    Args:
+        payload: Raw request body, exactly as received
+        signature: X-Webhook-Signature header
+        timestamp: X-Webhook-Timestamp header (milliseconds since the epoch)
+        secrets: Webhook secret, or several while a secret is being rotated
+        tolerance: Maximum age (and clock skew) of the timestamp in seconds
+
+    Returns:
+        True if the timestamp is fresh and the signature matches any secret
+    """
+    try:
+        sent_at = int(timestamp) / 1000.0
+    except (TypeError, ValueError):
+        return False
+    if abs(time.time() - sent_at) > tolerance:
+        return False
+
+    if isinstance(secrets, str):
+        secrets = (secrets,)
+    signature = _to_bytes(signature or "")
+    valid = False
+    # Check every secret so timing doesn't reveal which one matched
+    for secret in secrets:
+        expected = compute_webhook_signature(payload, timestamp, secret).encode("ascii")
+        valid |= hmac.compare_digest(expected, signature)
+    return valid
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup that also accepts WSGI META-style keys"""
+    value = headers.get(name)
+    if value is not None:
+        return value
+    lowered = name.lower()
+    meta = "HTTP_" + name.upper().replace("-", "_")
+    for key, value in headers.items():
+        if key.lower() == lowered or key == meta:
+            return value
+    return None
+
+
+# ==================
+# QUEUES
+# ==================
+
+class WebhookQueueFull(AuthflowError):
+    """Raised when a delivery cannot be queued; the server will retry it later"""
+
+    def __init__(self, message: str = "Webhook queue is full"):
+        super().__init__(message, 503)
+
+
+class WebhookQueue(abc.ABC):
+    """
+    Queue of verified events waiting for handlers
+
+    get() hands out (receipt, event) pairs. Consumers ack(receipt) once the
+    handlers succeeded, or nack(receipt) to have the event retried.
+    Implementations must be safe to call from multiple threads.
+    """
+
+    # True if put() does blocking I/O (async callers run it in a thread)
+    blocking = False
+
+    @abc.abstractmethod
+    def put(self, event: WebhookEvent) -> bool:
+        """Enqueue an event, returning False if the queue is full"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get(self, timeout: float) -> Optional[Tuple[Any, WebhookEvent]]:
+        """Take the next event, waiting up to timeout seconds"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def ack(self, receipt: Any) -> None:
+        """Mark an event as processed"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def nack(self, receipt: Any) -> None:
+        """Mark an event as failed so it is retried (or dropped after too many attempts)"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held by the queue"""
+
+
+class MemoryWebhookQueue(WebhookQueue):
+    """Bounded in-process queue; pending events are lost if the process exits"""
+
+    def __init__(self, maxsize: int = 1000, max_attempts: int = 3, retry_backoff: float = 2.0):
+        """
+        Initialize in-memory queue
+
+        Args:
+            maxsize: Maximum number of pending events (0 for no limit)
+            max_attempts: Attempts per event before it is dropped
+            retry_backoff: Base delay; a failed event waits retry_backoff * 2**attempts
+        """
+        self.maxsize = maxsize
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._ready: Deque[Tuple[int, WebhookEvent]] = deque()
+        # (monotonic time it is due, tiebreak, attempts, event) of failed events backing off
+        self._delayed: List[Tuple[float, int, int, WebhookEvent]] = []
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+
+    def _full(self) -> bool:
+        return 0 < self.maxsize <= len(self._ready) + len(self._delayed)
+
+    def put(self, event: WebhookEvent) -> bool:
+        with self._changed:
+            if self._full():
+                return False
+            self._ready.append((0, event))
+            self._changed.notify()
+        return True
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, WebhookEvent]]:
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, attempts, event = heapq.heappop(self._delayed)
+                    self._ready.append((attempts, event))
+                if self._ready:
+                    receipt = self._ready.popleft()
+                    return receipt, receipt[1]
+                wait = deadline - now
+                if wait <= 0:
+                    return None
+                if self._delayed:
+                    wait = min(wait, self._delayed[0][0] - now)
+                self._changed.wait(wait)
+
+    def ack(self, receipt: Any) -> None:
+        pass
+
+    def nack(self, receipt: Any) -> None:
+        attempts, event = receipt
+        attempts += 1
+        if attempts >= self.max_attempts:
+            logger.error("Dropping webhook delivery %s after %d attempts", event.delivery_id, attempts)
+            return
+        due = time.monotonic() + self.retry_backoff * (2 ** attempts)
+        with self._changed:
+            if self._full():
+                logger.error("Dropping webhook delivery %s: queue full on retry", event.delivery_id)
+                return
+            heapq.heappush(self._delayed, (due, next(self._sequence), attempts, event))
+            # Wake waiters so they wait for the new due time rather than their whole timeout
+            self._changed.notify_all()
+
+    def __len__(self) -> int:
+        with self._changed:
+            return len(self._ready) + len(self._delayed)
+
+
+class SQLiteWebhookQueue(WebhookQueue):
+    """
+    Durable queue in a SQLite database
+
+    Events survive restarts and can be shared by several processes on one
+    host. A claimed event that is neither acked nor nacked within
+    visibility_timeout (e.g. its worker died) is handed out again. Events
+    that fail max_attempts times are kept with failed=1 for inspection.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: Optional[int] = None,
+        max_attempts: int = 5,
+        visibility_timeout: float = 300,
+        retry_backoff: float = 2.0,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Initialize SQLite queue
+
+        Args:
+            path: Database file (created if missing)
+            maxsize: Maximum number of pending events (None for no limit)
+            max_attempts: Attempts per event before it is marked failed
+            visibility_timeout: Seconds before an unacknowledged event is redelivered
+            retry_backoff: Base delay; a failed event waits retry_backoff * 2**attempts
+            poll_interval: How often idle consumers check for events from other processes
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS authflow_webhook_events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " delivery_id TEXT NOT NULL UNIQUE,"
+            " event TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " available_at REAL NOT NULL,"
+            " failed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS authflow_webhook_events_available"
+            " ON authflow_webhook_events (failed, available_at)"
+        )
+
+    def put(self, event: WebhookEvent) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.maxsize is not None and self._pending() >= self.maxsize:
+                    return False
+                # A delivery that is already queued counts as accepted
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO authflow_webhook_events (delivery_id, event, available_at)"
+                    " VALUES (?, ?, ?)",
+                    (event.delivery_id, json.dumps(asdict(event)), time.time()),
+                )
+            finally:
+                self._conn.execute("COMMIT")
+            self._ready.notify()
+        return True
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, WebhookEvent]]:
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                claimed = self._claim()
+                if claimed is not None:
+                    return claimed
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._ready.wait(min(remaining, self.poll_interval))
+
+    def _claim(self) -> Optional[Tuple[Any, WebhookEvent]]:
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT id, event, attempts FROM authflow_webhook_events"
+                " WHERE failed = 0 AND available_at <= ? ORDER BY available_at, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            # Hide the event from other consumers until it is acked or times out
+            self._conn.execute(
+                "UPDATE authflow_webhook_events SET available_at = ? WHERE id = ?",
+                (now + self.visibility_timeout, row[0]),
+            )
+        finally:
+            self._conn.execute("COMMIT")
+        return (row[0], row[2]), WebhookEvent(**json.loads(row[1]))
+
+    def _pending(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM authflow_webhook_events WHERE failed = 0"
+        ).fetchone()[0]
+
+    def ack(self, receipt: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM authflow_webhook_events WHERE id = ?", (receipt[0],))
+
+    def nack(self, receipt: Any) -> None:
+        row_id, attempts = receipt
+        attempts += 1
+        with self._lock:
+            self._conn.execute(
+                "UPDATE authflow_webhook_events SET attempts = ?, available_at = ?, failed = ? WHERE id = ?",
+                (
+                    attempts,
+                    time.time() + self.retry_backoff * (2 ** attempts),
+                    int(attempts >= self.max_attempts),
+                    row_id,
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._pending()
+
+
+# ==================
+# RECEIVER
+# ==================
+
+class WebhookReceiver:
+    """
+    Verifies webhook deliveries and dispatches them to handlers
+
+    handle() verifies the signature, drops deliveries that were already
+    seen and puts the event on a queue, so the HTTP response can be sent
+    straight away. A pool of consumer threads runs the handlers. The
+    server retries deliveries that are not acked within its timeout, so
+    slow handlers must not run on the request thread.
+
+    Delivery is at-least-once: if any handler raises, the event is retried
+    and all of its handlers run again.
+
+    Example:
+        receiver = WebhookReceiver([current_secret, previous_secret])
+
+        @receiver.on("user.created")
+        def user_created(event):
+            ...
+
+        # in the HTTP view
+        receiver.handle(request.body, request.headers)
+    """
+
+    def __init__(
+        self,
+        secrets: Union[str, Iterable[str]],
+        tolerance: float = 300,
+        dedupe_size: int = 10000,
+        dedupe_ttl: float = 3600,
+        max_workers: int = 4,
+        queue: Optional[WebhookQueue] = None,
+    ):
+        """
+        Initialize webhook receiver
+
+        Args:
+            secrets: Webhook secret, or several while a secret is being rotated
+            tolerance: Maximum age of a delivery's timestamp in seconds
+            dedupe_size: Number of recent delivery ids remembered
+            dedupe_ttl: How long a delivery id is remembered (should cover the server's retry window)
+            max_workers: Consumer threads running handlers (0 to consume the queue elsewhere)
+            queue: Queue for accepted events (a bounded MemoryWebhookQueue by default)
+        """
+        self.secrets = [secrets] if isinstance(secrets, str) else list(secrets)
+        if not self.secrets:
+            raise ValueError("At least one webhook secret is required")
+        self.tolerance = tolerance
+        self.queue = queue if queue is not None else MemoryWebhookQueue()
+        self.max_workers = max_workers
+        self._seen = TTLCache(maxsize=dedupe_size, ttl=dedupe_ttl)
+        self._handlers: Dict[str, List[WebhookHandler]] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.handler_errors = 0
+
+    def rotate_secrets(self, secrets: Union[str, Iterable[str]]) -> None:
+        """Replace the accepted secrets (list the new secret first)"""
+        secrets = [secrets] if isinstance(secrets, str) else list(secrets)
+        if not secrets:
+            raise ValueError("At least one webhook secret is required")
+        self.secrets = secrets
+
+    def on(self, event: str = "*") -> Callable[[WebhookHandler], WebhookHandler]:
+        """Decorator registering a handler for an event name ("*" for all events)"""
+        def register(handler: WebhookHandler) -> WebhookHandler:
+            self.add_handler(event, handler)
+            return handler
+        return register
+
+    def add_handler(self, event: str, handler: WebhookHandler) -> None:
+        """Register a handler for an event name ("*" for all events)"""
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+
+    def verify(self, body: Union[str, bytes], headers: Mapping[str, str]) -> WebhookEvent:
+        """
+        Verify a delivery and parse its payload
+
+        Args:
+            body: Raw request body
+            headers: Request headers
+
+        Returns:
+            The verified event
+
+        Raises:
+            WebhookVerificationError: If headers are missing, the timestamp is
+                stale, the signature does not match or the body is not a JSON object
+        """
+        signature = _header(headers, SIGNATURE_HEADER)
+        timestamp = _header(headers, TIMESTAMP_HEADER)
+        if not signature or not timestamp:
+            self.rejected += 1
+            raise WebhookVerificationError("Missing webhook signature headers")
+        if not verify_webhook_signature(body, signature, timestamp, self.secrets, self.tolerance):
+            self.rejected += 1
+            raise WebhookVerificationError("Invalid or expired webhook signature")
+
+        try:
+            payload = get_json_codec().loads(body)
+        except ValueError:
+            self.rejected += 1
+            raise WebhookVerificationError("Webhook body is not valid JSON")
+        if not isinstance(payload, dict):
+            self.rejected += 1
+            raise WebhookVerificationError("Webhook body is not a JSON object")
+
+        return WebhookEvent(
+            delivery_id=_header(headers, DELIVERY_ID_HEADER) or signature,
+            event=payload.get("event") or _header(headers, EVENT_HEADER) or "",
+            tenant_id=payload.get("tenantId"),
+            data=payload.get("data"),
+            timestamp=payload.get("timestamp"),
+        )
+
+    def handle(self, body: Union[str, bytes], headers: Mapping[str, str]) -> bool:
+        """
+        Verify a delivery and queue it for its handlers
+
+        Args:
+            body: Raw request body
+            headers: Request headers
+
+        Returns:
+            True if the event was queued, False for a duplicate delivery
+
+        Raises:
+            WebhookVerificationError: If the delivery fails verification
+            WebhookQueueFull: If the queue has no room (respond 503 so the server retries)
+        """
+        event, signature = self._accept(body, headers)
+        if event is None:
+            return False
+        self._enqueue(event, signature, self.queue.put(event))
+        return True
+
+    async def handle_async(self, body: Union[str, bytes], headers: Mapping[str, str]) -> bool:
+        """Like handle(), running blocking queue writes in a worker thread"""
+        event, signature = self._accept(body, headers)
+        if event is None:
+            return False
+        if self.queue.blocking:
+            queued = await asyncio.get_running_loop().run_in_executor(None, self.queue.put, event)
+        else:
+            queued = self.queue.put(event)
+        self._enqueue(event, signature, queued)
+        return True
+
+    def _accept(
+        self, body: Union[str, bytes], headers: Mapping[str, str]
+    ) -> Tuple[Optional[WebhookEvent], Optional[str]]:
+        """Verify a delivery; returns (None, None) for one that was already seen"""
+        event = self.verify(body, headers)
+        signature = _header(headers, SIGNATURE_HEADER)
+        self.received += 1
+        if not self.mark_seen(event.delivery_id, signature):
+            self.duplicates += 1
+            return None, None
+        return event, signature
+
+    def _enqueue(self, event: WebhookEvent, signature: Optional[str], queued: bool) -> None:
+        if not queued:
+            # Forget the delivery so the server's retry is not treated as a duplicate
+            self._seen.delete(("delivery", event.delivery_id))
+            self._seen.delete(("signature", signature))
+            self.dropped += 1
+            raise WebhookQueueFull()
+        self.start()
+
+    def mark_seen(self, delivery_id: str, signature: Optional[str] = None) -> bool:
+        """
+        Record a delivery, returning False if it was already seen
+
+        The delivery id is not covered by the signature, so the signature
+        (unique per timestamp and payload) is remembered too; a captured
+        request replayed under a new delivery id is still caught.
+        """
+        if not self._seen.add(("delivery", delivery_id), True):
+            return False
+        if signature and not self._seen.add(("signature", signature), True):
+            return False
+        return True
+
+    def dispatch(self, event: WebhookEvent) -> bool:
+        """
+        Run the handlers for an event on the current thread
+
+        Returns:
+            True if every handler succeeded
+        """
+        with self._lock:
+            handlers = self._handlers.get(event.event, []) + self._handlers.get("*", [])
+        ok = True
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                ok = False
+                self.handler_errors += 1
+                logger.exception(
+                    "Webhook handler %r failed for %s delivery %s", handler, event.event, event.delivery_id
+                )
+        return ok
+
+    # ==================
+    # CONSUMERS
+    # ==================
+
+    def start(self) -> None:
+        """Start the consumer threads (called automatically by handle())"""
+        if len(self._workers) >= self.max_workers:
+            return
+        with self._lock:
+            self._stopping.clear()
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self.consume,
+                    name=f"authflow-webhook-{len(self._workers)}",
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def consume(self, poll_timeout: float = 1.0) -> None:
+        """Process queued events until close() is called"""
+        while not self._stopping.is_set():
+            item = self.queue.get(poll_timeout)
+            if item is None:
+                continue
+            receipt, event = item
+            if self.dispatch(event):
+                self.queue.ack(receipt)
+            else:
+                self.queue.nack(receipt)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the consumer threads (queued events stay in a durable queue) and close the queue"""
+        self._stopping.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self.queue.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get delivery counters"""
+        return {
+            "received": self.received,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "handler_errors": self.handler_errors,
+            "queued": len(self.queue) if hasattr(self.queue, "__len__") else None,
+            "dedupe_cache": self._seen.stats(),
+        }
@@ -0,0 +1 @@
+"""Benchmarks for the AuthFlow Python and Django SDKs (python -m benchmarks.run)"""
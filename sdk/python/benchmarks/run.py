@@ -0,0 +1,501 @@
+"""
+AuthFlow SDK benchmark suite
+
+Runs the Python and Django SDKs against an in-process stub server and
+writes machine-readable results, optionally comparing against a baseline
+from an earlier release.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --suite client,django --concurrency 1,16 --calls 5000
+    python -m benchmarks.run --output new.json --baseline old.json --threshold 0.15
+
+Suites:
+    client   login, /auth/me and refresh on AuthflowClient and AsyncAuthflowClient
+    token    TokenManager with a warm cache and with a fetch per call
+    verify   offline JWT verification against the cached JWKS
+    memory   bytes per stored session and per cached Django verification
+    django   AuthFlowMiddleware overhead per request, per verify and cache mode
+    models   response-to-model conversion (see bench_models)
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import authflow
+from authflow import (
+    AsyncAuthflowClient,
+    AuthflowClient,
+    AuthflowConfig,
+    LoginCredentials,
+    RateLimiter,
+    TokenManager,
+    get_json_codec,
+    verify_jwt_async,
+)
+
+from . import bench_models
+from .stub_server import StubAuthflowServer
+
+SUITES = ("client", "token", "verify", "memory", "django", "models")
+DJANGO_SDK = os.path.join(os.path.dirname(__file__), "..", "..", "..", "public", "sdks", "authflow-django-sdk.py")
+WARMUP_CALLS = 20
+
+
+# ==================
+# MEASUREMENT
+# ==================
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict[str, Any]:
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1e6
+
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_us": {
+            "mean": statistics.fmean(latencies) * 1e6,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+        },
+    }
+
+
+def measure_threads(make_op: Callable[[int], Callable[[], Any]], concurrency: int, calls: int) -> Dict[str, Any]:
+    """Run `calls` operations on `concurrency` threads; make_op(i) builds worker i's operation"""
+    ops = [make_op(i) for i in range(concurrency)]
+    for op in ops:
+        for _ in range(max(1, WARMUP_CALLS // concurrency)):
+            op()
+
+    remaining = [calls]
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    start_gate = threading.Barrier(concurrency + 1)
+
+    def worker(op: Callable[[], Any]) -> None:
+        local: List[float] = []
+        failed = 0
+        start_gate.wait()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            t0 = time.perf_counter()
+            try:
+                op()
+            except Exception:
+                failed += 1
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(op,)) for op in ops]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+async def measure_tasks(
+    make_op: Callable[[int], Callable[[], Awaitable[Any]]], concurrency: int, calls: int
+) -> Dict[str, Any]:
+    """Async counterpart of measure_threads, with one task per worker"""
+    ops = [make_op(i) for i in range(concurrency)]
+    for op in ops:
+        for _ in range(max(1, WARMUP_CALLS // concurrency)):
+            await op()
+
+    remaining = [calls]
+    latencies: List[float] = []
+    errors = [0]
+
+    async def worker(op: Callable[[], Awaitable[Any]]) -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            t0 = time.perf_counter()
+            try:
+                await op()
+            except Exception:
+                errors[0] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(op) for op in ops))
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+class Recorder:
+    """Collects results and prints one line per measurement"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, suite: str, name: str, metrics: Dict[str, Any], **labels: Any) -> None:
+        entry = {"suite": suite, "name": name, **labels, **metrics}
+        self.results.append(entry)
+        label = " ".join(f"{k}={v}" for k, v in labels.items())
+        if "latency_us" in metrics:
+            lat = metrics["latency_us"]
+            print(
+                f"  {name:<22} {label:<40} {metrics['ops_per_sec']:>10.0f} ops/s"
+                f"  p50 {lat['p50']:>8.0f}us  p99 {lat['p99']:>8.0f}us"
+                + (f"  errors {metrics['errors']}" if metrics["errors"] else "")
+            )
+        else:
+            values = "  ".join(f"{k} {v:.1f}" for k, v in metrics.items() if isinstance(v, float))
+            print(f"  {name:<22} {label:<40} {values}")
+
+
+def _config(stub: StubAuthflowServer, concurrency: int) -> AuthflowConfig:
+    return AuthflowConfig(domain=stub.url, pool_maxsize=max(10, concurrency), auto_refresh=False)
+
+
+def _credentials(i: int) -> LoginCredentials:
+    return LoginCredentials(email=f"bench{i}@example.com", password="bench-password")
+
+
+# ==================
+# SUITES
+# ==================
+
+def bench_client(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("client")
+    for concurrency in args.concurrency:
+        # Unlimited client-side pacing: the stub never throttles
+        client = AuthflowClient(_config(stub, concurrency), rate_limiter=RateLimiter())
+        views = [client.for_session(f"worker-{i}") for i in range(concurrency)]
+        for i, view in enumerate(views):
+            view.login(_credentials(i))
+
+        scenarios = {
+            "login": lambda i: lambda: views[i].login(_credentials(i)),
+            "me": lambda i: views[i].get_current_user,
+            "refresh": lambda i: views[i].refresh_token,
+        }
+        for name, make_op in scenarios.items():
+            rec.add("client", name, measure_threads(make_op, concurrency, args.calls), client="sync", concurrency=concurrency)
+        client.close()
+
+        async def run_async() -> None:
+            aclient = AsyncAuthflowClient(_config(stub, concurrency), http2=False)
+            aviews = [aclient.for_session(f"worker-{i}") for i in range(concurrency)]
+            for i, view in enumerate(aviews):
+                await view.login(_credentials(i))
+            ascenarios = {
+                "login": lambda i: lambda: aviews[i].login(_credentials(i)),
+                "me": lambda i: aviews[i].get_current_user,
+                "refresh": lambda i: aviews[i].refresh_token,
+            }
+            for name, make_op in ascenarios.items():
+                metrics = await measure_tasks(make_op, concurrency, args.calls)
+                rec.add("client", name, metrics, client="async", concurrency=concurrency)
+            await aclient.aclose()
+
+        asyncio.run(run_async())
+
+
+def bench_token(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("token")
+    client = AuthflowClient(_config(stub, max(args.concurrency)))
+    manager = TokenManager(client, "svc_bench", "bench-secret")
+
+    def uncached() -> str:
+        manager.invalidate()
+        return manager.get_token()
+
+    for concurrency in args.concurrency:
+        rec.add("token", "get_token", measure_threads(lambda i: manager.get_token, concurrency, args.calls),
+                cache="warm", concurrency=concurrency)
+        rec.add("token", "get_token", measure_threads(lambda i: uncached, concurrency, args.calls),
+                cache="none", concurrency=concurrency)
+    client.close()
+
+
+def bench_verify(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("verify")
+    if not stub.signs_tokens:
+        print("  skipped: requires authflow[jwt]")
+        return
+    client = AuthflowClient(AuthflowConfig(domain=stub.url, jwks_url=f"{stub.url}/.well-known/jwks.json"))
+    token = stub.issue_token()
+    for concurrency in args.concurrency:
+        rec.add("verify", "verify_token", measure_threads(lambda i: lambda: client.verify_token(token), concurrency, args.calls),
+                client="sync", concurrency=concurrency)
+
+    async def run_async() -> None:
+        aclient = AsyncAuthflowClient(AuthflowConfig(domain=stub.url, jwks_url=f"{stub.url}/.well-known/jwks.json"), http2=False)
+        for concurrency in args.concurrency:
+            async def op() -> Any:
+                return await verify_jwt_async(token, aclient.jwks)
+            metrics = await measure_tasks(lambda i: op, concurrency, args.calls)
+            rec.add("verify", "verify_token", metrics, client="async", concurrency=concurrency)
+        await aclient.aclose()
+
+    asyncio.run(run_async())
+    client.close()
+
+
+def _retained_per_item(build: Callable[[int], Any], count: int) -> float:
+    """Bytes still allocated per item after build(i) ran count times"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [build(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def bench_memory(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("memory")
+    client = AuthflowClient(_config(stub, 1))
+    responses = [
+        stub.respond("POST", "/api/auth/login", {}, json.dumps({"email": f"m{i}@example.com"}).encode())[2]
+        for i in range(args.sessions)
+    ]
+
+    def store_session(i: int) -> None:
+        client.for_session(f"user-{i}")._session_from_response(responses[i])
+
+    per_session = _retained_per_item(store_session, args.sessions)
+    rec.add("memory", "session", {"bytes_per_item": per_session}, store="memory", count=args.sessions)
+    client.close()
+
+
+def _load_django_sdk(path: str):
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(DEBUG=False, ALLOWED_HOSTS=["*"], AUTHFLOW={})
+        django.setup()
+    spec = importlib.util.spec_from_file_location("authflow_django_sdk", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_django(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("django")
+    try:
+        sdk = _load_django_sdk(args.django_sdk)
+    except ImportError as e:
+        print(f"  skipped: {e}")
+        return
+    from django.conf import settings
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    token = stub.issue_token()
+    header = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def view(request):
+        return HttpResponse(b"ok")
+
+    async def aview(request):
+        return HttpResponse(b"ok")
+
+    # request.authflow_user is lazy: "read" views pay for verification, "unused" ones do not
+    def user_view(request):
+        bool(request.authflow_user)
+        return HttpResponse(b"ok")
+
+    async def auser_view(request):
+        await request.aauthflow_user()
+        return HttpResponse(b"ok")
+
+    modes = [("none", "off", 0)]
+    verify_modes = ["remote", "local"] if stub.signs_tokens else ["remote"]
+    for verify_mode in verify_modes:
+        modes += [(verify_mode, "off", 0), (verify_mode, "local", 300)]
+
+    for verify_mode, cache, ttl in modes:
+        settings.AUTHFLOW = {
+            "DOMAIN": stub.url,
+            "CLIENT_ID": "bench",
+            "CLIENT_SECRET": "bench",
+            "VERIFY_MODE": verify_mode,
+            "TOKEN_CACHE": {"TTL": ttl},
+        }
+        for user in ["read"] if verify_mode == "none" else ["read", "unused"]:
+            labels = {"verify": verify_mode, "cache": cache, "user": user}
+            handler, ahandler = (user_view, auser_view) if user == "read" else (view, aview)
+            for concurrency in args.concurrency:
+                if verify_mode == "none":
+                    sync_call = lambda i: lambda: view(factory.get("/"))
+                else:
+                    middleware = sdk.AuthFlowMiddleware(handler)
+                    sync_call = lambda i: lambda: middleware(factory.get("/", **header))
+                rec.add("django", "request", measure_threads(sync_call, concurrency, args.calls),
+                        stack="wsgi", concurrency=concurrency, **labels)
+
+                async def run_async() -> Dict[str, Any]:
+                    if verify_mode == "none":
+                        async def op() -> Any:
+                            return await aview(factory.get("/"))
+                    else:
+                        amiddleware = sdk.AuthFlowMiddleware(ahandler)
+
+                        async def op() -> Any:
+                            return await amiddleware(factory.get("/", **header))
+                    return await measure_tasks(lambda i: op, concurrency, args.calls)
+
+                rec.add("django", "request", asyncio.run(run_async()), stack="asgi", concurrency=concurrency, **labels)
+
+    # Memory per cached verification
+    settings.AUTHFLOW = {"DOMAIN": stub.url, "CLIENT_ID": "bench", "CLIENT_SECRET": "bench"}
+    middleware = sdk.AuthFlowMiddleware(view)
+    user = {"user": stub.user()}
+    per_entry = _retained_per_item(
+        lambda i: middleware.token_cache.set(f"{i:064x}", dict(user), 300), min(args.sessions, 10000)
+    )
+    rec.add("memory", "token_cache_entry", {"bytes_per_item": per_entry}, store="django", count=min(args.sessions, 10000))
+
+
+def bench_models_suite(stub: StubAuthflowServer, rec: Recorder, args: argparse.Namespace) -> None:
+    print("models")
+    for mode, metrics in bench_models.run_all(args.users).items():
+        rec.add("models", "convert_user", metrics, view=mode)
+
+
+RUNNERS = {
+    "client": bench_client,
+    "token": bench_token,
+    "verify": bench_verify,
+    "memory": bench_memory,
+    "django": bench_django,
+    "models": bench_models_suite,
+}
+
+
+# ==================
+# REPORTING
+# ==================
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "sdk_version": authflow.__version__,
+        "git_commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "json_codec": get_json_codec().name,
+        "server_latency_ms": args.server_latency,
+        "calls": args.calls,
+    }
+
+
+def _key(entry: Dict[str, Any]) -> str:
+    labels = {k: v for k, v in entry.items() if isinstance(v, (str, int)) and k not in ("calls", "errors")}
+    return json.dumps(labels, sort_keys=True)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """Regressions beyond threshold in throughput or memory, as readable lines"""
+    with open(baseline_path, "r", encoding="utf-8") as fh:
+        baseline = {_key(entry): entry for entry in json.load(fh)["results"]}
+
+    regressions = []
+    for entry in results:
+        old = baseline.get(_key(entry))
+        if old is None:
+            continue
+        # Higher is better for throughput; lower is better for everything else measured
+        for metric, higher_is_better in (
+            ("ops_per_sec", True),
+            ("bytes_per_item", False),
+            ("us_per_record", False),
+            ("bytes_per_record", False),
+        ):
+            if metric not in entry or not old.get(metric):
+                continue
+            change = (entry[metric] - old[metric]) / old[metric]
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{_key(entry)} {metric}: {old[metric]:.1f} -> {entry[metric]:.1f} ({change:+.0%})")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="AuthFlow SDK benchmark suite")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"Comma-separated subset of {', '.join(SUITES)}")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--sessions", type=int, default=10000, help="Items for memory measurements")
+    parser.add_argument("--users", type=int, default=50000, help="Records for the models suite")
+    parser.add_argument("--server-latency", type=float, default=0.0, help="Simulated server latency in ms")
+    parser.add_argument("--django-sdk", default=os.path.normpath(DJANGO_SDK), help="Path to authflow-django-sdk.py")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change counted as a regression")
+    args = parser.parse_args(argv)
+    args.suite = [s for s in args.suite.split(",") if s]
+    unknown = set(args.suite) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(sorted(unknown))}")
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    rec = Recorder()
+    with StubAuthflowServer(latency=args.server_latency / 1000) as stub:
+        for suite in args.suite:
+            RUNNERS[suite](stub, rec, args)
+
+    report = {"meta": metadata(args), "results": rec.results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {len(rec.results)} results to {args.output}")
+
+    if args.baseline:
+        regressions = compare(rec.results, args.baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
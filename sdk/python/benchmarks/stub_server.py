@@ -0,0 +1,188 @@
+"""
+In-process stub of the AuthFlow endpoints the SDKs call on hot paths
+
+Serves /api/auth/login, /api/auth/me, /oauth2/token and /.well-known/jwks.json
+with the same response shapes as the real server. /api/auth/refresh is
+stub-only: the server has no such route, but the SDKs' refresh_token()
+calls it, so the stub answers with the login response's token fields.
+Access tokens are RS256 JWTs signed with a throwaway key when PyJWT and
+cryptography are installed, so offline verification can be measured too.
+"""
+
+import base64
+import json
+import secrets
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+try:
+    import jwt
+    from cryptography.hazmat.primitives.asymmetric import rsa
+except ImportError:  # pragma: no cover - optional dependency
+    jwt = None
+
+KEY_ID = "bench-key"
+
+
+class StubAuthflowServer:
+    """
+    Threaded HTTP server answering like an AuthFlow instance
+
+    Use as a context manager; `url` is the domain to pass to AuthflowConfig.
+    """
+
+    def __init__(self, latency: float = 0.0, token_ttl: int = 3600):
+        """
+        Args:
+            latency: Seconds to sleep before each response, to simulate the network
+            token_ttl: Lifetime of issued access tokens
+        """
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self._private_key = None
+        self.jwks: Dict[str, Any] = {"keys": []}
+        if jwt is not None:
+            self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self._private_key.public_key()))
+            jwk.update(kid=KEY_ID, alg="RS256", use="sig")
+            self.jwks = {"keys": [jwk]}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def signs_tokens(self) -> bool:
+        """True if tokens can be verified offline against the stub's JWKS"""
+        return self._private_key is not None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubAuthflowServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="authflow-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubAuthflowServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ==================
+    # TOKENS
+    # ==================
+
+    @staticmethod
+    def user(user_id: str = "usr_bench", email: str = "bench@example.com") -> Dict[str, Any]:
+        return {
+            "id": user_id,
+            "email": email,
+            "role": "user",
+            "emailVerified": True,
+            "mfaEnabled": False,
+            "createdAt": "2024-01-01T00:00:00.000Z",
+            "name": "Bench User",
+            "tenantId": "tnt_bench",
+            "lastLogin": "2024-06-01T12:00:00.000Z",
+        }
+
+    def issue_token(self, user_id: str = "usr_bench", email: str = "bench@example.com") -> str:
+        """Access token with the server's JwtPayload claims"""
+        now = int(time.time())
+        claims = {
+            "userId": user_id,
+            "email": email,
+            "role": "user",
+            "tenantId": "tnt_bench",
+            "iat": now,
+            "exp": now + self.token_ttl,
+            # Unique per call, like real tokens
+            "jti": secrets.token_hex(8),
+        }
+        if self._private_key is not None:
+            return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": KEY_ID})
+        segments = [{"alg": "none", "typ": "JWT"}, claims]
+        encoded = [base64.urlsafe_b64encode(json.dumps(s).encode()).rstrip(b"=").decode() for s in segments]
+        return ".".join(encoded) + ".unsigned"
+
+    # ==================
+    # ROUTES
+    # ==================
+
+    def respond(self, method: str, path: str, headers: Any, body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        """Route a request; returns (status, extra headers, JSON body)"""
+        path = path.split("?", 1)[0]
+        with self._lock:
+            self.requests[path] += 1
+
+        if method == "POST" and path == "/api/auth/login":
+            data = json.loads(body or b"{}")
+            email = data.get("email", "bench@example.com")
+            return 200, {}, {
+                "user": self.user(email=email),
+                "token": self.issue_token(email=email),
+                "refreshToken": secrets.token_hex(32),
+            }
+        if method == "POST" and path == "/api/auth/refresh":
+            # Stub-only route (see the module docstring)
+            return 200, {}, {"token": self.issue_token(), "refreshToken": secrets.token_hex(32)}
+        if method == "GET" and path == "/api/auth/me":
+            if not headers.get("Authorization", "").startswith("Bearer "):
+                return 401, {}, {"error": "No token provided"}
+            return 200, {}, {"user": self.user()}
+        if method == "POST" and path == "/oauth2/token":
+            form = parse_qs(body.decode())
+            if not form.get("client_id") or not form.get("client_secret"):
+                return 401, {}, {"error": "invalid_client"}
+            return 200, {}, {
+                "access_token": self.issue_token(user_id=form["client_id"][0]),
+                "token_type": "Bearer",
+                "expires_in": self.token_ttl,
+                "scope": form.get("scope", [""])[0] or None,
+            }
+        if method == "GET" and path == "/.well-known/jwks.json":
+            return 200, {"Cache-Control": "public, max-age=3600"}, self.jwks
+        return 404, {}, {"error": "Not found"}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; with Nagle on, keep-alive clients stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, extra, payload = stub.respond(self.command, self.path, self.headers, body)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                out = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(out)
+
+            do_GET = do_POST = do_DELETE = do_PATCH = _handle
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
@@ -32,6 +32,21 @@ setup(
         "requests>=2.28.0",
     ],
     extras_require={
+        "jwt": [
+            "PyJWT[crypto]>=2.4.0",
+        ],
+        "async": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "fast": [
+            "orjson>=3.6.0",
+        ],
+        "otel": [
+            "opentelemetry-api>=1.20.0",
+        ],
+        "prometheus": [
+            "prometheus-client>=0.16.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,102 @@
+"""Shared fixtures: a local HTTP server that tests program with the real server's routes"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple, Union
+from urllib.parse import parse_qs, parse_qsl, urlparse
+
+import pytest
+
+from authflow import AuthflowClient, AuthflowConfig, RetryPolicy
+
+Reply = Tuple[int, Any]
+Route = Union[Reply, Callable[[SimpleNamespace], Reply]]
+
+
+class StubServer:
+    """
+    HTTP server answering routes registered by a test
+
+    A route is either a fixed (status, JSON body) reply or a callable that
+    gets the request (method, path, query, json, form, headers) and returns
+    one.
+    Unregistered routes answer 404 like the real server. Every request is
+    recorded in calls.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Route] = {}
+        self.calls: List[SimpleNamespace] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                is_form = (self.headers.get("Content-Type") or "").startswith("application/x-www-form-urlencoded")
+                request = SimpleNamespace(
+                    method=self.command,
+                    path=url.path,
+                    query={k: v[0] for k, v in parse_qs(url.query).items()},
+                    json=json.loads(raw) if raw and not is_form else None,
+                    form=dict(parse_qsl(raw.decode())) if is_form else None,
+                    headers=self.headers,
+                )
+                server.calls.append(request)
+                route = server.routes.get((self.command, url.path))
+                if route is None:
+                    status, body = 404, {"error": "Not found"}
+                else:
+                    status, body = route(request) if callable(route) else route
+                out = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def route(self, method: str, path: str, reply: Route) -> None:
+        self.routes[(method, path)] = reply
+
+    def paths(self, method: str = None) -> List[str]:
+        return [call.path for call in self.calls if method is None or call.method == method]
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def config(server):
+    return AuthflowConfig(domain=server.url, auto_refresh=False)
+
+
+@pytest.fixture
+def no_retries():
+    return RetryPolicy(max_retries=0)
+
+
+@pytest.fixture
+def client(config, no_retries):
+    client = AuthflowClient(config, retry_policy=no_retries)
+    yield client
+    client.close()
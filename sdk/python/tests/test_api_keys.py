@@ -0,0 +1,126 @@
+"""APIKeyAuthenticator against a server answering with the real response shapes"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from authflow import AuthflowClient, AuthflowConfig, AuthflowError, RetryPolicy
+from authflow.api_keys import APIKeyAuthenticator
+
+VALID_KEY = "ak_0123456789abcdef" + "0" * 48
+OWNER = {
+    "id": "usr_owner",
+    "email": "owner@example.com",
+    "role": "tenant_admin",
+    "tenantId": "tnt_acme",
+    "emailVerified": True,
+    "mfaEnabled": False,
+    "createdAt": "2025-01-01T00:00:00Z",
+}
+KEY_RECORD = {
+    "id": "key_1",
+    "name": "ci",
+    "keyPrefix": VALID_KEY[:16],
+    "permissions": ["users:read"],
+    "isActive": True,
+    "expiresAt": None,
+    "lastUsedAt": None,
+    "createdAt": "2025-01-01T00:00:00Z",
+}
+
+
+class _Server:
+    """Serves /api/auth/me and /api/admin/api-keys like server/routes.ts"""
+
+    def __init__(self):
+        self.me_calls = 0
+        # /auth/me body for a valid key; the server wraps the user in {"user": ...}
+        self.me_body = {"user": OWNER}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/api/auth/me":
+                    server.me_calls += 1
+                    if self.headers.get("Authorization") == f"Bearer {VALID_KEY}":
+                        self._send(200, server.me_body)
+                    else:
+                        self._send(401, {"error": "Invalid token"})
+                elif url.path == "/api/admin/api-keys":
+                    query = parse_qs(url.query)
+                    offset = int(query.get("offset", ["0"])[0])
+                    self._send(200, [KEY_RECORD][offset:])
+                else:
+                    self._send(404, {"error": "Not found"})
+
+            def _send(self, status, body):
+                out = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def authenticator(server):
+    client = AuthflowClient(AuthflowConfig(domain=server.url), retry_policy=RetryPolicy(max_retries=0))
+    authenticator = APIKeyAuthenticator(client)
+    authenticator.load()
+    yield authenticator
+    client.close()
+
+
+def test_authenticate_reads_owner_from_me_envelope(server, authenticator):
+    grant = authenticator.authenticate(VALID_KEY)
+
+    assert grant.key_id == "key_1"
+    assert grant.user_id == "usr_owner"
+    assert grant.tenant_id == "tnt_acme"
+    assert grant.allows("users:read")
+
+
+def test_confirmed_key_is_answered_from_memory(server, authenticator):
+    authenticator.authenticate(VALID_KEY)
+    authenticator.authenticate(VALID_KEY)
+
+    assert server.me_calls == 1
+
+
+def test_invalid_key_is_rejected_once(server, authenticator):
+    invalid = "ak_" + "f" * 64
+    for _ in range(3):
+        with pytest.raises(AuthflowError) as exc:
+            authenticator.authenticate(invalid)
+        assert exc.value.status_code == 401
+
+    assert server.me_calls == 1
+
+
+def test_malformed_me_response_raises_authflow_error(server, authenticator):
+    server.me_body = OWNER  # bare user, without the {"user": ...} envelope
+
+    with pytest.raises(AuthflowError):
+        authenticator.authenticate(VALID_KEY)
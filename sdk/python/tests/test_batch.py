@@ -0,0 +1,90 @@
+"""Per-user admin calls and their batch variants against the real response shapes"""
+
+import asyncio
+
+from authflow import APIKeyCreateRequest, AsyncAuthflowClient
+
+# PATCH /api/tenant-admin/users/:userId/role answers with a partial user
+ROLE_RESPONSE = {
+    "id": "usr_1",
+    "email": "a@example.com",
+    "firstName": "Ada",
+    "lastName": "L",
+    "role": "tenant_admin",
+    "isActive": True,
+    "emailVerified": True,
+    "mfaEnabled": False,
+}
+
+
+def _role_route(request):
+    user_id = request.path.split("/")[-2]
+    return 200, dict(ROLE_RESPONSE, id=user_id, role=request.json["role"])
+
+
+def test_update_user_role_returns_the_partial_user(server, client):
+    server.route("PATCH", "/api/tenant-admin/users/usr_1/role", (200, ROLE_RESPONSE))
+
+    user = client.update_user_role("usr_1", "tenant_admin")
+
+    assert user["role"] == "tenant_admin"
+    assert server.calls[0].json == {"role": "tenant_admin"}
+
+
+def test_update_user_roles_reports_success_per_item(server, client):
+    for user_id in ("usr_1", "usr_2", "usr_3"):
+        server.route("PATCH", f"/api/tenant-admin/users/{user_id}/role", _role_route)
+
+    results = client.update_user_roles([("usr_1", "user"), ("usr_2", "tenant_admin"), ("usr_3", "user")])
+
+    assert all(result.ok for result in results)
+    assert [result.value["role"] for result in results] == ["user", "tenant_admin", "user"]
+
+
+def test_async_update_user_roles_reports_success_per_item(server, config):
+    server.route("PATCH", "/api/tenant-admin/users/usr_1/role", _role_route)
+
+    async def run():
+        async with AsyncAuthflowClient(config) as client:
+            return await client.update_user_roles([("usr_1", "tenant_admin")])
+
+    results = asyncio.run(run())
+
+    assert results[0].ok
+    assert results[0].value["id"] == "usr_1"
+
+
+def test_failed_item_is_reported_without_failing_the_batch(server, client):
+    server.route("PATCH", "/api/tenant-admin/users/usr_1/role", _role_route)
+
+    results = client.update_user_roles([("usr_1", "user"), ("usr_missing", "user")])
+
+    assert results[0].ok
+    assert results[1].error.status_code == 404
+
+
+def test_delete_api_keys_uses_the_admin_route(server, client):
+    for key_id in ("key_1", "key_2"):
+        server.route("DELETE", f"/api/admin/api-keys/{key_id}", (200, {"message": "API key deleted"}))
+
+    results = client.delete_api_keys(["key_1", "key_2"])
+
+    assert all(result.ok for result in results)
+    assert sorted(server.paths("DELETE")) == ["/api/admin/api-keys/key_1", "/api/admin/api-keys/key_2"]
+
+
+def test_create_api_key_uses_the_admin_route(server, client):
+    server.route("POST", "/api/admin/api-keys", (201, {
+        "id": "key_1",
+        "name": "ci",
+        "key": "ak_" + "0" * 64,
+        "keyPrefix": "ak_0000000000000",
+        "permissions": ["users:read"],
+        "expiresAt": None,
+        "createdAt": "2025-01-01T00:00:00Z",
+    }))
+
+    key = client.create_api_key(APIKeyCreateRequest(name="ci", permissions=["users:read"]))
+
+    assert key.key == "ak_" + "0" * 64
+    assert server.calls[0].json["name"] == "ci"
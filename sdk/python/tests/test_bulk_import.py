@@ -0,0 +1,123 @@
+"""Bulk user import: reading, chunking, checkpoints and resuming"""
+
+import io
+import json
+
+import pytest
+
+from authflow import AuthflowError
+from authflow.bulk_import import ImportCheckpoint, _iter_json, iter_chunks, iter_import_records
+
+
+def _users(count, pad=0):
+    return [{"email": f"user{i}@example.com", "name": "x" * pad} for i in range(count)]
+
+
+def test_chunks_are_bounded_by_user_count():
+    chunks = list(iter_chunks(_users(25), max_users=10))
+
+    assert [index for index, _ in chunks] == [0, 1, 2]
+    assert [len(chunk) for _, chunk in chunks] == [10, 10, 5]
+
+
+def test_chunks_are_bounded_by_their_encoded_size():
+    chunks = list(iter_chunks(_users(200, pad=100), max_bytes=5000))
+
+    assert sum(len(chunk) for _, chunk in chunks) == 200
+    for _, chunk in chunks:
+        # The size the server sees: the array encoded as a JSON string value
+        assert len(json.dumps(json.dumps(chunk, separators=(",", ":")))) - 2 <= 5000
+
+
+def test_oversized_record_is_sent_alone():
+    records = [{"email": "a@example.com"}, {"email": "big@example.com", "name": "x" * 500}, {"email": "c@example.com"}]
+
+    chunks = [chunk for _, chunk in iter_chunks(records, max_bytes=200)]
+
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+
+
+def test_csv_records_match_the_server_parser(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("email,name,email_verified\na@example.com,Ada,TRUE\nb@example.com,,false\n")
+
+    assert list(iter_import_records(str(path))) == [
+        {"email": "a@example.com", "name": "Ada", "email_verified": True},
+        {"email": "b@example.com", "email_verified": False},
+    ]
+
+
+def test_ndjson_records(tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"email": "a@example.com"}\n\n{"email": "b@example.com"}\n')
+
+    assert [record["email"] for record in iter_import_records(str(path))] == ["a@example.com", "b@example.com"]
+
+
+def test_json_array_is_streamed_across_small_blocks():
+    users = _users(50, pad=30)
+
+    assert list(_iter_json(io.StringIO(json.dumps(users)), block_size=16)) == users
+
+
+def test_checkpoint_tracks_out_of_order_chunks(tmp_path):
+    path = str(tmp_path / "import.ckpt")
+    checkpoint = ImportCheckpoint(path, {"source": "users.csv"})
+
+    checkpoint.mark_done(1, {"total": 10, "imported": 10})
+    checkpoint.mark_done(3, {"total": 10, "imported": 9, "skipped": 1})
+    assert checkpoint.watermark == 0
+    checkpoint.mark_done(0, {"total": 10, "imported": 10})
+
+    resumed = ImportCheckpoint(path, {"source": "users.csv"})
+    assert resumed.watermark == 2
+    assert [index for index in range(5) if resumed.is_done(index)] == [0, 1, 3]
+    assert resumed.totals == {"total": 30, "imported": 29, "skipped": 1, "errors": 0}
+
+
+def test_checkpoint_for_another_import_is_rejected(tmp_path):
+    path = str(tmp_path / "import.ckpt")
+    ImportCheckpoint(path, {"source": "a.csv"}).mark_done(0, {})
+
+    with pytest.raises(AuthflowError):
+        ImportCheckpoint(path, {"source": "b.csv"})
+
+
+def _import_route(fail_email=None):
+    def route(request):
+        users = json.loads(request.json["data"])
+        if fail_email and any(user["email"] == fail_email for user in users):
+            return 503, {"error": "Import failed"}
+        return 200, {"result": {"total": len(users), "imported": len(users), "skipped": 0, "errors": []}}
+    return route
+
+
+def test_import_users_uploads_every_chunk(server, client):
+    server.route("POST", "/api/admin/import-users", _import_route())
+    progress = []
+
+    result = client.import_users(_users(95), max_chunk_users=10, concurrency=3, on_progress=lambda r: progress.append(r.chunks))
+
+    assert (result.chunks, result.sent, result.imported) == (10, 95, 95)
+    assert len(server.calls) == 10
+    assert progress == list(range(1, 11))
+    assert server.calls[0].json["format"] == "json"
+
+
+def test_interrupted_import_resumes_from_its_checkpoint(server, client, tmp_path):
+    source = tmp_path / "users.jsonl"
+    source.write_text("".join(json.dumps(user) + "\n" for user in _users(50)))
+    checkpoint = str(tmp_path / "import.ckpt")
+    server.route("POST", "/api/admin/import-users", _import_route(fail_email="user32@example.com"))
+
+    with pytest.raises(AuthflowError) as exc:
+        client.import_users(str(source), max_chunk_users=10, concurrency=1, checkpoint=checkpoint)
+    assert "resume" in str(exc.value)
+
+    server.calls.clear()
+    server.route("POST", "/api/admin/import-users", _import_route())
+    result = client.import_users(str(source), max_chunk_users=10, concurrency=1, checkpoint=checkpoint)
+
+    assert result.resumed_chunks == 3
+    assert len(server.calls) == 2
+    assert result.imported == 50
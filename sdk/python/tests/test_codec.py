@@ -0,0 +1,91 @@
+"""JSON codecs: interchangeable output, errors and selection"""
+
+import json
+
+import pytest
+
+from authflow import AuthflowClient, codec as codec_module
+from authflow.codec import JSONCodec, get_json_codec
+
+CODECS = ["json", "orjson", "msgspec"]
+
+DOCUMENT = {
+    "id": "usr_1",
+    "email": "zoë@example.com",
+    "roles": ["user", "tenant_admin"],
+    "mfaEnabled": False,
+    "lastLoginAt": None,
+    "loginCount": 42,
+    "score": 0.5,
+    "metadata": {"nested": {"emoji": "🔐"}},
+}
+
+
+@pytest.fixture(params=CODECS)
+def codec(request):
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    return get_json_codec(request.param)
+
+
+def test_codecs_round_trip_documents(codec):
+    assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+    assert codec.loads(codec.dumps(DOCUMENT).decode("utf-8")) == DOCUMENT
+
+
+def test_codecs_produce_compact_utf8_the_stdlib_can_read(codec):
+    encoded = codec.dumps(DOCUMENT)
+
+    assert isinstance(encoded, bytes)
+    assert b": " not in encoded and b", " not in encoded
+    assert "zoë".encode("utf-8") in encoded
+    assert json.loads(encoded) == DOCUMENT
+
+
+def test_invalid_input_raises_value_error(codec):
+    for data in (b"{not json", b"", b'{"a": 1'):
+        with pytest.raises(ValueError):
+            codec.loads(data)
+
+
+def test_named_codecs_are_shared():
+    assert get_json_codec("json") is get_json_codec("json")
+    assert get_json_codec().name in {"orjson", "msgspec", "json"}
+
+
+def test_unknown_codec_name_is_rejected():
+    with pytest.raises(ValueError):
+        get_json_codec("simplejson")
+
+
+def test_stdlib_is_used_when_no_fast_library_is_installed(monkeypatch):
+    monkeypatch.setattr(codec_module, "orjson", None)
+    monkeypatch.setattr(codec_module, "msgspec", None)
+    monkeypatch.setattr(codec_module, "_default", {})
+
+    assert type(get_json_codec()) is JSONCodec
+    with pytest.raises(ImportError):
+        get_json_codec("orjson")
+
+
+def test_client_bodies_go_through_its_codec(server, config, no_retries):
+    class RecordingCodec(JSONCodec):
+        def __init__(self):
+            self.encoded = []
+
+        def dumps(self, obj):
+            self.encoded.append(obj)
+            return super().dumps(obj)
+
+    server.route("PATCH", "/api/tenant-admin/users/usr_1/role", (200, {"id": "usr_1", "email": "zoë@example.com"}))
+    recording = RecordingCodec()
+    client = AuthflowClient(config, retry_policy=no_retries, json_codec=recording)
+
+    try:
+        user = client.update_user_role("usr_1", "user")
+    finally:
+        client.close()
+
+    assert recording.encoded == [{"role": "user"}]
+    assert server.calls[0].json == {"role": "user"}
+    assert user["email"] == "zoë@example.com"
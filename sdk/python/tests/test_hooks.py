@@ -0,0 +1,59 @@
+"""Hooks inherited from a parent, as used by tenant views"""
+
+from authflow import AuthflowConfig
+from authflow.hooks import EVENTS, Hooks, endpoint_template
+from authflow.registry import AuthflowClientRegistry
+
+
+def test_child_runs_parent_callbacks_added_later():
+    parent = Hooks()
+    child = Hooks(parent=parent)
+    calls = []
+
+    parent.add("on_retry", lambda **fields: calls.append(("parent", fields)))
+    child.add("on_retry", lambda **fields: calls.append(("child", fields)))
+    child.emit("on_retry", attempt=1)
+
+    assert calls == [("child", {"attempt": 1}), ("parent", {"attempt": 1})]
+
+
+def test_removed_parent_callback_stops_running_in_child():
+    parent = Hooks()
+    child = Hooks(parent=parent)
+    callback = parent.add("on_cache_hit", lambda **fields: None)
+
+    parent.remove("on_cache_hit", callback)
+
+    assert child.on_cache_hit == ()
+
+
+def test_child_events_stay_empty_without_callbacks():
+    child = Hooks(parent=Hooks())
+
+    assert not child.enabled
+
+
+def test_registry_views_only_carry_their_counters_when_shared_hooks_are_unused():
+    registry = AuthflowClientRegistry(AuthflowConfig(domain="https://auth.example.com"))
+    hooks = registry.get("acme").hooks
+
+    assert [event for event in EVENTS if getattr(hooks, event)] == ["after_response", "on_retry", "on_refresh"]
+
+    registry.hooks.add("before_request", lambda **fields: None)
+    assert hooks.before_request
+    registry.close()
+
+
+def test_endpoint_template_keeps_oauth2_paths():
+    assert endpoint_template("/oauth2/token") == "/oauth2/token"
+    assert endpoint_template("/admin/oauth2/clients") == "/admin/oauth2/clients"
+    assert endpoint_template("/oauth2/auth-request/3f6c2a1e-9b7d-4c5e-8a2f-1d0e9c8b7a65") == "/oauth2/auth-request/:id"
+
+
+def test_endpoint_template_collapses_id_segments():
+    uuid = "3f6c2a1e-9b7d-4c5e-8a2f-1d0e9c8b7a65"
+    assert endpoint_template(f"/tenant-admin/users/{uuid}/role?x=1") == "/tenant-admin/users/:id/role"
+    assert endpoint_template("/admin/api-keys/usr_2x8k1") == "/admin/api-keys/:id"
+    assert endpoint_template("/webhooks/42/deliveries") == "/webhooks/:id/deliveries"
+    assert endpoint_template("/sessions/0123456789abcdef0123") == "/sessions/:id"
+    assert endpoint_template("/auth/mfa/verify") == "/auth/mfa/verify"
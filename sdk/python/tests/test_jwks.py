@@ -0,0 +1,194 @@
+"""JWKSKeyStore caching, single-flight refetch and stale-key handling"""
+
+import threading
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from authflow import jwks as jwks_module
+from authflow.jwks import JWKSKeyStore
+from authflow.types import AuthflowError
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwks(*kids):
+    public = jwt.algorithms.RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key(), as_dict=True)
+    return {"keys": [dict(public, kid=kid, use="sig", alg="RS256") for kid in kids]}
+
+
+class FakeClock:
+    """Stands in for the time module inside authflow.jwks"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class Fetcher:
+    """JWKS fetcher that counts calls and can be made to fail"""
+
+    def __init__(self, *kids, max_age=300):
+        self.body = _jwks(*kids)
+        self.headers = {"Cache-Control": f"public, max-age={max_age}"}
+        self.calls = 0
+        self.error = None
+        self.delay = 0.0
+
+    def __call__(self, url):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.body, self.headers
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(jwks_module, "time", clock)
+    return clock
+
+
+def _store(fetch, **kwargs):
+    kwargs.setdefault("background_refresh", False)
+    return JWKSKeyStore("https://auth.example.com/.well-known/jwks.json", fetch=fetch, **kwargs)
+
+
+def test_keys_are_cached_for_max_age(clock):
+    fetch = Fetcher("k1", max_age=300)
+    store = _store(fetch)
+
+    store.get_key("k1")
+    clock.now += 299
+    store.get_key("k1")
+
+    assert fetch.calls == 1
+    assert store.stats()["hits"] == 1
+
+
+def test_unknown_kid_refetches_once_per_interval(clock):
+    fetch = Fetcher("k1")
+    store = _store(fetch, miss_refetch_interval=10)
+    store.get_key("k1")
+
+    for _ in range(5):
+        with pytest.raises(AuthflowError):
+            store.get_key("rotated")
+    assert fetch.calls == 1
+
+    clock.now += 11
+    fetch.body = _jwks("k1", "rotated")
+    assert store.get_key("rotated") is not None
+    assert fetch.calls == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    fetch = Fetcher("k1")
+    fetch.delay = 0.2
+    store = _store(fetch)
+    keys = []
+
+    threads = [threading.Thread(target=lambda: keys.append(store.get_key("k1"))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == 1
+    assert len(keys) == 20
+
+
+def test_concurrent_callers_share_a_failed_fetch():
+    fetch = Fetcher("k1")
+    fetch.delay = 0.2
+    fetch.error = ConnectionError("down")
+    store = _store(fetch)
+    errors = []
+
+    def lookup():
+        try:
+            store.get_key("k1")
+        except AuthflowError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == 1
+    assert len(errors) == 10
+    assert store.stats()["refresh_errors"] == 1
+
+
+def test_expired_key_is_served_stale_when_the_endpoint_is_down(clock):
+    fetch = Fetcher("k1", max_age=300)
+    store = _store(fetch, max_stale=3600)
+    key = store.get_key("k1")
+    fetch.error = ConnectionError("down")
+
+    clock.now += 300 + 3599
+
+    assert store.get_key("k1") is key
+    assert store.stats()["stale_hits"] == 1
+
+
+def test_key_past_max_stale_is_rejected_when_the_refetch_fails(clock):
+    fetch = Fetcher("k1", max_age=300)
+    store = _store(fetch, max_stale=3600)
+    store.get_key("k1")
+    fetch.error = ConnectionError("down")
+
+    clock.now += 300 + 3601
+
+    with pytest.raises(AuthflowError):
+        store.get_key("k1")
+    assert store.stats()["stale_hits"] == 0
+
+
+def test_key_past_max_stale_is_served_again_after_a_successful_refetch(clock):
+    fetch = Fetcher("k1", max_age=300)
+    store = _store(fetch, max_stale=60)
+    store.get_key("k1")
+
+    clock.now += 1000
+
+    assert store.get_key("k1") is not None
+    assert fetch.calls == 2
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_failed_background_refresh_backs_off_for_min_ttl(clock):
+    fetch = Fetcher("k1", max_age=300)
+    store = _store(fetch, min_ttl=30)
+    store.get_key("k1")
+    fetch.error = ConnectionError("down")
+    clock.now += 301
+
+    store.get_key("k1")
+    _wait_for(lambda: store.stats()["refresh_errors"] == 1 and not store._background_pending)
+    for _ in range(50):
+        store.get_key("k1")
+    assert fetch.calls == 2
+
+    clock.now += 31
+    store.get_key("k1")
+    _wait_for(lambda: store.stats()["refresh_errors"] == 2)
+    assert fetch.calls == 3
+    assert store.stats()["stale_hits"] == 52
@@ -0,0 +1,122 @@
+"""Paged iteration over list endpoints, with prefetch"""
+
+import asyncio
+import threading
+
+from authflow.pagination import MAX_PAGE_SIZE, aiterate_pages, iterate_pages
+
+
+def _listing(total, cap=MAX_PAGE_SIZE):
+    records = [{"id": str(i)} for i in range(total)]
+    requests = []
+
+    def fetch_page(limit, offset):
+        requests.append((limit, offset))
+        # Like the server: ?limit= above the cap is clamped
+        return records[offset:offset + min(limit, cap)]
+
+    return fetch_page, requests
+
+
+def test_page_size_above_the_server_cap_still_reads_everything():
+    fetch_page, requests = _listing(250)
+
+    records = list(iterate_pages(fetch_page, page_size=500, prefetch=False))
+
+    assert len(records) == 250
+    assert requests == [(100, 0), (100, 100), (100, 200)]
+
+
+def test_pages_are_read_until_a_short_page():
+    fetch_page, requests = _listing(25)
+
+    assert [r["id"] for r in iterate_pages(fetch_page, page_size=10, prefetch=False)] == [str(i) for i in range(25)]
+    assert requests == [(10, 0), (10, 10), (10, 20)]
+
+
+def test_listing_of_exactly_page_size_records_ends_on_an_empty_page():
+    fetch_page, requests = _listing(20)
+
+    assert len(list(iterate_pages(fetch_page, page_size=10, prefetch=False))) == 20
+    assert requests == [(10, 0), (10, 10), (10, 20)]
+
+
+def test_server_ignoring_limit_is_read_once():
+    records = [{"id": str(i)} for i in range(10)]
+
+    def fetch_page(limit, offset):
+        return records
+
+    assert len(list(iterate_pages(fetch_page, page_size=10, prefetch=False))) == 10
+    assert len(list(iterate_pages(fetch_page, page_size=4, prefetch=False))) == 10
+
+
+def test_records_are_converted_only_when_consumed():
+    fetch_page, _ = _listing(30)
+    converted = []
+
+    def convert(raw):
+        converted.append(raw["id"])
+        return raw
+
+    pages = iterate_pages(fetch_page, convert, page_size=10)
+    next(pages)
+    next(pages)
+    pages.close()
+
+    assert converted == ["0", "1"]
+
+
+def test_next_page_is_fetched_while_the_current_one_is_consumed():
+    fetch_page, _ = _listing(30)
+    fetched = threading.Event()
+
+    def fetch_and_signal(limit, offset):
+        page = fetch_page(limit, offset)
+        if offset == 10:
+            fetched.set()
+        return page
+
+    pages = iterate_pages(fetch_and_signal, page_size=10)
+    next(pages)
+
+    assert fetched.wait(1)
+    pages.close()
+
+
+def test_async_pages_are_prefetched():
+    fetch_page, requests = _listing(25)
+
+    async def fetch(limit, offset):
+        return fetch_page(limit, offset)
+
+    async def run():
+        records = []
+        async for record in aiterate_pages(fetch, page_size=10):
+            if record["id"] == "0":
+                await asyncio.sleep(0)
+                prefetched = len(requests)
+            records.append(record)
+        return records, prefetched
+
+    records, prefetched = asyncio.run(run())
+
+    assert len(records) == 25
+    assert prefetched == 2
+    assert requests == [(10, 0), (10, 10), (10, 20)]
+
+
+def test_client_iterator_sends_limit_and_offset(server, client):
+    sessions = [{"id": f"sess_{i}"} for i in range(7)]
+    server.route(
+        "GET",
+        "/api/tenant-admin/sessions",
+        lambda request: (200, sessions[int(request.query["offset"]):][: int(request.query["limit"])]),
+    )
+
+    assert [s["id"] for s in client.iter_sessions(page_size=3)] == [s["id"] for s in sessions]
+    assert [call.query for call in server.calls] == [
+        {"limit": "3", "offset": "0"},
+        {"limit": "3", "offset": "3"},
+        {"limit": "3", "offset": "6"},
+    ]
@@ -0,0 +1,138 @@
+"""TokenBucket pacing, RateLimiter rejection and AIMD adjustment"""
+
+import pytest
+
+from authflow import AuthflowError, RateLimitedError, RateLimiter, TokenBucket
+
+
+def test_bucket_serves_its_burst_without_waiting():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_bucket_paces_calls_beyond_the_burst():
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.reserve()
+
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_takes_no_token_when_the_wait_exceeds_max_wait():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.reserve()
+
+    for _ in range(100):
+        assert bucket.reserve(max_wait=0.5) == pytest.approx(1.0, abs=0.01)
+
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.01)
+
+
+def test_rejected_calls_do_not_push_back_later_ones():
+    limiter = RateLimiter(limits={"admin": (1, 1)}, max_wait=2)
+    rejected = 0
+    for _ in range(200):
+        try:
+            limiter.acquire("/admin/api-keys")
+        except RateLimitedError:
+            rejected += 1
+
+    # Burst, then two paced slots within max_wait; the rest fail fast without debt
+    assert rejected == 197
+    with pytest.raises(RateLimitedError) as exc:
+        limiter.acquire("/admin/api-keys")
+    assert exc.value.retry_after == pytest.approx(3.0, abs=0.05)
+    assert exc.value.status_code == 429
+
+
+def test_unpaced_classes_never_wait():
+    limiter = RateLimiter(limits={"admin": (1, 1)})
+
+    assert all(limiter.acquire("/auth/me") == 0.0 for _ in range(100))
+
+
+def test_429_halves_the_rate_and_successes_recover_it():
+    limiter = RateLimiter(limits={"admin": (10, 10)}, decrease_factor=0.5, recovery=0.1)
+
+    limiter.record("/admin/api-keys", 429, retry_after=0)
+    assert limiter.rate("admin") == pytest.approx(5.0)
+    limiter.record("/admin/api-keys", 429, retry_after=0)
+    assert limiter.rate("admin") == pytest.approx(2.5)
+
+    for _ in range(3):
+        limiter.record("/admin/api-keys", 200)
+    assert limiter.rate("admin") == pytest.approx(5.5)
+
+    for _ in range(100):
+        limiter.record("/admin/api-keys", 200)
+    assert limiter.rate("admin") == pytest.approx(10.0)
+
+
+def test_rate_never_drops_below_min_rate():
+    limiter = RateLimiter(limits={"admin": (1, 1)}, min_rate=0.25)
+    for _ in range(10):
+        limiter.record("/admin/x", 429, retry_after=0)
+
+    assert limiter.rate("admin") == 0.25
+
+
+def test_server_errors_do_not_recover_the_rate():
+    limiter = RateLimiter(limits={"admin": (10, 10)}, recovery=0.1)
+    limiter.record("/admin/x", 429, retry_after=0)
+
+    limiter.record("/admin/x", 503)
+
+    assert limiter.rate("admin") == pytest.approx(5.0)
+
+
+def test_long_server_block_fails_fast():
+    limiter = RateLimiter(max_wait=5)
+    limiter.record("/tenant-admin/users", 429, retry_after=60)
+
+    with pytest.raises(RateLimitedError) as exc:
+        limiter.acquire("/tenant-admin/users")
+    assert exc.value.retry_after == pytest.approx(60, abs=1)
+    assert limiter.acquire("/auth/me") == 0.0
+
+
+def test_short_server_block_is_waited_out():
+    limiter = RateLimiter(max_wait=5)
+    limiter.record("/admin/x", 429, retry_after=2)
+
+    assert limiter.acquire("/admin/x") == pytest.approx(2, abs=0.1)
+
+
+def test_login_blocks_are_per_email():
+    limiter = RateLimiter(max_wait=5)
+    limiter.record("/auth/login", 429, retry_after=900, data={"email": "A@example.com"})
+
+    with pytest.raises(RateLimitedError):
+        limiter.acquire("/auth/login", {"email": "a@example.com"})
+    assert limiter.acquire("/auth/login", {"email": "b@example.com"}) == 0.0
+
+
+def test_classify():
+    assert RateLimiter.classify("/auth/refresh") == "refresh"
+    assert RateLimiter.classify("/auth/login") == "login"
+    assert RateLimiter.classify("/tenant-admin/users?limit=10") == "admin"
+    assert RateLimiter.classify("/auth/me") == "default"
+
+
+def test_retry_after_from_header_and_server_body():
+    assert RateLimiter.retry_after_from("7", None) == 7.0
+    assert RateLimiter.retry_after_from(None, {"retryAfter": 15}) == 900.0
+    assert RateLimiter.retry_after_from(None, {"blockedUntil": "2000-01-01T00:00:00Z"}) == 0.0
+    assert RateLimiter.retry_after_from(None, {}) is None
+
+
+def test_client_fails_fast_after_a_long_server_block(server, client):
+    server.route("GET", "/api/auth/me", (429, {"error": "Too many requests", "retryAfter": 15}))
+
+    with pytest.raises(AuthflowError) as first:
+        client.get_current_user()
+    assert first.value.status_code == 429
+    with pytest.raises(RateLimitedError):
+        client.get_current_user()
+
+    assert len(server.calls) == 1
@@ -0,0 +1,128 @@
+"""RetryPolicy decisions, CircuitBreaker states and the client's retry loop"""
+
+import time
+
+import pytest
+
+from authflow import AuthflowClient, AuthflowError, CircuitBreaker, RetryPolicy
+from authflow.retry import CircuitOpenError
+
+
+def test_idempotent_calls_are_retried_on_transient_statuses():
+    policy = RetryPolicy(max_retries=2, backoff_factor=1, jitter=False)
+
+    assert policy.next_delay("GET", 0, status_code=503) == 1
+    assert policy.next_delay("DELETE", 1, status_code=502) == 2
+    assert policy.next_delay("GET", 2, status_code=503) is None
+    assert policy.next_delay("GET", 0, status_code=500) is None
+    assert policy.next_delay("GET", 0, status_code=404) is None
+
+
+def test_non_idempotent_calls_are_only_retried_when_nothing_was_sent():
+    policy = RetryPolicy(jitter=False)
+
+    assert policy.next_delay("POST", 0, status_code=503) is None
+    assert policy.next_delay("POST", 0, sent=False) is not None
+    assert policy.next_delay("POST", 0, status_code=503, idempotent=True) is not None
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(max_retries=20, backoff_factor=1, max_backoff=5)
+
+    delays = [policy.next_delay("GET", 10, status_code=503) for _ in range(50)]
+
+    assert all(0 <= delay <= 5 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_after_is_honored_up_to_max_retry_after():
+    policy = RetryPolicy(max_retry_after=30)
+
+    assert policy.next_delay("GET", 0, status_code=429, retry_after="7") == 7
+    assert policy.next_delay("GET", 0, status_code=429, retry_after="120") is None
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_client_retries_transient_failures(server, config):
+    replies = iter([(503, {"error": "unavailable"})])
+    server.route("GET", "/api/auth/me", lambda request: next(replies, (200, {"user": {}})))
+    client = AuthflowClient(config, retry_policy=RetryPolicy(max_retries=2, backoff_factor=0, jitter=False))
+    retries = []
+    client.hooks.add("on_retry", lambda **fields: retries.append(fields["status_code"]))
+
+    try:
+        client._request("GET", "/auth/me")
+    finally:
+        client.close()
+
+    assert len(server.calls) == 2
+    assert retries == [503]
+
+
+def test_client_does_not_resend_posts_that_reached_the_server(server, config):
+    server.route("POST", "/api/auth/logout", (503, {"error": "unavailable"}))
+    client = AuthflowClient(config, retry_policy=RetryPolicy(max_retries=2, backoff_factor=0, jitter=False))
+
+    try:
+        with pytest.raises(AuthflowError):
+            client._request("POST", "/auth/logout", {})
+    finally:
+        client.close()
+
+    assert len(server.calls) == 1
+
+
+def test_client_fails_fast_while_the_circuit_is_open(server, config, no_retries):
+    server.route("GET", "/api/auth/me", (503, {"error": "unavailable"}))
+    client = AuthflowClient(config, retry_policy=no_retries, circuit_breaker=CircuitBreaker(failure_threshold=2))
+
+    try:
+        for _ in range(2):
+            with pytest.raises(AuthflowError):
+                client._request("GET", "/auth/me")
+        with pytest.raises(CircuitOpenError):
+            client._request("GET", "/auth/me")
+    finally:
+        client.close()
+
+    assert len(server.calls) == 2
@@ -0,0 +1,47 @@
+"""User-wide revocation boundary of RevocationList"""
+
+from authflow.revocation import RevocationList
+
+REVOKED_AT = 1_700_000_100.7
+
+
+def _claims(iat):
+    return {"userId": "usr_1", "iat": iat}
+
+
+def test_token_issued_in_an_earlier_second_is_revoked():
+    revocations = RevocationList()
+    revocations.revoke_user("usr_1", REVOKED_AT)
+
+    assert revocations.is_revoked(_claims(1_700_000_099))
+
+
+def test_token_issued_in_the_revocation_second_stays_valid():
+    # iat is whole seconds: a re-login right after the revocation shares its second
+    revocations = RevocationList()
+    revocations.revoke_user("usr_1", REVOKED_AT)
+
+    assert not revocations.is_revoked(_claims(1_700_000_100))
+
+
+def test_token_issued_after_the_revocation_stays_valid():
+    revocations = RevocationList()
+    revocations.revoke_user("usr_1", REVOKED_AT)
+
+    assert not revocations.is_revoked(_claims(1_700_000_101))
+
+
+def test_token_without_iat_is_revoked():
+    revocations = RevocationList()
+    revocations.revoke_user("usr_1", REVOKED_AT)
+
+    assert revocations.is_revoked({"userId": "usr_1"})
+
+
+def test_later_revocation_moves_the_boundary_forward():
+    revocations = RevocationList()
+    revocations.revoke_user("usr_1", REVOKED_AT)
+    revocations.revoke_user("usr_1", REVOKED_AT + 10)
+    revocations.revoke_user("usr_1", REVOKED_AT)
+
+    assert revocations.is_revoked(_claims(1_700_000_105))
@@ -0,0 +1,22 @@
+"""SessionStore interface and the bundled stores"""
+
+import pytest
+
+from authflow.sessions import FileSessionStore, InMemorySessionStore, SessionStore
+
+
+def test_store_must_implement_get_set_and_delete():
+    class Incomplete(SessionStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        SessionStore()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_bundled_stores_implement_the_interface(tmp_path):
+    for store in (InMemorySessionStore(), FileSessionStore(str(tmp_path))):
+        assert store.get("usr_1") is None
+        store.delete("usr_1")
@@ -0,0 +1,116 @@
+"""TokenManager caching, grant selection and failure handling"""
+
+import threading
+import time
+
+import pytest
+
+from authflow import AuthflowClient, AuthflowError, CircuitBreaker, RetryPolicy, TokenManager
+from authflow.retry import CircuitOpenError
+
+
+def _token_route(request):
+    grant = request.form["grant_type"]
+    time.sleep(0.05)
+    return 200, {
+        "access_token": f"at-{grant}-{request.form.get('scope', '')}",
+        "token_type": "Bearer",
+        "expires_in": 3600,
+        "refresh_token": "rt-2" if grant == "refresh_token" else None,
+    }
+
+
+@pytest.fixture
+def fast_retries():
+    return RetryPolicy(max_retries=2, backoff_factor=0, jitter=False)
+
+
+def _manager(config, retry_policy, **kwargs):
+    breaker = kwargs.pop("circuit_breaker", None)
+    client = AuthflowClient(config, retry_policy=retry_policy, circuit_breaker=breaker)
+    return TokenManager(client, client_id="billing", client_secret="s3cret", **kwargs)
+
+
+def test_tokens_are_cached_per_scope(server, config, no_retries):
+    server.route("POST", "/oauth2/token", _token_route)
+    tokens = _manager(config, no_retries)
+
+    assert tokens.get_token("invoices:read") == "at-client_credentials-invoices:read"
+    assert tokens.get_token("invoices:read") == "at-client_credentials-invoices:read"
+    assert tokens.get_token("invoices:write") == "at-client_credentials-invoices:write"
+
+    assert len(server.calls) == 2
+    assert server.calls[0].form["client_secret"] == "s3cret"
+
+
+def test_concurrent_callers_share_one_request(server, config, no_retries):
+    server.route("POST", "/oauth2/token", _token_route)
+    tokens = _manager(config, no_retries)
+
+    threads = [threading.Thread(target=tokens.get_token) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.calls) == 1
+
+
+def test_on_refresh_reports_the_grant_used(server, config, no_retries):
+    server.route("POST", "/oauth2/token", _token_route)
+    tokens = _manager(config, no_retries, refresh_token="rt-1")
+    kinds = []
+    tokens.client.hooks.add("on_refresh", lambda **fields: kinds.append(fields["kind"]))
+
+    tokens.get_token()
+    tokens.get_token("invoices:read")
+
+    assert kinds == ["refresh_token", "client_credentials"]
+    assert server.calls[0].form["refresh_token"] == "rt-1"
+
+
+def test_rejected_refresh_token_falls_back_to_client_credentials(server, config, no_retries):
+    def route(request):
+        if request.form["grant_type"] == "refresh_token":
+            return 400, {"error": "invalid_grant", "error_description": "Refresh token expired"}
+        return _token_route(request)
+
+    server.route("POST", "/oauth2/token", route)
+    tokens = _manager(config, no_retries, refresh_token="rt-old")
+
+    with pytest.raises(AuthflowError) as exc:
+        tokens.get_token()
+    assert str(exc.value) == "Refresh token expired"
+
+    assert tokens.get_token() == "at-client_credentials-"
+
+
+def test_client_credentials_grant_is_retried_per_the_client_policy(server, config, fast_retries):
+    replies = iter([(503, {"error": "unavailable"}), (503, {"error": "unavailable"})])
+    server.route("POST", "/oauth2/token", lambda request: next(replies, None) or _token_route(request))
+    tokens = _manager(config, fast_retries)
+
+    assert tokens.get_token() == "at-client_credentials-"
+    assert len(server.calls) == 3
+
+
+def test_refresh_token_grant_is_not_resent_after_reaching_the_server(server, config, fast_retries):
+    server.route("POST", "/oauth2/token", (503, {"error": "unavailable"}))
+    tokens = _manager(config, fast_retries, refresh_token="rt-1")
+
+    with pytest.raises(AuthflowError):
+        tokens.get_token()
+    assert len(server.calls) == 1
+
+
+def test_open_circuit_fails_fast(server, config, no_retries):
+    server.route("POST", "/oauth2/token", (503, {"error": "unavailable"}))
+    tokens = _manager(config, no_retries, circuit_breaker=CircuitBreaker(failure_threshold=2))
+
+    for _ in range(2):
+        with pytest.raises(AuthflowError):
+            tokens.get_token()
+    with pytest.raises(CircuitOpenError):
+        tokens.get_token()
+
+    assert len(server.calls) == 2
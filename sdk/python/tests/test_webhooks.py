@@ -0,0 +1,117 @@
+"""Webhook queues and receiver"""
+
+import time
+
+import pytest
+
+from authflow.webhooks import (
+    MemoryWebhookQueue,
+    SQLiteWebhookQueue,
+    WebhookEvent,
+    WebhookQueue,
+    WebhookReceiver,
+    WebhookVerificationError,
+    compute_webhook_signature,
+)
+
+
+def _event(delivery_id="dlv_1"):
+    return WebhookEvent(delivery_id, "user.created", "tnt_1", {"id": "usr_1"})
+
+
+def test_nacked_event_waits_out_its_backoff():
+    queue = MemoryWebhookQueue(retry_backoff=0.05)
+    queue.put(_event())
+    receipt, _ = queue.get(timeout=0)
+
+    queue.nack(receipt)  # first retry waits 0.05 * 2**1 seconds
+
+    assert len(queue) == 1
+    assert queue.get(timeout=0) is None
+    started = time.monotonic()
+    retried = queue.get(timeout=1)
+    assert retried is not None
+    assert retried[1].delivery_id == "dlv_1"
+    assert time.monotonic() - started >= 0.05
+
+
+def test_backoff_doubles_per_attempt():
+    queue = MemoryWebhookQueue(max_attempts=5, retry_backoff=0.02)
+    queue.put(_event())
+    receipt, _ = queue.get(timeout=0)
+    queue.nack(receipt)
+    receipt, _ = queue.get(timeout=1)
+
+    started = time.monotonic()
+    queue.nack(receipt)  # second retry waits 0.02 * 2**2 seconds
+    assert queue.get(timeout=1) is not None
+    assert time.monotonic() - started >= 0.08
+
+
+def test_ready_events_are_not_held_up_by_backing_off_ones():
+    queue = MemoryWebhookQueue(retry_backoff=10)
+    queue.put(_event("dlv_failing"))
+    receipt, _ = queue.get(timeout=0)
+    queue.nack(receipt)
+    queue.put(_event("dlv_next"))
+
+    assert queue.get(timeout=0)[1].delivery_id == "dlv_next"
+
+
+def test_event_is_dropped_after_max_attempts():
+    queue = MemoryWebhookQueue(max_attempts=1, retry_backoff=0)
+    queue.put(_event())
+    receipt, _ = queue.get(timeout=0)
+
+    queue.nack(receipt)
+
+    assert len(queue) == 0
+
+
+def test_backing_off_events_count_towards_maxsize():
+    queue = MemoryWebhookQueue(maxsize=1, retry_backoff=10)
+    queue.put(_event("dlv_failing"))
+    receipt, _ = queue.get(timeout=0)
+    queue.nack(receipt)
+
+    assert not queue.put(_event("dlv_next"))
+
+
+def test_queue_must_implement_put_get_ack_and_nack(tmp_path):
+    class Incomplete(WebhookQueue):
+        def put(self, event):
+            return True
+
+    with pytest.raises(TypeError):
+        WebhookQueue()
+    with pytest.raises(TypeError):
+        Incomplete()
+    for queue in (MemoryWebhookQueue(), SQLiteWebhookQueue(str(tmp_path / "queue.db"))):
+        assert queue.put(_event())
+        queue.close()
+
+
+def _signed(body, secret="whsec_1"):
+    timestamp = str(int(time.time() * 1000))
+    return {
+        "X-Webhook-Signature": compute_webhook_signature(body, timestamp, secret),
+        "X-Webhook-Timestamp": timestamp,
+        "X-Webhook-Delivery-Id": "dlv_1",
+    }
+
+
+def test_receiver_verifies_a_signed_object():
+    body = '{"event": "user.created", "tenantId": "tnt_1", "data": {"id": "usr_1"}}'
+
+    event = WebhookReceiver("whsec_1").verify(body, _signed(body))
+
+    assert (event.event, event.tenant_id, event.data) == ("user.created", "tnt_1", {"id": "usr_1"})
+
+
+def test_receiver_rejects_signed_bodies_that_are_not_objects():
+    receiver = WebhookReceiver("whsec_1")
+
+    for body in ('[{"event": "user.created"}]', '"user.created"', "42", "null"):
+        with pytest.raises(WebhookVerificationError):
+            receiver.verify(body, _signed(body))
+    assert receiver.rejected == 4
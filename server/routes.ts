@@ -94,6 +94,30 @@ function isTrustedDeviceExpired(lastSeenAt: Date | null, expiryDays: number = 30
   return (Date.now() - lastSeenAt.getTime()) > expiryMs;
 }
 
+// Largest page a list endpoint returns, whatever ?limit= asks for
+const MAX_PAGE_SIZE = 100;
+
+// Optional ?limit=&offset= of a list endpoint. Undefined without a limit,
+// so the endpoint keeps its unpaginated response.
+function pageParams(req: Request): { limit: number; offset: number } | undefined {
+  if (req.query.limit === undefined) {
+    return undefined;
+  }
+  return {
+    limit: Math.min(Math.max(parseInt(req.query.limit as string) || 0, 0), MAX_PAGE_SIZE),
+    offset: Math.max(parseInt(req.query.offset as string) || 0, 0),
+  };
+}
+
+// Apply ?limit=&offset= to a list that its query already bounds. Lists
+// that grow with the tenant pass pageParams() to storage instead, and
+// set X-Total-Count from a count query.
+function paginate<T>(req: Request, res: Response, items: T[]): T[] {
+  res.setHeader("X-Total-Count", String(items.length));
+  const page = pageParams(req);
+  return page ? items.slice(page.offset, page.offset + page.limit) : items;
+}
+
 // Type augmentation for Express Request and Session
 declare global {
   namespace Express {
@@ -1285,12 +1309,17 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(403).json({ error: "Tenant ID required" });
       }
       
-      const users = await storage.listUsersByTenant(req.user.tenantId);
+      const page = pageParams(req);
+      const [users, total] = await Promise.all([
+        storage.listUsersByTenant(req.user.tenantId, page?.limit, page?.offset),
+        storage.countUsersByTenant(req.user.tenantId),
+      ]);
       // Sanitize sensitive fields
       const sanitizedUsers = users.map(user => ({
         ...user,
         passwordHash: undefined,
       }));
+      res.setHeader("X-Total-Count", String(total));
       res.json(sanitizedUsers);
     } catch (error: any) {
       console.error("Error fetching users:", error);
@@ -1431,7 +1460,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
         return res.status(403).json({ error: "Tenant ID required" });
       }
       
-      const sessions = await storage.getTenantSessions(req.user.tenantId);
+      const page = pageParams(req);
+      const [sessions, total] = await Promise.all([
+        storage.getTenantSessions(req.user.tenantId, page?.limit, page?.offset),
+        storage.countTenantSessions(req.user.tenantId),
+      ]);
+      res.setHeader("X-Total-Count", String(total));
       res.json(sessions);
     } catch (error: any) {
       console.error("Error fetching sessions:", error);
@@ -2067,7 +2101,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   app.get("/api/user/login-history", requireAuth, async (req: Request, res: Response) => {
     try {
-      const history = await storage.getUserLoginHistory(req.user.id);
+      const page = pageParams(req);
+      const [history, total] = await Promise.all([
+        storage.getUserLoginHistory(req.user.id, page?.limit, page?.offset),
+        storage.countUserLoginHistory(req.user.id),
+      ]);
+      res.setHeader("X-Total-Count", String(total));
       res.json(history);
     } catch (error: any) {
       console.error("Error fetching login history:", error);
@@ -2193,7 +2232,11 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // List API Keys
   app.get("/api/admin/api-keys", requireAuth, requireRole(["tenant_admin", "super_admin"], "api_keys:read"), async (req: Request, res: Response) => {
     try {
-      const apiKeys = await storage.listAPIKeys(req.user.tenantId!);
+      const page = pageParams(req);
+      const [apiKeys, total] = await Promise.all([
+        storage.listAPIKeys(req.user.tenantId!, page?.limit, page?.offset),
+        storage.countAPIKeys(req.user.tenantId!),
+      ]);
 
       // Don't return key hash, only prefix for identification
       const sanitized = apiKeys.map(k => ({
@@ -2207,6 +2250,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         createdAt: k.createdAt,
       }));
 
+      res.setHeader("X-Total-Count", String(total));
       res.json(sanitized);
     } catch (error: any) {
       console.error("Error listing API keys:", error);
@@ -2453,7 +2497,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get("/api/admin/webhooks/:id/deliveries", requireAuth, requireRole(["tenant_admin", "super_admin"], "webhooks:read"), async (req: Request, res: Response) => {
     try {
       const deliveries = await storage.listWebhookDeliveries(req.params.id, req.user.tenantId!, 100);
-      res.json(deliveries);
+      res.json(paginate(req, res, deliveries));
     } catch (error: any) {
       console.error("Error listing webhook deliveries:", error);
       res.status(500).json({ error: "Failed to list deliveries" });
@@ -2905,15 +2949,6 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
-  // JWKS Endpoint (JSON Web Key Set)
-  app.get("/.well-known/jwks.json", (req: Request, res: Response) => {
-    // TODO: Implement proper JWKS with RSA keys
-    // For now, return empty set (JWT validation will use shared secret)
-    res.json({
-      keys: []
-    });
-  });
-
   // OpenID Connect Discovery Endpoint
   app.get("/.well-known/openid-configuration", (req: Request, res: Response) => {
     const baseUrl = `${req.protocol}://${req.get("host")}`;
@@ -3191,7 +3226,12 @@ export async function registerRoutes(app: Express): Promise<Server> {
         }
       }
       
-      const events = await storage.getSecurityEvents(userId);
+      const page = pageParams(req);
+      const [events, total] = await Promise.all([
+        storage.getSecurityEvents(userId, page?.limit, page?.offset),
+        storage.countSecurityEvents(userId),
+      ]);
+      res.setHeader("X-Total-Count", String(total));
       res.json(events);
     } catch (error: any) {
       console.error("Get security events error:", error);
@@ -52,7 +52,8 @@ export interface IStorage {
   getUserByEmail(email: string, tenantId?: string): Promise<User | undefined>;
   createUser(user: InsertUser): Promise<User>;
   updateUser(id: string, data: Partial<User>): Promise<User | undefined>;
-  listUsersByTenant(tenantId: string, limit?: number): Promise<User[]>;
+  listUsersByTenant(tenantId: string, limit?: number, offset?: number): Promise<User[]>;
+  countUsersByTenant(tenantId: string): Promise<number>;
   updateUserRole(userId: string, role: string): Promise<User | undefined>;
   deactivateUser(userId: string): Promise<User | undefined>;
   deleteUser(id: string): Promise<void>;
@@ -118,7 +119,8 @@ export interface IStorage {
   updateSession(id: string, data: Partial<Session>): Promise<void>;
   deleteSession(id: string): Promise<void>;
   getUserSessions(userId: string): Promise<Session[]>;
-  getTenantSessions(tenantId: string): Promise<any[]>;
+  getTenantSessions(tenantId: string, limit?: number, offset?: number): Promise<any[]>;
+  countTenantSessions(tenantId: string): Promise<number>;
 
   // Notification operations
   createNotification(notification: InsertNotification): Promise<Notification>;
@@ -132,7 +134,8 @@ export interface IStorage {
 
   // Login history
   createLoginHistory(history: InsertLoginHistory): Promise<void>;
-  getUserLoginHistory(userId: string, limit?: number): Promise<any[]>;
+  getUserLoginHistory(userId: string, limit?: number, offset?: number): Promise<any[]>;
+  countUserLoginHistory(userId: string): Promise<number>;
 
   // Stats operations
   getSuperAdminStats(): Promise<any>;
@@ -142,7 +145,8 @@ export interface IStorage {
   // API Key operations
   createAPIKey(apiKey: any): Promise<any>;
   getAPIKeyByHash(keyHash: string): Promise<any>;
-  listAPIKeys(tenantId: string): Promise<any[]>;
+  listAPIKeys(tenantId: string, limit?: number, offset?: number): Promise<any[]>;
+  countAPIKeys(tenantId: string): Promise<number>;
   updateAPIKeyLastUsed(id: string): Promise<void>;
   revokeAPIKey(id: string, tenantId: string): Promise<void>;
   deleteAPIKey(id: string, tenantId: string): Promise<void>;
@@ -231,8 +235,19 @@ export class DbStorage implements IStorage {
     return query;
   }
 
-  async listUsersByTenant(tenantId: string, limit = 100): Promise<User[]> {
-    return db.select().from(users).where(eq(users.tenantId, tenantId)).limit(limit).orderBy(desc(users.createdAt));
+  async listUsersByTenant(tenantId: string, limit = 100, offset = 0): Promise<User[]> {
+    return db
+      .select()
+      .from(users)
+      .where(eq(users.tenantId, tenantId))
+      .orderBy(desc(users.createdAt), users.id)
+      .limit(limit)
+      .offset(offset);
+  }
+
+  async countUsersByTenant(tenantId: string): Promise<number> {
+    const [result] = await db.select({ count: count() }).from(users).where(eq(users.tenantId, tenantId));
+    return result.count;
   }
 
   async updateUserRole(userId: string, role: string): Promise<User | undefined> {
@@ -348,8 +363,8 @@ export class DbStorage implements IStorage {
     return session;
   }
 
-  async getTenantSessions(tenantId: string): Promise<any[]> {
-    const tenantSessions = await db
+  async getTenantSessions(tenantId: string, limit?: number, offset = 0): Promise<any[]> {
+    const query = db
       .select({
         id: sessions.id,
         userId: sessions.userId,
@@ -367,9 +382,19 @@ export class DbStorage implements IStorage {
       .from(sessions)
       .innerJoin(users, eq(sessions.userId, users.id))
       .where(and(eq(users.tenantId, tenantId), eq(sessions.isActive, true)))
-      .orderBy(desc(sessions.lastActivityAt));
-    
-    return tenantSessions;
+      .orderBy(desc(sessions.lastActivityAt), sessions.id)
+      .$dynamic();
+
+    return limit === undefined ? query : query.limit(limit).offset(offset);
+  }
+
+  async countTenantSessions(tenantId: string): Promise<number> {
+    const [result] = await db
+      .select({ count: count() })
+      .from(sessions)
+      .innerJoin(users, eq(sessions.userId, users.id))
+      .where(and(eq(users.tenantId, tenantId), eq(sessions.isActive, true)));
+    return result.count;
   }
 
   async createNotification(notification: InsertNotification): Promise<Notification> {
@@ -446,13 +471,19 @@ export class DbStorage implements IStorage {
     await db.insert(loginHistory).values(history);
   }
 
-  async getUserLoginHistory(userId: string, limit = 10): Promise<any[]> {
+  async getUserLoginHistory(userId: string, limit = 10, offset = 0): Promise<any[]> {
     return db
       .select()
       .from(loginHistory)
       .where(eq(loginHistory.userId, userId))
-      .orderBy(desc(loginHistory.createdAt))
-      .limit(limit);
+      .orderBy(desc(loginHistory.createdAt), loginHistory.id)
+      .limit(limit)
+      .offset(offset);
+  }
+
+  async countUserLoginHistory(userId: string): Promise<number> {
+    const [result] = await db.select({ count: count() }).from(loginHistory).where(eq(loginHistory.userId, userId));
+    return result.count;
   }
 
   async getRecentFailedLogins(email: string, limit = 10): Promise<any[]> {
@@ -839,12 +870,19 @@ export class DbStorage implements IStorage {
     return key;
   }
 
-  async listAPIKeys(tenantId: string): Promise<any[]> {
-    return db
+  async listAPIKeys(tenantId: string, limit?: number, offset = 0): Promise<any[]> {
+    const query = db
       .select()
       .from(apiKeys)
       .where(eq(apiKeys.tenantId, tenantId))
-      .orderBy(desc(apiKeys.createdAt));
+      .orderBy(desc(apiKeys.createdAt), apiKeys.id)
+      .$dynamic();
+    return limit === undefined ? query : query.limit(limit).offset(offset);
+  }
+
+  async countAPIKeys(tenantId: string): Promise<number> {
+    const [result] = await db.select({ count: count() }).from(apiKeys).where(eq(apiKeys.tenantId, tenantId));
+    return result.count;
   }
 
   async updateAPIKeyLastUsed(id: string): Promise<void> {
@@ -1237,13 +1275,19 @@ export class DbStorage implements IStorage {
     return event;
   }
 
-  async getSecurityEvents(userId: string): Promise<any[]> {
+  async getSecurityEvents(userId: string, limit = 100, offset = 0): Promise<any[]> {
     return db
       .select()
       .from(securityEvents)
       .where(eq(securityEvents.userId, userId))
-      .orderBy(desc(securityEvents.createdAt))
-      .limit(100);
+      .orderBy(desc(securityEvents.createdAt), securityEvents.id)
+      .limit(limit)
+      .offset(offset);
+  }
+
+  async countSecurityEvents(userId: string): Promise<number> {
+    const [result] = await db.select({ count: count() }).from(securityEvents).where(eq(securityEvents.userId, userId));
+    return result.count;
   }
 
   async getSecurityEventById(eventId: string): Promise<any> {